@@ -0,0 +1,13 @@
+"""
+Management command to rebuild the DailyStats dashboard rollup.
+"""
+from django.core.management.base import BaseCommand
+from accounts.models import DailyStats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily dashboard rollup from properties, reviews, team members and leads'
+
+    def handle(self, *args, **options):
+        count = DailyStats.backfill()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} daily rows.'))
@@ -0,0 +1,87 @@
+"""
+Management command to benchmark bulk import and export throughput.
+"""
+import csv
+import io
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from nura_stays.bulk import get_dataset, read_rows
+from properties.bulk import PropertyImportSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a property CSV, then compare rows/s of saving rows one at a time '
+        'through the serializer (on a sample) with the batched import path, and time '
+        'the streaming export. All writes are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Rows to import in bulk (default 100000)')
+        parser.add_argument('--sample', type=int, default=1000, help='Rows saved one at a time (default 1000)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per batch (default 1000)')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        payload = self.make_csv(options['rows'])
+        try:
+            with transaction.atomic():
+                results = self.run(payload, options)
+                raise Rollback
+        except Rollback:
+            pass
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run(self, payload, options):
+        dataset = get_dataset('properties')
+        results = {'vendor': connection.vendor, 'rows': options['rows'], 'rows_per_second': {}}
+
+        sample = list(read_rows(io.BytesIO(payload), 'csv'))[:options['sample']]
+        started = time.perf_counter()
+        for _, row in sample:
+            serializer = PropertyImportSerializer(data=dataset.clean_row(row, 'csv'))
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        results['rows_per_second']['per_row_save'] = round(len(sample) / (time.perf_counter() - started))
+
+        started = time.perf_counter()
+        summary = dataset.import_rows(read_rows(io.BytesIO(payload), 'csv'), 'csv', batch_size=options['batch_size'])
+        seconds = time.perf_counter() - started
+        results['bulk_import'] = {key: summary[key] for key in ('created', 'skipped')}
+        results['rows_per_second']['bulk_import'] = round(summary['rows'] / seconds)
+
+        for fmt in ('csv', 'jsonl'):
+            started = time.perf_counter()
+            exported = sum(1 for _ in dataset.export_rows(dataset.get_queryset().order_by('pk'), fmt))
+            results['rows_per_second'][f'export_{fmt}'] = round(exported / (time.perf_counter() - started))
+
+        base = results['rows_per_second']['per_row_save']
+        results['speedup'] = round(results['rows_per_second']['bulk_import'] / base, 1)
+        return results
+
+    def make_csv(self, count):
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow([
+            'name', 'location', 'description', 'price_per_night', 'bedrooms', 'bathrooms',
+            'max_guests', 'property_type', 'amenities', 'latitude', 'longitude',
+        ])
+        for i in range(count):
+            writer.writerow([
+                # Repeated names exercise slug allocation.
+                f'Benchmark Villa {i % 5000}', 'Zanzibar', 'Generated for the import benchmark.',
+                self.random.randint(50, 900), self.random.randint(1, 6), self.random.randint(1, 4),
+                self.random.randint(2, 12), self.random.choice(['villa', 'apartment', 'house']),
+                json.dumps(self.random.sample(['wifi', 'pool', 'parking', 'kitchen', 'ac'], 2)),
+                round(self.random.uniform(-6.5, -5.7), 6), round(self.random.uniform(39.1, 39.6), 6),
+            ])
+        return out.getvalue().encode()
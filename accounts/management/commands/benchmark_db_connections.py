@@ -0,0 +1,79 @@
+"""
+Management command to benchmark per-request database connection handling.
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import load_backend
+
+from nura_stays.loadtest import percentile
+
+MODES = {
+    # settings_dict overrides for each mode
+    'connect_per_request': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'pool': None},
+    'persistent': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True, 'pool': None},
+    'pool': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': True, 'pool': {'min_size': 1, 'max_size': 4}},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay the request cycle Django runs around each request (connection '
+        'checks at request start and end, plus one query) against the configured '
+        'database with connections opened per request, kept persistent, or '
+        'borrowed from the psycopg pool (PostgreSQL only), and print per-request '
+        'timings as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Simulated requests per mode (default 500)')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias to copy settings from')
+
+    def handle(self, *args, **options):
+        base = connections[options['database']].settings_dict
+        results = {'vendor': connections[options['database']].vendor, 'requests': options['requests'], 'modes': {}}
+        for mode, overrides in MODES.items():
+            if overrides['pool'] and results['vendor'] != 'postgresql':
+                results['modes'][mode] = 'skipped: connection pooling needs PostgreSQL'
+                continue
+            results['modes'][mode] = self.measure(base, mode, overrides, options['requests'])
+        baseline = results['modes']['connect_per_request']['mean_ms']
+        for mode, result in results['modes'].items():
+            if isinstance(result, dict):
+                result['overhead_removed_ms'] = round(baseline - result['mean_ms'], 3)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def measure(self, base, mode, overrides, requests):
+        settings_dict = {
+            **base,
+            'CONN_MAX_AGE': overrides['CONN_MAX_AGE'],
+            'CONN_HEALTH_CHECKS': overrides['CONN_HEALTH_CHECKS'],
+            'OPTIONS': {key: value for key, value in base['OPTIONS'].items() if key != 'pool'},
+        }
+        if overrides['pool']:
+            settings_dict['OPTIONS']['pool'] = overrides['pool']
+        # A private alias keeps the pool (keyed by alias) apart from the real one.
+        connection = load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, f'benchmark_{mode}')
+        timings = []
+        try:
+            for _ in range(requests):
+                started = time.perf_counter()
+                # What django.db.close_old_connections does on request_started/finished.
+                connection.close_if_unusable_or_obsolete()
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+                connection.close_if_unusable_or_obsolete()
+                timings.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+            if overrides['pool']:
+                connection.close_pool()
+        timings.sort()
+        return {
+            'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+            'p50_ms': round(percentile(timings, 0.5) * 1000, 3),
+            'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        }
@@ -0,0 +1,98 @@
+"""
+Management command to benchmark list serialization paths.
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+from rest_framework.renderers import JSONRenderer
+from nura_stays.renderers import ORJSONRenderer
+from properties.models import Property
+from properties.views import PropertyListView
+from reviews.models import Review
+from reviews.views import ReviewListView
+from team.models import TeamMember
+from team.views import TeamMemberListView
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill a throwaway dataset and time unpaginated property, review and team '
+        'lists: model serializers + DRF JSONRenderer, model serializers + orjson, and '
+        'the .values() fast path + orjson. Bodies are checked to be identical. All '
+        'writes are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows per list (default 1000)')
+        parser.add_argument('--seconds', type=float, default=3, help='Time budget per measurement (default 3)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                results = self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run(self, options):
+        self.populate(options['rows'])
+        modes = {
+            'serializer_json': (False, JSONRenderer),
+            'serializer_orjson': (False, ORJSONRenderer),
+            'fast_orjson': (True, ORJSONRenderer),
+        }
+        results = {'rows': options['rows'], 'requests_per_second': {}}
+        with override_settings(RESPONSE_CACHE_ENABLED=False):
+            for name, view_class in (
+                ('properties', PropertyListView), ('reviews', ReviewListView), ('team', TeamMemberListView),
+            ):
+                bodies, rates = set(), {}
+                for mode, (fast, renderer) in modes.items():
+                    view = view_class.as_view(pagination_class=None, renderer_classes=[renderer], throttle_classes=[])
+                    with override_settings(FAST_SERIALIZATION=fast):
+                        body, rates[mode] = self.measure(view, options['seconds'])
+                    bodies.add(body)
+                if len(bodies) != 1:
+                    self.stderr.write(self.style.ERROR(f'{name}: response bodies differ between modes'))
+                rates['speedup'] = round(rates['fast_orjson'] / rates['serializer_json'], 1)
+                results['requests_per_second'][name] = rates
+        return results
+
+    def measure(self, view, seconds):
+        request = RequestFactory().get('/')
+        response = view(request)
+        response.render()
+        count, started = 0, time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            view(request).render()
+            count += 1
+        return response.content, round(count / (time.perf_counter() - started), 1)
+
+    def populate(self, count):
+        Property.objects.bulk_create([
+            Property(
+                name=f'Benchmark {i}', slug=f'benchmark-serialization-{i}', location='Stone Town',
+                description='-', short_description='A bright flat near the beach.',
+                price_per_night=100 + i % 400, amenities=['WiFi', 'Pool', 'Kitchen'],
+                latitude=-6.16, longitude=39.19,
+            )
+            for i in range(count)
+        ], batch_size=500)
+        property_ids = list(Property.objects.values_list('pk', flat=True)[:count])
+        Review.objects.bulk_create([
+            Review(property_id=property_ids[i % len(property_ids)], guest_name=f'Guest {i}',
+                   rating=i % 5 + 1, review_text='Lovely stay, would book again.')
+            for i in range(count)
+        ], batch_size=500)
+        TeamMember.objects.bulk_create([
+            TeamMember(name=f'Member {i}', role='Host', bio='-', social_links={'x': 'https://x.com/n'})
+            for i in range(count)
+        ], batch_size=500)
@@ -0,0 +1,29 @@
+"""
+Management command to stream properties, reviews or leads to CSV or JSON Lines.
+"""
+from django.core.management.base import BaseCommand
+from nura_stays.bulk import DATASETS, FORMATS, get_dataset, guess_format
+
+
+class Command(BaseCommand):
+    help = 'Export a dataset as CSV or JSON Lines, streamed in constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('--output', '-o', help='File to write (default: stdout)')
+        parser.add_argument('--format', choices=FORMATS, help='Default: from --output extension, else csv')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or guess_format(options['output'])
+        dataset = get_dataset(options['dataset'])
+        rows = dataset.export_rows(dataset.get_queryset().order_by('pk'), fmt)
+        if not options['output']:
+            for line in rows:
+                self.stdout.write(line, ending='')
+            return
+        count = -1 if fmt == 'csv' else 0
+        with open(options['output'], 'w', encoding='utf-8', newline='') as out:
+            for line in rows:
+                out.write(line)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f'Wrote {count} rows to {options["output"]}.'))
@@ -0,0 +1,48 @@
+"""
+Management command to bulk import properties, reviews or leads from a file.
+"""
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from nura_stays.bulk import DATASETS, FORMATS, get_dataset, guess_format, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Import a CSV or JSON Lines file into a dataset in validated batches written with '
+        'bulk_create/bulk_update. Invalid rows are skipped and reported.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('path', help='File to import')
+        parser.add_argument('--format', choices=FORMATS, help='Default: from the file extension')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per batch (default 1000)')
+        parser.add_argument('--update', action='store_true', help='Update rows whose id exists instead of creating')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only; write nothing')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or guess_format(options['path'])
+        dataset = get_dataset(options['dataset'])
+        try:
+            with open(options['path'], 'rb') as stream:
+                summary = dataset.import_rows(
+                    read_rows(stream, fmt), fmt, batch_size=options['batch_size'],
+                    update=options['update'], dry_run=options['dry_run'], progress=self.progress,
+                )
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            raise CommandError(f'Could not read {options["path"]}: {e}')
+
+        for error in summary['errors']:
+            self.stderr.write(f'line {error["line"]}: {error["errors"]}')
+        verb = 'Would import' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {summary["rows"]} rows: {summary["created"]} created, '
+            f'{summary["updated"]} updated, {summary["skipped"]} skipped.'
+        ))
+
+    def progress(self, state):
+        self.stdout.write(
+            f'{state["rows"]} rows ({state["created"]} created, {state["updated"]} updated, '
+            f'{state["skipped"]} skipped) in {state["seconds"]:.1f}s, {state["rows_per_second"]:.0f} rows/s'
+        )
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('properties_created', models.PositiveIntegerField(default=0)),
+                ('reviews_created', models.PositiveIntegerField(default=0)),
+                ('reviews_rating_1', models.PositiveIntegerField(default=0)),
+                ('reviews_rating_2', models.PositiveIntegerField(default=0)),
+                ('reviews_rating_3', models.PositiveIntegerField(default=0)),
+                ('reviews_rating_4', models.PositiveIntegerField(default=0)),
+                ('reviews_rating_5', models.PositiveIntegerField(default=0)),
+                ('leads_received', models.PositiveIntegerField(default=0)),
+                ('leads_read', models.PositiveIntegerField(default=0)),
+                ('total_properties', models.PositiveIntegerField(default=0)),
+                ('active_properties', models.PositiveIntegerField(default=0)),
+                ('total_reviews', models.PositiveIntegerField(default=0)),
+                ('approved_reviews', models.PositiveIntegerField(default=0)),
+                ('approved_rating_sum', models.PositiveIntegerField(default=0)),
+                ('total_team_members', models.PositiveIntegerField(default=0)),
+                ('total_leads', models.PositiveIntegerField(default=0)),
+                ('unread_leads', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'daily stats',
+                'ordering': ['date'],
+            },
+        ),
+    ]
@@ -1,3 +1,193 @@
-from django.db import models
+"""
+Dashboard rollup models for Nura Stays.
+"""
+import datetime
 
-# Create your models here.
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+
+class DailyStats(models.Model):
+    """
+    One row per day with that day's activity counters and end-of-day running
+    totals, so the newest row always carries the current totals. Maintained
+    incrementally by accounts.signals; rebuilt by
+    ``manage.py backfill_dashboard_stats``.
+    """
+
+    TOTAL_FIELDS = [
+        'total_properties', 'active_properties', 'total_reviews', 'approved_reviews',
+        'approved_rating_sum', 'total_team_members', 'total_leads', 'unread_leads',
+    ]
+
+    date = models.DateField(unique=True)
+    # Activity on this day
+    properties_created = models.PositiveIntegerField(default=0)
+    reviews_created = models.PositiveIntegerField(default=0)
+    reviews_rating_1 = models.PositiveIntegerField(default=0)
+    reviews_rating_2 = models.PositiveIntegerField(default=0)
+    reviews_rating_3 = models.PositiveIntegerField(default=0)
+    reviews_rating_4 = models.PositiveIntegerField(default=0)
+    reviews_rating_5 = models.PositiveIntegerField(default=0)
+    leads_received = models.PositiveIntegerField(default=0)
+    leads_read = models.PositiveIntegerField(default=0)
+    # Running totals at the end of this day
+    total_properties = models.PositiveIntegerField(default=0)
+    active_properties = models.PositiveIntegerField(default=0)
+    total_reviews = models.PositiveIntegerField(default=0)
+    approved_reviews = models.PositiveIntegerField(default=0)
+    approved_rating_sum = models.PositiveIntegerField(default=0)
+    total_team_members = models.PositiveIntegerField(default=0)
+    total_leads = models.PositiveIntegerField(default=0)
+    unread_leads = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'daily stats'
+        ordering = ['date']
+
+    def __str__(self):
+        return f"Stats for {self.date}"
+
+    def get_average_rating(self):
+        return round(self.approved_rating_sum / self.approved_reviews, 1) if self.approved_reviews else 0
+
+    def get_reviews_by_rating(self):
+        return {str(i): getattr(self, f'reviews_rating_{i}') for i in range(1, 6)}
+
+    @classmethod
+    def record(cls, **deltas):
+        """Add ``deltas`` (field name -> int) to today's row, creating it if needed."""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        today = timezone.localdate()
+        # Clamped at 0: a counter that drifted below the source tables (rows
+        # from before the backfill, bulk deletes) must not fail the CHECK.
+        updates = {
+            field: models.F(field) + delta if delta > 0 else Greatest(models.F(field) + delta, 0)
+            for field, delta in deltas.items()
+        }
+        with transaction.atomic():
+            if cls.objects.filter(date=today).update(**updates):
+                return
+            latest = cls.objects.filter(date__lt=today).order_by('-date').first()
+            if latest is None:
+                # Nothing recorded yet: build history from the source tables,
+                # which already include the change being recorded.
+                cls.backfill()
+                return
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        date=today, **{field: getattr(latest, field) for field in cls.TOTAL_FIELDS}
+                    )
+            except IntegrityError:
+                pass  # created concurrently
+            cls.objects.filter(date=today).update(**updates)
+
+    @classmethod
+    def backfill(cls, since=None):
+        """
+        Rebuild every row from the source tables: daily counters from
+        created_at dates and running totals from the rows that exist now.
+        Deleted rows and historical read/approval changes leave no trace, so
+        past totals are approximate; today's totals are exact. ``leads_read``
+        cannot be reconstructed, so previously recorded values are kept.
+
+        With ``since`` (a date), only the rows from that day on are rebuilt,
+        starting from the totals of the source rows created before it.
+        """
+        from contact.models import ContactSubmission
+        from properties.models import Property
+        from reviews.models import Review
+        from team.models import TeamMember
+
+        count = models.Count('id')
+        sources = {
+            'properties': (Property.objects, {
+                'created': count, 'active': models.Count('id', filter=models.Q(is_active=True)),
+            }),
+            'reviews': (Review.objects, {
+                'created': count,
+                'approved': models.Count('id', filter=models.Q(is_approved=True)),
+                'approved_sum': models.Sum('rating', filter=models.Q(is_approved=True)),
+                **{f'rating_{i}': models.Count('id', filter=models.Q(rating=i)) for i in range(1, 6)},
+            }),
+            'team': (TeamMember.objects, {'created': count}),
+            'leads': (ContactSubmission.objects, {
+                'created': count, 'unread': models.Count('id', filter=models.Q(is_read=False)),
+            }),
+        }
+
+        def per_day(queryset, **aggregates):
+            if since is not None:
+                queryset = queryset.filter(created_at__date__gte=since)
+            rows = queryset.order_by().annotate(day=TruncDate('created_at')).values('day')
+            return {row['day']: row for row in rows.annotate(**aggregates)}
+
+        def accumulate(running, prop, review, team, lead):
+            running['total_properties'] += prop.get('created') or 0
+            running['active_properties'] += prop.get('active') or 0
+            running['total_reviews'] += review.get('created') or 0
+            running['approved_reviews'] += review.get('approved') or 0
+            running['approved_rating_sum'] += review.get('approved_sum') or 0
+            running['total_team_members'] += team.get('created') or 0
+            running['total_leads'] += lead.get('created') or 0
+            running['unread_leads'] += lead.get('unread') or 0
+
+        properties, reviews, team, leads = (
+            per_day(queryset, **aggregates) for queryset, aggregates in sources.values()
+        )
+        running = dict.fromkeys(cls.TOTAL_FIELDS, 0)
+        existing = cls.objects.all()
+        if since is not None:
+            accumulate(running, *(
+                queryset.filter(created_at__date__lt=since).aggregate(**aggregates)
+                for queryset, aggregates in sources.values()
+            ))
+            existing = existing.filter(date__gte=since)
+
+        leads_read = dict(existing.filter(leads_read__gt=0).values_list('date', 'leads_read'))
+
+        today = timezone.localdate()
+        days = set(properties) | set(reviews) | set(team) | set(leads) | set(leads_read) | {today}
+        day, last = min(days), today
+        rows = []
+        empty = {}
+        while day <= last:
+            prop = properties.get(day, empty)
+            review = reviews.get(day, empty)
+            lead = leads.get(day, empty)
+            accumulate(running, prop, review, team.get(day, empty), lead)
+            if day in days:
+                rows.append(cls(
+                    date=day,
+                    properties_created=prop.get('created', 0),
+                    reviews_created=review.get('created', 0),
+                    leads_received=lead.get('created', 0),
+                    leads_read=leads_read.get(day, 0),
+                    **{f'reviews_rating_{i}': review.get(f'rating_{i}', 0) for i in range(1, 6)},
+                    **running,
+                ))
+            day += datetime.timedelta(days=1)
+
+        with transaction.atomic():
+            existing.delete()
+            cls.objects.bulk_create(rows, batch_size=500)
+        return len(rows)
+
+    @classmethod
+    def refresh(cls, model, ids, chunk_size=500):
+        """
+        Rebuild the rows from the earliest day on which one of ``model``'s
+        rows ``ids`` was created (after a bulk import), not the whole table.
+        """
+        since = None
+        for start in range(0, len(ids), chunk_size):
+            day = model.objects.filter(pk__in=ids[start:start + chunk_size]).aggregate(
+                day=models.Min(TruncDate('created_at'))
+            )['day']
+            if day is not None and (since is None or day < since):
+                since = day
+        return cls.backfill(since=since) if since is not None else 0
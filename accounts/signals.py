@@ -0,0 +1,110 @@
+"""
+Signal handlers that keep the DailyStats dashboard rollup up to date.
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from contact.models import ContactSubmission
+from properties.models import Property
+from reviews.models import Review
+from team.models import TeamMember
+from .models import DailyStats
+
+
+def _previous(instance, *fields):
+    if instance.pk is None:
+        return None
+    return type(instance).objects.filter(pk=instance.pk).values(*fields).first()
+
+
+# ─── Properties ──────────────────────────────────────────────────────────────
+
+@receiver(pre_save, sender=Property)
+def capture_property(sender, instance, raw=False, **kwargs):
+    instance._dashboard_previous = None if raw else _previous(instance, 'is_active')
+
+
+@receiver(post_save, sender=Property)
+def record_property(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_dashboard_previous', None)
+    was_active = bool(previous and previous['is_active'])
+    DailyStats.record(
+        properties_created=int(created),
+        total_properties=int(created),
+        active_properties=int(instance.is_active) - int(was_active),
+    )
+
+
+@receiver(post_delete, sender=Property)
+def record_property_delete(sender, instance, **kwargs):
+    DailyStats.record(total_properties=-1, active_properties=-int(instance.is_active))
+
+
+# ─── Reviews ─────────────────────────────────────────────────────────────────
+# The previous (property_id, rating, is_approved) is captured by reviews.signals.
+
+@receiver(post_save, sender=Review)
+def record_review(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = {}
+    if created:
+        deltas = {'reviews_created': 1, 'total_reviews': 1, f'reviews_rating_{instance.rating}': 1}
+    previous = getattr(instance, '_previous_state', None)
+    was_approved, old_rating = (previous[2], previous[1]) if previous else (False, 0)
+    deltas['approved_reviews'] = int(instance.is_approved) - int(was_approved)
+    deltas['approved_rating_sum'] = (
+        (instance.rating if instance.is_approved else 0) - (old_rating if was_approved else 0)
+    )
+    DailyStats.record(**deltas)
+
+
+@receiver(post_delete, sender=Review)
+def record_review_delete(sender, instance, **kwargs):
+    approved = int(instance.is_approved)
+    DailyStats.record(
+        total_reviews=-1,
+        approved_reviews=-approved,
+        approved_rating_sum=-instance.rating * approved,
+    )
+
+
+# ─── Team ────────────────────────────────────────────────────────────────────
+
+@receiver(post_save, sender=TeamMember)
+def record_team_member(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        DailyStats.record(total_team_members=1)
+
+
+@receiver(post_delete, sender=TeamMember)
+def record_team_member_delete(sender, instance, **kwargs):
+    DailyStats.record(total_team_members=-1)
+
+
+# ─── Leads ───────────────────────────────────────────────────────────────────
+
+@receiver(pre_save, sender=ContactSubmission)
+def capture_lead(sender, instance, raw=False, **kwargs):
+    instance._dashboard_previous = None if raw else _previous(instance, 'is_read')
+
+
+@receiver(post_save, sender=ContactSubmission)
+def record_lead(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_dashboard_previous', None)
+    was_read = bool(previous and previous['is_read'])
+    became_read = int(instance.is_read and not was_read)
+    DailyStats.record(
+        leads_received=int(created),
+        total_leads=int(created),
+        leads_read=became_read,
+        unread_leads=int(not instance.is_read) - int(previous is not None and not was_read),
+    )
+
+
+@receiver(post_delete, sender=ContactSubmission)
+def record_lead_delete(sender, instance, **kwargs):
+    DailyStats.record(total_leads=-1, unread_leads=-int(not instance.is_read))
@@ -1,3 +1,90 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from contact.models import ContactSubmission
+from properties.models import Property
+from reviews.models import Review
+from team.models import TeamMember
+from .models import DailyStats
+
+
+class DashboardStatsTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user('admin', is_staff=True))
+
+    def make_activity(self):
+        flat = Property.objects.create(name='Flat', location='L', description='x', price_per_night=1)
+        house = Property.objects.create(name='House', location='L', description='x', price_per_night=1)
+        house.is_active = False
+        house.save()
+        review = Review.objects.create(property=flat, guest_name='A', rating=4, review_text='x')
+        Review.objects.create(property=flat, guest_name='B', rating=2, review_text='x', is_approved=False)
+        review.rating = 5
+        review.save()
+        TeamMember.objects.create(name='T', role='R')
+        lead = ContactSubmission.objects.create(name='L', email='l@example.com', message='hi')
+        ContactSubmission.objects.create(name='M', email='m@example.com', message='hi')
+        lead.is_read = True
+        lead.save()
+        flat.delete()
+
+    def test_totals_and_series(self):
+        self.make_activity()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('dashboard-stats'), {'days': 7})
+        data = response.data
+        self.assertEqual(data['total_properties'], Property.objects.count())
+        self.assertEqual(data['active_properties'], 0)
+        self.assertEqual(data['total_reviews'], 2)
+        self.assertEqual(data['approved_reviews'], 1)
+        self.assertEqual(data['average_rating'], 5.0)
+        self.assertEqual(data['total_team_members'], 1)
+        self.assertEqual(data['unread_leads'], 1)
+        self.assertEqual(len(data['series']), 7)
+        today = data['series'][-1]
+        self.assertEqual(today['date'], timezone.localdate().isoformat())
+        self.assertEqual(today['properties_created'], 2)
+        self.assertEqual(today['reviews_by_rating'], {'1': 0, '2': 1, '3': 0, '4': 1, '5': 0})
+        self.assertEqual((today['leads_received'], today['leads_read']), (2, 1))
+
+    def test_backfill_matches_incremental_totals(self):
+        self.make_activity()
+        incremental = DailyStats.objects.get(date=timezone.localdate())
+        DailyStats.backfill()
+        rebuilt = DailyStats.objects.get(date=timezone.localdate())
+        for field in DailyStats.TOTAL_FIELDS:
+            self.assertEqual(getattr(rebuilt, field), getattr(incremental, field), field)
+        self.assertEqual(rebuilt.leads_read, 1)
+
+    def test_totals_carry_over_quiet_days(self):
+        TeamMember.objects.create(name='T', role='R')
+        DailyStats.objects.update(date=timezone.localdate() - datetime.timedelta(days=100))
+        response = self.client.get(reverse('dashboard-stats'), {'days': 30})
+        self.assertEqual(response.data['total_team_members'], 1)
+        self.assertEqual(len(response.data['series']), 30)
+
+    def test_drifted_counter_is_clamped(self):
+        lead = ContactSubmission.objects.create(name='L', email='l@example.com', message='hi')
+        # e.g. a row that predates the rollup
+        DailyStats.objects.update(total_leads=0, unread_leads=0)
+        lead.delete()
+        today = DailyStats.objects.get(date=timezone.localdate())
+        self.assertEqual((today.total_leads, today.unread_leads), (0, 0))
+
+    def test_refresh_rebuilds_only_the_touched_days(self):
+        old_day = timezone.localdate() - datetime.timedelta(days=30)
+        TeamMember.objects.create(name='T', role='R')
+        DailyStats.objects.create(date=old_day, total_team_members=99)
+        leads = [
+            ContactSubmission.objects.create(name=name, email=f'{name}@example.com', message='hi')
+            for name in ('a', 'b')
+        ]
+        DailyStats.objects.filter(date=timezone.localdate()).update(total_leads=50)
+        DailyStats.refresh(ContactSubmission, [lead.pk for lead in leads])
+        self.assertEqual(DailyStats.objects.get(date=old_day).total_team_members, 99)
+        today = DailyStats.objects.get(date=timezone.localdate())
+        self.assertEqual((today.total_leads, today.unread_leads, today.total_team_members), (2, 2, 1))
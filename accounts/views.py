@@ -9,10 +9,10 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from rest_framework_simplejwt.views import TokenRefreshView
-from django.db.models import Avg, Count
-from properties.models import Property
-from reviews.models import Review
-from team.models import TeamMember
+import datetime
+from django.db.models import Q, Subquery
+from django.utils import timezone
+from .models import DailyStats
 
 
 class AdminLoginView(APIView):
@@ -90,24 +90,52 @@ class AdminVerifyView(APIView):
 
 
 class DashboardStatsView(APIView):
-    """Get dashboard overview statistics."""
+    """Get dashboard overview statistics with a daily series (?days=N, default 30)."""
     permission_classes = [IsAuthenticated]
+    max_days = 365
 
     def get(self, request):
-        total_properties = Property.objects.count()
-        active_properties = Property.objects.filter(is_active=True).count()
-        total_reviews = Review.objects.count()
-        approved_reviews = Review.objects.filter(is_approved=True).count()
-        avg_rating = Review.objects.filter(is_approved=True).aggregate(
-            avg=Avg('rating')
-        )['avg']
-        total_team = TeamMember.objects.count()
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), self.max_days)
+        except ValueError:
+            return Response(
+                {'error': 'days must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        today = timezone.localdate()
+        start = today - datetime.timedelta(days=days - 1)
+
+        # One query: the rows in the window plus the latest row, whose running
+        # totals are current even if nothing changed within the window.
+        latest = DailyStats.objects.order_by('-date').values('pk')[:1]
+        rows = list(DailyStats.objects.filter(Q(date__gte=start) | Q(pk=Subquery(latest))))
+        if not rows:
+            DailyStats.backfill()
+            rows = list(DailyStats.objects.filter(Q(date__gte=start) | Q(pk=Subquery(latest))))
+        current = rows[-1] if rows else DailyStats(date=today)
+
+        by_date = {row.date: row for row in rows}
+        series = []
+        for offset in range(days):
+            date = start + datetime.timedelta(days=offset)
+            row = by_date.get(date) or DailyStats(date=date)
+            series.append({
+                'date': date.isoformat(),
+                'properties_created': row.properties_created,
+                'reviews_created': row.reviews_created,
+                'reviews_by_rating': row.get_reviews_by_rating(),
+                'leads_received': row.leads_received,
+                'leads_read': row.leads_read,
+            })
 
         return Response({
-            'total_properties': total_properties,
-            'active_properties': active_properties,
-            'total_reviews': total_reviews,
-            'approved_reviews': approved_reviews,
-            'average_rating': round(avg_rating, 1) if avg_rating else 0,
-            'total_team_members': total_team,
+            'total_properties': current.total_properties,
+            'active_properties': current.active_properties,
+            'total_reviews': current.total_reviews,
+            'approved_reviews': current.approved_reviews,
+            'average_rating': current.get_average_rating(),
+            'total_team_members': current.total_team_members,
+            'total_leads': current.total_leads,
+            'unread_leads': current.unread_leads,
+            'series': series,
         })
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import ContactSubmission
+from django.utils import timezone
+from accounts.models import DailyStats
+from .models import ContactSubmission, OutboundEmail
 
 
 @admin.register(ContactSubmission)
@@ -14,8 +16,29 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
 
     @admin.action(description='Mark selected as read')
     def mark_as_read(self, request, queryset):
-        queryset.update(is_read=True)
+        # Bulk updates bypass signals, so record the dashboard change here.
+        changed = queryset.filter(is_read=False).update(is_read=True)
+        DailyStats.record(leads_read=changed, unread_leads=-changed)
 
     @admin.action(description='Mark selected as unread')
     def mark_as_unread(self, request, queryset):
-        queryset.update(is_read=False)
+        changed = queryset.filter(is_read=True).update(is_read=False)
+        DailyStats.record(unread_leads=changed)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'last_error']
+    readonly_fields = ['submission', 'subject', 'body', 'from_email', 'to', 'attempts',
+                       'last_error', 'created_at', 'sent_at']
+    ordering = ['-created_at']
+
+    actions = ['requeue']
+
+    @admin.action(description='Requeue selected for delivery')
+    def requeue(self, request, queryset):
+        queryset.exclude(status=OutboundEmail.SENT).update(
+            status=OutboundEmail.PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
@@ -7,5 +7,7 @@ from . import views
 
 urlpatterns = [
     path('', views.AdminLeadListView.as_view(), name='admin-lead-list'),
+    path('export/', views.AdminLeadExportView.as_view(), name='admin-lead-export'),
+    path('import/', views.AdminLeadImportView.as_view(), name='admin-lead-import'),
     path('<int:pk>/', views.AdminLeadDetailView.as_view(), name='admin-lead-detail'),
 ]
@@ -0,0 +1,34 @@
+"""
+Bulk export/import dataset for contact submissions (leads). Imported leads
+are historical records, so no notification emails are queued for them.
+"""
+from rest_framework import serializers
+
+from nura_stays.bulk import Dataset
+
+from .models import ContactSubmission
+from .serializers import ContactSubmissionSerializer
+
+
+class LeadImportSerializer(ContactSubmissionSerializer):
+    """On updates only the columns given are checked."""
+
+    def validate(self, data):
+        if self.partial:
+            for field in ('name', 'email', 'message'):
+                if field in data and not (data[field] or '').strip():
+                    raise serializers.ValidationError({field: f'{field.capitalize()} is required.'})
+            return data
+        return super().validate(data)
+
+
+class LeadDataset(Dataset):
+    name = 'leads'
+    model = ContactSubmission
+    serializer_class = LeadImportSerializer
+    fields = ['id', 'name', 'email', 'phone', 'subject', 'message', 'is_read', 'created_at']
+    auto_now_fields = []
+
+    def after_import(self, created_ids, updated_ids, context):
+        from accounts.models import DailyStats
+        DailyStats.refresh(self.model, created_ids + updated_ids)
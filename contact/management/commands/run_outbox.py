@@ -0,0 +1,40 @@
+"""
+Management command that delivers queued contact emails.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from contact.outbox import deliver_batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Deliver pending OutboundEmail rows over one SMTP connection per batch, '
+        'retrying failures with backoff. Runs until interrupted unless --once is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain due emails, then exit')
+        parser.add_argument('--batch-size', type=int, default=None, help='Emails per batch (default OUTBOX_BATCH_SIZE)')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when idle (default 5)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or getattr(settings, 'OUTBOX_BATCH_SIZE', 50)
+        total_sent = total_failed = 0
+        try:
+            while True:
+                close_old_connections()
+                sent, failed = deliver_batch(batch_size)
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    self.stdout.write(f'Sent {sent}, failed {failed}.')
+                if sent + failed < batch_size:
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Done: sent {total_sent}, failed {total_failed}.'))
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0002_add_subject'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(fields=['created_at', 'id'], name='contact_created_idx'),
+        ),
+    ]
@@ -1,7 +1,9 @@
 """
 Contact form submission model for Nura Stays.
 """
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class ContactSubmission(models.Model):
@@ -17,6 +19,65 @@ class ContactSubmission(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='contact_created_idx'),
+        ]
 
     def __str__(self):
         return f"Message from {self.name} ({self.email})"
+
+
+class OutboundEmail(models.Model):
+    """
+    Transactional outbox for notification emails. Rows are written in the
+    same transaction as the record they describe and delivered by
+    ``manage.py run_outbox`` (see contact.outbox).
+    """
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    DEAD = 'dead'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (SENT, 'Sent'), (DEAD, 'Dead')]
+
+    submission = models.ForeignKey(
+        ContactSubmission, null=True, blank=True, on_delete=models.SET_NULL, related_name='emails'
+    )
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+    @classmethod
+    def for_submission(cls, submission):
+        """Queue the notification for a contact submission, if a recipient is configured."""
+        to_email = getattr(settings, 'CONTACT_EMAIL_TO', None)
+        if not to_email:
+            return None
+        return cls.objects.create(
+            submission=submission,
+            subject=f"Nura Stays Contact: {submission.subject or 'No subject'}",
+            body=(
+                f"Name: {submission.name}\n"
+                f"Email: {submission.email}\n"
+                f"Phone: {submission.phone or 'Not provided'}\n"
+                f"Subject: {submission.subject or '—'}\n\n"
+                f"Message:\n{submission.message}"
+            ),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[to_email],
+        )
@@ -0,0 +1,124 @@
+"""
+Delivery of queued OutboundEmail rows.
+
+Workers claim a batch of due rows by pushing their ``next_attempt_at`` past a
+lease (with SKIP LOCKED where the database supports it, so concurrent workers
+take disjoint batches), then send the whole batch over one SMTP connection.
+Failures are retried with exponential backoff; after OUTBOX_MAX_ATTEMPTS a
+row is dead-lettered (status ``dead``) and left for the admin to requeue. A
+worker that dies mid-batch leaves its rows to be picked up again when the
+lease expires, so delivery is at-least-once.
+
+Where no worker is deployed, OUTBOX_DELIVER_ON_COMMIT makes the submit
+view start deliver_in_background() once the new row is committed. It runs
+the same batch delivery in a thread after the response, so SMTP still never
+delays the request. Retries then only happen on the next submission.
+"""
+import datetime
+import logging
+import threading
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from nura_stays.metrics import EMAILS
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def get_backoff(attempts):
+    """Seconds to wait before the next attempt after ``attempts`` failures."""
+    base = getattr(settings, 'OUTBOX_RETRY_BASE_SECONDS', 60)
+    cap = getattr(settings, 'OUTBOX_RETRY_MAX_SECONDS', 6 * 60 * 60)
+    return min(base * 2 ** (attempts - 1), cap)
+
+
+def claim_batch(batch_size):
+    now = timezone.now()
+    lease = datetime.timedelta(seconds=getattr(settings, 'OUTBOX_LEASE_SECONDS', 300))
+    with transaction.atomic():
+        due = OutboundEmail.objects.filter(
+            status=OutboundEmail.PENDING, next_attempt_at__lte=now
+        ).order_by('next_attempt_at', 'pk')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        batch = list(due[:batch_size])
+        OutboundEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+            next_attempt_at=now + lease
+        )
+    return batch
+
+
+def _failed(email, error):
+    email.attempts += 1
+    email.last_error = str(error)[:2000]
+    if email.attempts >= getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 8):
+        email.status = OutboundEmail.DEAD
+        EMAILS.labels('dead').inc()
+        logger.error('Outbound email %s dead-lettered after %s attempts: %s', email.pk, email.attempts, error)
+    else:
+        email.next_attempt_at = timezone.now() + datetime.timedelta(seconds=get_backoff(email.attempts))
+        EMAILS.labels('retry').inc()
+        logger.warning('Outbound email %s failed (attempt %s): %s', email.pk, email.attempts, error)
+    email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def deliver_batch(batch_size=None):
+    """Send one batch of due emails. Returns (sent, failed)."""
+    batch = claim_batch(batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 50))
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    smtp = get_connection(fail_silently=False)
+    try:
+        smtp.open()
+    except Exception as e:
+        for email in batch:
+            _failed(email, e)
+        return 0, len(batch)
+
+    try:
+        for email in batch:
+            message = EmailMessage(
+                subject=email.subject, body=email.body, from_email=email.from_email,
+                to=email.to, connection=smtp,
+            )
+            try:
+                message.send()
+            except Exception as e:
+                _failed(email, e)
+                failed += 1
+                continue
+            email.attempts += 1
+            email.status = OutboundEmail.SENT
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            email.save(update_fields=['attempts', 'status', 'sent_at', 'last_error'])
+            EMAILS.labels('sent').inc()
+            sent += 1
+    finally:
+        try:
+            smtp.close()
+        except Exception:
+            logger.exception('Closing the SMTP connection failed')
+    return sent, failed
+
+
+def deliver_in_background():
+    """Deliver one batch of due emails in a daemon thread."""
+    threading.Thread(target=_deliver_and_close, name='outbox-delivery', daemon=True).start()
+
+
+def _deliver_and_close():
+    try:
+        deliver_batch()
+    except Exception:
+        logger.exception('Background outbox delivery failed')
+    finally:
+        # This thread's own database connections.
+        connections.close_all()
@@ -1,3 +1,153 @@
-from django.test import TestCase
+import datetime
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from prometheus_client import REGISTRY
+
+from .models import ContactSubmission, OutboundEmail
+from .outbox import deliver_batch
+
+
+class FailingBackend(BaseEmailBackend):
+    def open(self):
+        raise ConnectionRefusedError('SMTP unavailable')
+
+    def send_messages(self, messages):
+        raise AssertionError('not reached')
+
+
+class CountingBackend(BaseEmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+
+    def send_messages(self, messages):
+        mail.outbox.extend(messages)
+        return len(messages)
+
+
+def count(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def make_email(**kwargs):
+    data = {'subject': 'Hello', 'body': 'Body', 'from_email': 'a@example.com', 'to': ['b@example.com']}
+    data.update(kwargs)
+    return OutboundEmail.objects.create(**data)
+
+
+@override_settings(CONTACT_EMAIL_TO='owner@example.com')
+class ContactSubmitTests(APITestCase):
+    def setUp(self):
+        cache.clear()  # throttle history
+
+    def test_submit_queues_email_without_sending(self):
+        queued = count('contact_emails_total', outcome='queued')
+        response = self.client.post(reverse('contact-submit'), {
+            'name': 'Ada', 'email': 'ada@example.com', 'message': 'Is it free in May?',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(count('contact_emails_total', outcome='queued'), queued + 1)
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.submission, ContactSubmission.objects.get())
+        self.assertEqual(email.to, ['owner@example.com'])
+        self.assertIn('Is it free in May?', email.body)
+
+    def test_throttle_rejections_are_counted(self):
+        labels = {'throttle': 'ContactRateThrottle', 'route': 'api/contact/'}
+        rejected = count('throttle_rejections_total', **labels)
+        data = {'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hi'}
+        statuses = [self.client.post(reverse('contact-submit'), data).status_code for _ in range(6)]
+        self.assertEqual(statuses, [201] * 5 + [429])
+        self.assertEqual(count('throttle_rejections_total', **labels), rejected + 1)
+
+    def test_delivery_starts_on_commit_without_a_worker(self):
+        data = {'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hi'}
+        with mock.patch('contact.views.deliver_in_background') as deliver:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('contact-submit'), data)
+            self.assertEqual(deliver.call_count, 1)
+            with override_settings(OUTBOX_DELIVER_ON_COMMIT=False), \
+                    self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('contact-submit'), data)
+            self.assertEqual(deliver.call_count, 1)
+
+    @override_settings(CONTACT_EMAIL_TO='')
+    def test_no_recipient_queues_nothing(self):
+        self.client.post(reverse('contact-submit'), {'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hi'})
+        self.assertFalse(OutboundEmail.objects.exists())
+
+
+class OutboxDeliveryTests(TestCase):
+    @override_settings(EMAIL_BACKEND='contact.tests.CountingBackend')
+    def test_batch_shares_one_connection(self):
+        CountingBackend.opened = 0
+        sent = count('contact_emails_total', outcome='sent')
+        for i in range(3):
+            make_email(subject=f'Message {i}')
+        self.assertEqual(deliver_batch(), (3, 0))
+        self.assertEqual(count('contact_emails_total', outcome='sent'), sent + 3)
+        self.assertEqual(CountingBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.SENT).exists())
+        self.assertEqual(deliver_batch(), (0, 0))
+
+    @override_settings(
+        EMAIL_BACKEND='contact.tests.FailingBackend', OUTBOX_MAX_ATTEMPTS=2, OUTBOX_RETRY_BASE_SECONDS=60,
+    )
+    def test_failures_back_off_then_dead_letter(self):
+        email = make_email()
+        retries = count('contact_emails_total', outcome='retry')
+        dead = count('contact_emails_total', outcome='dead')
+        self.assertEqual(deliver_batch(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboundEmail.PENDING, 1))
+        self.assertIn('SMTP unavailable', email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now() + datetime.timedelta(seconds=50))
+        self.assertEqual(deliver_batch(), (0, 0))  # not due yet
+
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        deliver_batch()
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboundEmail.DEAD, 2))
+        self.assertEqual(count('contact_emails_total', outcome='retry'), retries + 1)
+        self.assertEqual(count('contact_emails_total', outcome='dead'), dead + 1)
+
+    def test_run_outbox_once(self):
+        make_email()
+        call_command('run_outbox', '--once', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutboundEmail.objects.get().status, OutboundEmail.SENT)
+
+
+class LeadBulkTests(APITestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        self.client.force_authenticate(User.objects.create_user('admin', is_staff=True))
+
+    def test_import_queues_no_email_and_export_round_trips(self):
+        content = (
+            '{"name": "Ada", "email": "ada@example.com", "message": "Hi", "is_read": true}\n'
+            '{"name": "", "email": "bo@example.com", "message": "Hi"}\n'
+            'not json\n'
+        )
+        file = SimpleUploadedFile('leads.jsonl', content.encode())
+        response = self.client.post(reverse('admin-lead-import'), {'file': file}, format='multipart')
+        self.assertEqual((response.data['created'], response.data['skipped']), (1, 2))
+        self.assertFalse(OutboundEmail.objects.exists())
+        self.assertTrue(ContactSubmission.objects.get().is_read)
+
+        response = self.client.get(reverse('admin-lead-export'), {'output': 'jsonl', 'search': 'ada'})
+        self.assertEqual(b''.join(response.streaming_content).count(b'\n'), 1)
@@ -3,13 +3,18 @@ Views for Contact app.
 """
 import logging
 from django.conf import settings
-from django.core.mail import send_mail
+from django.db import transaction
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
-from .models import ContactSubmission
+from .bulk import LeadDataset
+from .models import ContactSubmission, OutboundEmail
+from .outbox import deliver_in_background
 from .serializers import ContactSubmissionSerializer
+from nura_stays.bulk import ExportMixin, ImportView
+from nura_stays.metrics import EMAILS
+from nura_stays.pagination import KeysetPagination
+from nura_stays.throttling import AnonRateThrottle
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +26,7 @@ class AdminLeadListView(generics.ListAPIView):
     queryset = ContactSubmission.objects.all().order_by('-created_at')
     serializer_class = ContactSubmissionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         from django.db.models import Q
@@ -37,6 +43,16 @@ class AdminLeadListView(generics.ListAPIView):
         return qs
 
 
+class AdminLeadExportView(ExportMixin, AdminLeadListView):
+    """Admin: stream all (searched/filtered) leads as CSV or JSON Lines."""
+    dataset_class = LeadDataset
+
+
+class AdminLeadImportView(ImportView):
+    """Admin: bulk create or update leads from a CSV or JSON Lines file. No emails are sent."""
+    dataset_class = LeadDataset
+
+
 class AdminLeadDetailView(generics.RetrieveUpdateAPIView):
     """Admin: retrieve or partial update a single lead (e.g. mark as read/unread)."""
     queryset = ContactSubmission.objects.all()
@@ -50,7 +66,7 @@ class ContactRateThrottle(AnonRateThrottle):
 
 
 class ContactSubmitView(generics.CreateAPIView):
-    """Submit a contact form. Saves to DB and sends email to configured address."""
+    """Submit a contact form. Saves to DB and queues an email to the configured address."""
     queryset = ContactSubmission.objects.all()
     serializer_class = ContactSubmissionSerializer
     permission_classes = [AllowAny]
@@ -59,28 +75,16 @@ class ContactSubmitView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        instance = serializer.save()
-        # Send email (if configured). Save to DB even if email fails.
-        to_email = getattr(settings, 'CONTACT_EMAIL_TO', None)
-        if to_email:
-            try:
-                subject = f"Nura Stays Contact: {instance.subject or 'No subject'}"
-                body = (
-                    f"Name: {instance.name}\n"
-                    f"Email: {instance.email}\n"
-                    f"Phone: {instance.phone or 'Not provided'}\n"
-                    f"Subject: {instance.subject or '—'}\n\n"
-                    f"Message:\n{instance.message}"
-                )
-                send_mail(
-                    subject=subject,
-                    message=body,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[to_email],
-                    fail_silently=True,
-                )
-            except Exception as e:
-                logger.exception("Contact form email failed: %s", e)
+        # Queue the notification in the same transaction; `manage.py run_outbox`
+        # (or the on-commit fallback thread) delivers it, so SMTP latency and
+        # failures never reach this request.
+        with transaction.atomic():
+            instance = serializer.save()
+            email = OutboundEmail.for_submission(instance)
+            if email is not None and getattr(settings, 'OUTBOX_DELIVER_ON_COMMIT', True):
+                transaction.on_commit(deliver_in_background)
+        if email is not None:
+            EMAILS.labels('queued').inc()
         return Response(
             {'message': 'Thank you! Your message has been received. We will get back to you soon.'},
             status=status.HTTP_201_CREATED,
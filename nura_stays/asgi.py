@@ -9,8 +9,16 @@ https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nura_stays.settings')
+# Serve the public read endpoints from their async views (nura_stays.asyncviews).
+os.environ.setdefault('ASYNC_VIEWS', 'True')
 
-application = get_asgi_application()
+# What get_asgi_application() does, with a handler that streams sync
+# iterators (media files, exports) incrementally; see nura_stays.streaming.
+django.setup(set_prefix=False)
+
+from nura_stays.streaming import ASGIHandler  # noqa: E402
+
+application = ASGIHandler()
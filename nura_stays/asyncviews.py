@@ -0,0 +1,120 @@
+"""
+Async versions of the public read views, for ASGI deployments.
+
+DRF views are synchronous, so under ASGI each request would hold a thread
+for its whole lifetime. AsyncAPIViewMixin gives a view an async dispatch and
+``get``; the GET work then runs on the event loop through ``aget``, which
+ConditionalGetMixin and CachedResponseMixin implement next to ``get`` and
+which AsyncListMixin / AsyncRetrieveMixin finish with the async ORM
+(``acount()``, ``async for``, ``aget()``). Sync steps that may hit the
+database or a cache backend (authentication, throttling, filter validation,
+storing a cache miss) run through sync_to_async.
+
+The sync classes stay the WSGI path: ``read_view`` routes to the async
+version only when ASYNC_VIEWS is on, which asgi.py makes the default.
+"""
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework.response import Response
+from rest_framework.views import APIView, get_view_name
+
+from .timing import SerializeTimingMixin, serialized
+
+
+def read_view(sync_view, async_view, **initkwargs):
+    """as_view() of the view class matching the server (see ASYNC_VIEWS)."""
+    view = async_view if getattr(settings, 'ASYNC_VIEWS', False) else sync_view
+    return view.as_view(**initkwargs)
+
+
+class AsyncAPIViewMixin:
+    """Make a DRF view async: dispatch on the event loop, GET through ``aget``."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # OPTIONS and the browsable API describe the endpoint as the sync view does.
+        sync_view = next(base for base in cls.__mro__[1:] if issubclass(base, APIView))
+        cls.name = get_view_name(sync_view())
+        cls.description = sync_view.__doc__
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                # OPTIONS is answered by DRF's sync handler.
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aget(request, *args, **kwargs)
+
+
+class AsyncGenericMixin(SerializeTimingMixin):
+    """Shared by the async mixins; the sync list() / retrieve() come timed from SerializeTimingMixin."""
+
+    async def afilter_queryset(self):
+        # Filter backends may validate against the database (ModelChoiceFilter).
+        return await sync_to_async(lambda: self.filter_queryset(self.get_queryset()))()
+
+
+class AsyncListMixin(AsyncGenericMixin):
+    """The async counterpart of ListModelMixin; list it just before ListAPIView."""
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        paginate = getattr(self.paginator, 'apaginate_queryset', None)
+        if paginate is None:
+            return await sync_to_async(self.paginate_queryset)(queryset)
+        return await paginate(queryset, self.request, view=self)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset()
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialized(self.get_serializer(page, many=True)))
+        return Response(serialized(self.get_serializer([obj async for obj in queryset], many=True)))
+
+
+class AsyncRetrieveMixin(AsyncGenericMixin):
+    """The async counterpart of RetrieveModelMixin; list it just before RetrieveAPIView."""
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+    async def aget_object(self):
+        queryset = await self.afilter_queryset()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except queryset.model.DoesNotExist:
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return Response(serialized(self.get_serializer(await self.aget_object())))
@@ -0,0 +1,335 @@
+"""
+Streaming bulk export and batched import for admin datasets.
+
+A Dataset describes one model: the columns it exports, the serializer that
+validates imported rows and the bookkeeping to run after bulk writes (which
+bypass model signals). Exports stream CSV or JSON Lines from
+``values_list().iterator()`` in constant memory. Imports read rows lazily,
+validate them a batch at a time (with one query per batch for any lookups),
+write each batch with bulk_create/bulk_update in its own transaction, skip
+and report invalid rows, and run the dataset's ``after_import`` once at the
+end.
+"""
+import csv
+import io
+import json
+import time
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.serializers import as_serializer_error
+from rest_framework.views import APIView
+
+FORMATS = ('csv', 'jsonl')
+CONTENT_TYPES = {'csv': 'text/csv; charset=utf-8', 'jsonl': 'application/x-ndjson'}
+MAX_REPORTED_ERRORS = 100
+
+DATASETS = {
+    'properties': 'properties.bulk.PropertyDataset',
+    'reviews': 'reviews.bulk.ReviewDataset',
+    'leads': 'contact.bulk.LeadDataset',
+}
+
+
+def get_dataset(name):
+    return import_string(DATASETS[name])()
+
+
+def guess_format(filename, default='csv'):
+    name = (filename or '').lower()
+    if name.endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def _as_id(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+def _flag(data, name):
+    return str(data.get(name, 'false')).lower() == 'true'
+
+
+class _Echo:
+    """csv.writer target that hands each formatted line back."""
+
+    def write(self, value):
+        return value
+
+
+def read_rows(stream, fmt):
+    """
+    Yield (line_number, row) from a binary stream. A row is a dict, or an
+    Exception for a line that could not be parsed.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError('Expected a JSON object.')
+        except ValueError as e:
+            row = e
+        yield number, row
+
+
+class Dataset:
+    """Describe how one model is exported and imported in bulk."""
+    name = None
+    model = None
+    serializer_class = None
+    # Exported columns, in order; importable columns come from the serializer.
+    fields = []
+    # Columns holding JSON values (encoded as JSON text in CSV).
+    json_fields = []
+    # Set on updated rows, since bulk_update skips auto_now.
+    auto_now_fields = ['updated_at']
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    # ─── Export ──────────────────────────────────────────────────────────────
+
+    def export_rows(self, queryset, fmt, chunk_size=2000):
+        """Yield the encoded export, one line at a time."""
+        rows = queryset.values_list(*self.fields).iterator(chunk_size=chunk_size)
+        if fmt == 'csv':
+            writer = csv.writer(_Echo())
+            yield writer.writerow(self.fields)
+            for row in rows:
+                yield writer.writerow([self.encode_csv(field, value) for field, value in zip(self.fields, row)])
+        else:
+            for row in rows:
+                yield json.dumps(dict(zip(self.fields, row)), cls=DjangoJSONEncoder) + '\n'
+
+    def encode_csv(self, field, value):
+        if field in self.json_fields:
+            return json.dumps(value)
+        if value is None:
+            return ''
+        return value.isoformat() if hasattr(value, 'isoformat') else value
+
+    def export_response(self, queryset, fmt):
+        response = StreamingHttpResponse(
+            (line.encode() for line in self.export_rows(queryset, fmt)),
+            content_type=CONTENT_TYPES[fmt],
+        )
+        filename = f'{self.name}-{timezone.localdate().isoformat()}.{fmt}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    # ─── Import ──────────────────────────────────────────────────────────────
+
+    def clean_row(self, row, fmt):
+        """Drop empty CSV cells (treated as not given) and decode JSON columns."""
+        if fmt != 'csv':
+            return row
+        cleaned = {}
+        for key, value in row.items():
+            if key is None or value is None or value == '':
+                continue
+            if key in self.json_fields:
+                value = json.loads(value)
+            cleaned[key] = value
+        return cleaned
+
+    def validate_batch(self, items):
+        """
+        Hook for checks that need the database, done once per batch. ``items``
+        is a list of (line_number, validated_data, existing_instance_or_None);
+        return {line_number: errors}.
+        """
+        return {}
+
+    def build(self, data, existing):
+        """Apply validated data to ``existing`` (update) or a new instance."""
+        instance = existing or self.model()
+        for field, value in data.items():
+            setattr(instance, field, value)
+        return instance
+
+    def prepare(self, created, updated, context):
+        """Hook to fill derived fields before the batch is written."""
+
+    def after_import(self, created_ids, updated_ids, context):
+        """Hook for index, rollup and cache upkeep once all batches are written."""
+
+    def import_rows(self, rows, fmt, batch_size=1000, update=False, dry_run=False, progress=None):
+        """
+        Validate and write ``rows`` (from read_rows) in batches. With
+        ``update``, rows whose ``id`` exists update that row; otherwise ids are
+        ignored and every valid row is created. Returns a summary dict.
+        """
+        summary = {'rows': 0, 'created': 0, 'updated': 0, 'skipped': 0, 'errors': []}
+        created_ids, updated_ids, context = [], [], {}
+        started = time.perf_counter()
+        batch = []
+
+        def flush():
+            self._import_batch(batch, fmt, update, dry_run, summary, created_ids, updated_ids, context)
+            batch.clear()
+            if progress:
+                elapsed = time.perf_counter() - started
+                progress({**summary, 'errors': len(summary['errors']), 'seconds': elapsed,
+                          'rows_per_second': summary['rows'] / elapsed if elapsed else 0})
+
+        try:
+            for item in rows:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+        finally:
+            if not dry_run and (created_ids or updated_ids):
+                self.after_import(created_ids, updated_ids, context)
+        return summary
+
+    def _error(self, summary, line, errors):
+        summary['skipped'] += 1
+        if len(summary['errors']) < MAX_REPORTED_ERRORS:
+            summary['errors'].append({'line': line, 'errors': errors})
+
+    def _import_batch(self, batch, fmt, update, dry_run, summary, created_ids, updated_ids, context):
+        summary['rows'] += len(batch)
+        parsed = []
+        for line, row in batch:
+            if isinstance(row, Exception):
+                self._error(summary, line, {'row': [str(row)]})
+                continue
+            try:
+                row = self.clean_row(row, fmt)
+            except ValueError as e:
+                self._error(summary, line, {'row': [f'Invalid JSON value: {e}']})
+                continue
+            pk = _as_id(row.get('id')) if update else None
+            if update and row.get('id') not in (None, '') and pk is None:
+                self._error(summary, line, {'id': ['Expected an integer id.']})
+                continue
+            parsed.append((line, row, pk))
+
+        pks = {pk for _, _, pk in parsed if pk is not None}
+        existing = self.model.objects.in_bulk(pks) if pks else {}
+        # One serializer validates the whole batch: building its fields costs
+        # more than validating a row, so they are built once, not per row.
+        serializer = self.serializer_class()
+        items = []
+        for line, row, pk in parsed:
+            instance = existing.get(pk)
+            if pk is not None and instance is None:
+                self._error(summary, line, {'id': ['No row with this id to update.']})
+                continue
+            serializer.instance, serializer.partial = instance, instance is not None
+            try:
+                data = serializer.run_validation(row)
+            except (ValidationError, DjangoValidationError) as e:
+                self._error(summary, line, as_serializer_error(e))
+                continue
+            items.append((line, dict(data), instance))
+
+        errors = self.validate_batch(items)
+        created, updated = [], []
+        for line, data, instance in items:
+            if line in errors:
+                self._error(summary, line, errors[line])
+                continue
+            if instance is not None:
+                self.remember_previous(instance, context)
+                updated.append((self.build(data, instance), set(data)))
+            else:
+                created.append(self.build(data, None))
+
+        if dry_run:
+            summary['created'] += len(created)
+            summary['updated'] += len(updated)
+            return
+
+        now = timezone.now()
+        instances = [instance for instance, _ in updated]
+        for instance in instances:
+            for field in self.auto_now_fields:
+                setattr(instance, field, now)
+        self.prepare(created, instances, context)
+        update_fields = sorted(set().union(*(fields for _, fields in updated)) | set(self.auto_now_fields)
+                               | set(self.prepared_fields())) if updated else []
+        with transaction.atomic():
+            if created:
+                self.model.objects.bulk_create(created, batch_size=500)
+            if updated:
+                self.model.objects.bulk_update(instances, update_fields, batch_size=500)
+        created_ids.extend(instance.pk for instance in created)
+        updated_ids.extend(instance.pk for instance in instances)
+        summary['created'] += len(created)
+        summary['updated'] += len(updated)
+
+    def remember_previous(self, instance, context):
+        """Hook to note an updated row's old values before they are overwritten."""
+
+    def prepared_fields(self):
+        """Fields prepare() may change on updated rows."""
+        return []
+
+
+class ExportMixin:
+    """
+    Stream ``dataset_class`` as ?output=csv (default) or ?output=jsonl over
+    the view's filtered queryset. (DRF reserves ?format= for renderers.)
+    """
+    dataset_class = None
+    http_method_names = ['get', 'head', 'options']
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.query_params.get('output', 'csv')
+        if fmt not in FORMATS:
+            raise ValidationError({'output': [f'Expected one of: {", ".join(FORMATS)}.']})
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.dataset_class().export_response(queryset, fmt)
+
+
+class ImportView(APIView):
+    """
+    Admin: import a CSV or JSON Lines ``file`` into ``dataset_class``.
+    ``update=true`` updates rows by id; ``dry_run=true`` only validates.
+    """
+    dataset_class = None
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.data.get('input') or guess_format(upload.name)
+        if fmt not in FORMATS:
+            return Response({'error': f'Unsupported format: {fmt}'}, status=status.HTTP_400_BAD_REQUEST)
+        dataset = self.dataset_class()
+        try:
+            summary = dataset.import_rows(
+                read_rows(upload.file, fmt), fmt,
+                update=_flag(request.data, 'update'), dry_run=_flag(request.data, 'dry_run'),
+            )
+        except (UnicodeDecodeError, csv.Error) as e:
+            return Response({'error': f'Could not read file: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(summary)
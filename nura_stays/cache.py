@@ -0,0 +1,278 @@
+"""
+Versioned response cache and conditional GET support for public read endpoints.
+
+Each watched model has a version stored in the configured cache backend:
+the time of its last bump in nanoseconds, which also serves as the
+model's Last-Modified. Cached responses are keyed on the request URL plus
+the current versions of the models they depend on, so bumping a version on
+post_save/post_delete invalidates every dependent endpoint on every worker
+sharing the backend, without having to enumerate keys. Entries also hold
+the body precompressed in every supported encoding (see compression.py).
+"""
+import hashlib
+import threading
+import time
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import CharField, Count, Max, Value
+from django.db.models.signals import post_save, post_delete
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .compression import available_encodings, choose_encoding, compress_variants, set_encoded_content
+
+KEY_PREFIX = 'respcache'
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _version_key(label):
+    return f'{KEY_PREFIX}:version:{label}'
+
+
+def _label(model):
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def bump_version(model):
+    """
+    Invalidate every cached response that depends on ``model`` once the
+    current transaction commits (immediately outside one). Bumping earlier
+    would let a concurrent reader cache the old rows under the new version.
+    """
+    label = _label(model)
+    transaction.on_commit(lambda: _bump(label))
+
+
+def _bump(label):
+    cache = get_cache()
+    key = _version_key(label)
+    # Always past the previous value, even if two bumps share a clock tick;
+    # two workers racing here both still move the version off the old one.
+    # A missing or evicted version restarts from the clock, so entries
+    # written under an earlier one can never be matched again.
+    cache.set(key, max(time.time_ns(), (cache.get(key) or 0) + 1), None)
+
+
+def get_versions(labels):
+    cache = get_cache()
+    keys = [_version_key(label) for label in labels]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _invalidate(sender, raw=False, **kwargs):
+    if not raw:
+        bump_version(sender)
+
+
+def watch_models(*models):
+    """Bump a model's version whenever one of its rows is saved or deleted."""
+    for model in models:
+        uid = f'{KEY_PREFIX}:{_label(model)}'
+        post_save.connect(_invalidate, sender=model, dispatch_uid=f'{uid}:save')
+        post_delete.connect(_invalidate, sender=model, dispatch_uid=f'{uid}:delete')
+
+
+def build_cache_key(request, labels, params=None):
+    """
+    Key on scheme, host, path, sorted query, media type and model versions.
+    ``params`` replaces the query string's (key, value) pairs when given.
+    """
+    if params is None:
+        params = [(key, value) for key in request.GET for value in request.GET.getlist(key)]
+    query = urlencode(sorted(params))
+    versions = get_versions(labels)
+    raw = '|'.join([
+        request.scheme, request.get_host(), request.path, query,
+        getattr(request, 'accepted_media_type', ''),
+        *(f'{label}={version}' for label, version in zip(labels, versions)),
+    ])
+    return f'{KEY_PREFIX}:response:{hashlib.sha256(raw.encode()).hexdigest()}'
+
+
+def record(hit):
+    with _stats_lock:
+        _stats['hits' if hit else 'misses'] += 1
+
+
+def stats():
+    """Return this process's cache hit/miss counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _encode(request, response, variants):
+    """Send the stored variant the client accepts, if there are any."""
+    if not variants:
+        return
+    patch_vary_headers(response, ['Accept-Encoding'])
+    encoding = choose_encoding(request, [name for name in available_encodings() if name in variants])
+    if encoding is not None:
+        set_encoded_content(response, encoding, variants[encoding])
+
+
+class CachedResponseMixin:
+    """
+    Cache the rendered body of successful GET responses, together with its
+    compressed variants.
+
+    Set ``cache_models`` to the labels ('app_label.modelname') of every model
+    the response is built from.
+    """
+    cache_models = ()
+    cache_timeout = None
+
+    def get_cache_params(self, request):
+        """Query (key, value) pairs the response depends on; None for all of them."""
+        return None
+
+    def get(self, request, *args, **kwargs):
+        if not self.response_cache_enabled():
+            return super().get(request, *args, **kwargs)
+        key, response = self.cached_response(request)
+        if response is not None:
+            return response
+        return self.store_response(request, key, super().get(request, *args, **kwargs), *args, **kwargs)
+
+    async def aget(self, request, *args, **kwargs):
+        """get() for async views (nura_stays.asyncviews)."""
+        if not self.response_cache_enabled():
+            return await super().aget(request, *args, **kwargs)
+        key, response = await sync_to_async(self.cached_response)(request)
+        if response is not None:
+            return response
+        response = await super().aget(request, *args, **kwargs)
+        return await sync_to_async(self.store_response)(request, key, response, *args, **kwargs)
+
+    def response_cache_enabled(self):
+        return getattr(settings, 'RESPONSE_CACHE_ENABLED', True) and bool(self.cache_models)
+
+    def cached_response(self, request):
+        """Return (key, the cached response or None)."""
+        key = build_cache_key(request, self.cache_models, self.get_cache_params(request))
+        cached = get_cache().get(key)
+        record(hit=cached is not None)
+        if cached is None:
+            return key, None
+        # Entries stored before compression was added have no variants.
+        content, content_type, variants = (*cached, {})[:3]
+        response = HttpResponse(content, content_type=content_type)
+        patch_vary_headers(response, ['Accept'])
+        _encode(request, response, variants)
+        response['X-Cache'] = 'HIT'
+        return key, response
+
+    def store_response(self, request, key, response, *args, **kwargs):
+        if response.status_code == 200:
+            # Render now so the stored body is exactly what this client gets.
+            self.finalize_response(request, response, *args, **kwargs)
+            response.render()
+            timeout = self.cache_timeout or getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 3600)
+            variants = compress_variants(response.content)
+            get_cache().set(key, (response.content, response['Content-Type'], variants), timeout)
+            _encode(request, response, variants)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+def get_validators(labels):
+    """
+    Return (etag, last_modified). The ETag digest covers max(updated_at) and
+    the row count per model plus the model versions, so writes made with
+    .update() (which leave updated_at alone but bump the version) change it
+    too. Last-Modified is the latest version bump, which never moves
+    backwards, not even when the newest row is deleted.
+
+    The aggregates are memoized under the current model versions, so they are
+    only recomputed after a watched model changes.
+    """
+    cache = get_cache()
+    versions = get_versions(labels)
+    last_modified = max(versions) // 10**9 if versions else None
+    key = f'{KEY_PREFIX}:validators:' + '|'.join(
+        f'{label}={version}' for label, version in zip(labels, versions)
+    )
+    digest = cache.get(key)
+    if digest is None:
+        # One UNION ALL query: a (label, max(updated_at), count) row per model.
+        querysets = [
+            apps.get_model(label).objects.order_by()
+            .annotate(label=Value(label, output_field=CharField()))
+            .values('label').annotate(last=Max('updated_at'), count=Count('pk'))
+            for label in labels
+        ]
+        rows = querysets[0].union(*querysets[1:], all=True)
+        parts = [
+            f"{row['label']}:{row['count']}:{row['last'].timestamp() if row['last'] else 0}"
+            for row in sorted(rows, key=lambda row: row['label'])
+        ]
+        digest = hashlib.sha256('|'.join([*parts, key]).encode()).hexdigest()[:32]
+        cache.set(key, digest, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 3600))
+    return digest, last_modified
+
+
+class ConditionalGetMixin:
+    """
+    Answer If-None-Match / If-Modified-Since with 304 before any query or
+    serializer runs, and send validators plus CDN-friendly Cache-Control.
+
+    Uses the same ``cache_models`` as CachedResponseMixin; list it first.
+    """
+    cache_models = ()
+
+    def get(self, request, *args, **kwargs):
+        if not self.cache_models:
+            return super().get(request, *args, **kwargs)
+        validators, response = self.conditional_response(request)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.add_validators(response, *validators)
+
+    async def aget(self, request, *args, **kwargs):
+        """get() for async views (nura_stays.asyncviews)."""
+        if not self.cache_models:
+            return await super().aget(request, *args, **kwargs)
+        validators, response = await sync_to_async(self.conditional_response)(request)
+        if response is None:
+            response = await super().aget(request, *args, **kwargs)
+        return self.add_validators(response, *validators)
+
+    def conditional_response(self, request):
+        """Return ((etag, last_modified), a 304/412 response or None)."""
+        digest, last_modified = get_validators(self.cache_models)
+        # The representation depends on the negotiated renderer too.
+        media_type = getattr(request, 'accepted_media_type', '')
+        etag = '"%s"' % hashlib.sha256(f'{digest}|{media_type}'.encode()).hexdigest()[:32]
+        return (etag, last_modified), get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+    def add_validators(self, response, etag, last_modified):
+        if response.status_code in (200, 304):
+            # An encoded body is a different byte sequence: its ETag is weak.
+            response['ETag'] = f'W/{etag}' if response.has_header('Content-Encoding') else etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=getattr(settings, 'HTTP_CACHE_MAX_AGE', 0),
+                s_maxage=getattr(settings, 'HTTP_CACHE_S_MAXAGE', 60),
+                must_revalidate=True,
+            )
+            patch_vary_headers(response, ['Accept'])
+        return response
@@ -0,0 +1,167 @@
+"""
+Negotiated gzip/brotli response compression.
+
+Compressing the same cached JSON on every request wastes CPU, so cached
+responses (nura_stays.cache) are compressed once, at the highest level,
+when they are stored; each encoding is kept next to the identity body and
+a hit only picks the variant the client accepts. CompressionMiddleware
+covers every other response at a cheaper level: bodies under
+COMPRESSION_MIN_SIZE and non-text types are sent as-is, streaming
+responses (exports) are compressed incrementally in bounded chunks, and
+responses that are already encoded, partial or marked no-transform are
+left alone. Brotli is preferred when the client accepts it, then gzip.
+"""
+import gzip
+import re
+import zlib
+
+import brotli
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+# (gzip level, brotli quality): once per cached body, or per request.
+STORED_LEVELS = (9, 11)
+ON_THE_FLY_LEVELS = (6, 4)
+# Streaming responses are flushed to the client every this many input bytes.
+STREAM_FLUSH_SIZE = 16 * 1024
+
+_COMPRESSIBLE = {
+    'application/json', 'application/javascript', 'application/x-ndjson',
+    'application/xml', 'image/svg+xml',
+}
+_CODING_RE = re.compile(r'^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$')
+
+
+def available_encodings():
+    """Encodings this server can produce, most preferred first."""
+    return ('br', 'gzip')
+
+
+def min_size():
+    return getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+
+
+def choose_encoding(request, encodings):
+    """The best of ``encodings`` acceptable per Accept-Encoding, or None."""
+    accepted = {}
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').lower().split(','):
+        match = _CODING_RE.match(part)
+        if match:
+            try:
+                accepted[match.group(1)] = float(match.group(2) or 1)
+            except ValueError:
+                continue
+    best, best_q = None, 0
+    for encoding in encodings:
+        q = accepted.get(encoding, accepted.get('*', 0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type):
+    media_type = content_type.split(';')[0].strip().lower()
+    return media_type.startswith('text/') or media_type in _COMPRESSIBLE or media_type.endswith('+json')
+
+
+def compress(body, encoding, levels=ON_THE_FLY_LEVELS):
+    if encoding == 'br':
+        return brotli.compress(body, quality=levels[1])
+    return gzip.compress(body, compresslevel=levels[0], mtime=0)
+
+
+def compress_variants(body):
+    """{encoding: compressed body} for every encoding that makes ``body`` smaller."""
+    if len(body) < min_size():
+        return {}
+    variants = {}
+    for encoding in available_encodings():
+        compressed = compress(body, encoding, STORED_LEVELS)
+        if len(compressed) < len(body):
+            variants[encoding] = compressed
+    return variants
+
+
+def set_encoded_content(response, encoding, body):
+    response.content = body
+    response['Content-Encoding'] = encoding
+    response['Content-Length'] = str(len(body))
+
+
+class _GzipStream:
+    """zlib in gzip framing with the process/flush/finish API of brotli.Compressor."""
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+def compress_stream(chunks, encoding):
+    """
+    Compress an iterable of byte chunks lazily, flushing whenever
+    STREAM_FLUSH_SIZE input bytes have accumulated so the client keeps
+    receiving data without each tiny chunk costing a flush.
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=ON_THE_FLY_LEVELS[1])
+    else:
+        compressor = _GzipStream(ON_THE_FLY_LEVELS[0])
+    pending = 0
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        pending += len(chunk)
+        if pending >= STREAM_FLUSH_SIZE:
+            data += compressor.flush()
+            pending = 0
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress responses the views did not already encode (see module docstring)."""
+
+    async def __acall__(self, request):
+        # Pure CPU work: no need for MiddlewareMixin's thread hop under ASGI.
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if (response.has_header('Content-Encoding') or response.status_code not in (200, 201)
+                or 'no-transform' in response.get('Cache-Control', '')
+                or not is_compressible(response.get('Content-Type', ''))):
+            return response
+        if response.streaming:
+            if getattr(response, 'is_async', False):
+                return response
+        elif len(response.content) < min_size():
+            return response
+
+        patch_vary_headers(response, ['Accept-Encoding'])
+        encoding = choose_encoding(request, available_encodings())
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response['Content-Length']
+            response['Content-Encoding'] = encoding
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            set_encoded_content(response, encoding, compressed)
+
+        # The encoded bytes differ from the identity ones: keep only a weak ETag.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        return response
@@ -0,0 +1,193 @@
+"""
+High-throughput list serialization.
+
+Once the SQL is tight, building model instances and walking a
+ModelSerializer field by field dominates the CPU time of large list pages.
+FastListMixin compiles the view's serializer (after any sparse fieldset)
+into a plan: the ``.values()`` keys to select and one extractor per output
+field. Rows are fetched as dicts and turned into output dicts in serializer
+field order, so the JSON is identical to the serializer's.
+
+Plain fields compile from their DRF field class: values DRF passes through
+unchanged are copied, decimals and dates reuse the field's own
+to_representation (datetimes resolve their timezone once per request) and
+file fields become (absolute) storage URLs. Any other field needs a ``fast_<name>(row)`` method on the serializer, reading
+the keys listed for it in ``Meta.field_columns`` (or annotations named in
+``Meta.fast_annotations``). Serializers may define ``prepare_fast_rows(rows)``
+to attach per-page data with one query. Serializers that cannot be compiled,
+and every view when FAST_SERIALIZATION is off, use the regular path.
+"""
+from operator import itemgetter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .fieldsets import ordering_columns
+from .timing import span
+
+# DRF fields whose to_representation returns database values unchanged.
+_PASSTHROUGH = (
+    serializers.BooleanField, serializers.CharField, serializers.ChoiceField,
+    serializers.IntegerField, serializers.JSONField, serializers.PrimaryKeyRelatedField,
+)
+# DRF fields whose to_representation formats the value; called as-is.
+_FORMATTED = (
+    serializers.DateField, serializers.DecimalField,
+    serializers.FloatField, serializers.TimeField, serializers.UUIDField,
+)
+
+
+def file_url(storage, name, request):
+    """What DRF's FileField renders for a stored file name."""
+    if not name:
+        return None
+    url = storage.url(name)
+    return request.build_absolute_uri(url) if request else url
+
+
+def _model_field(model, source):
+    """The model field at a dotted serializer source, or None."""
+    field = None
+    for part in source.split('.'):
+        if field is not None:
+            if not field.is_relation or field.many_to_many or field.one_to_many:
+                return None
+            model = field.related_model
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+    return field if field.concrete else None
+
+
+def _datetime_converter(field):
+    """DateTimeField.to_representation with the timezone lookup done once."""
+    if getattr(field, 'format', api_settings.DATETIME_FORMAT) != ISO_8601:
+        return field.to_representation
+    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if tz is None:
+        return field.to_representation
+
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _nullable(convert, key):
+    def extract(row):
+        value = row[key]
+        return None if value is None else convert(value)
+    return extract
+
+
+class FastPlan:
+    """A compiled serializer: ``values(queryset)`` then ``render(rows)``."""
+
+    def __init__(self, serializer, keys, extractors):
+        self.serializer = serializer
+        self.keys = keys
+        self.extractors = extractors
+
+    @classmethod
+    def compile(cls, serializer):
+        """Return a plan, or None when some field has no fast equivalent."""
+        meta = getattr(serializer, 'Meta', None)
+        model = getattr(meta, 'model', None)
+        if model is None:
+            return None
+        extra = getattr(meta, 'field_columns', {})
+        request = serializer.context.get('request')
+        keys, extractors = {'pk'}, []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            fast = getattr(serializer, f'fast_{name}', None)
+            if fast is not None:
+                keys.update(extra.get(name, ()))
+                extractors.append((name, fast))
+                continue
+            model_field = _model_field(model, field.source)
+            if model_field is None:
+                return None
+            key = field.source.replace('.', '__')
+            keys.add(key)
+            if isinstance(field, serializers.FileField):
+                storage = model_field.storage
+                extractors.append((name, lambda row, key=key: file_url(storage, row[key], request)))
+            elif isinstance(field, serializers.DateTimeField):
+                extractors.append((name, _nullable(_datetime_converter(field), key)))
+            elif isinstance(field, _FORMATTED):
+                extractors.append((name, _nullable(field.to_representation, key)))
+            elif isinstance(field, _PASSTHROUGH):
+                extractors.append((name, itemgetter(key)))
+            else:
+                return None
+        return cls(serializer, keys, extractors)
+
+    def values(self, queryset):
+        annotations = set(getattr(self.serializer.Meta, 'fast_annotations', ())) & set(queryset.query.annotations)
+        keys = self.keys | annotations | ordering_columns(queryset)
+        return queryset.prefetch_related(None).values(*keys)
+
+    def render(self, rows):
+        with span('serialize'):
+            rows = list(rows)
+            prepare = getattr(self.serializer, 'prepare_fast_rows', None)
+            if prepare is not None:
+                prepare(rows)
+            return self.build(rows)
+
+    async def arender(self, rows):
+        """render() for async views: ``aprepare_fast_rows`` when the serializer has it."""
+        with span('serialize'):
+            prepare = getattr(self.serializer, 'aprepare_fast_rows', None)
+            if prepare is not None:
+                await prepare(rows)
+            elif hasattr(self.serializer, 'prepare_fast_rows'):
+                await sync_to_async(self.serializer.prepare_fast_rows)(rows)
+            return self.build(rows)
+
+    def build(self, rows):
+        extractors = self.extractors
+        return [{name: extract(row) for name, extract in extractors} for row in rows]
+
+
+class FastListMixin:
+    """
+    List views: serve rows through a compiled FastPlan when the serializer
+    allows it. Combine with ORJSONRenderer (the default renderer) for the
+    rendering half.
+    """
+
+    def get_fast_plan(self):
+        if not getattr(settings, 'FAST_SERIALIZATION', True):
+            return None
+        return FastPlan.compile(self.get_serializer())
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_fast_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        queryset = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(queryset))
+
+    async def alist(self, request, *args, **kwargs):
+        """list() for async views (nura_stays.asyncviews)."""
+        plan = self.get_fast_plan()
+        if plan is None:
+            return await super().alist(request, *args, **kwargs)
+        queryset = plan.values(await self.afilter_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is None:
+            return Response(await plan.arender([row async for row in queryset]))
+        return self.get_paginated_response(await plan.arender(page))
@@ -0,0 +1,132 @@
+"""
+Sparse fieldsets: ?fields= and ?exclude= on read endpoints.
+
+``?fields=id,name,images.image_url`` keeps only the named fields; naming a
+nested field with a dot keeps that field and trims the nested serializer.
+``?exclude=amenities,images.srcset`` drops fields the same way. Serializers
+opt in with SparseFieldsetSerializerMixin and list, in ``Meta.field_columns``,
+the model columns read by fields that are not plain model fields. Views opt
+in with SparseFieldsetMixin, which rejects unknown names with a 400 and
+applies the matching ``.only()`` so unrequested columns are never loaded.
+Without either parameter nothing changes.
+"""
+from rest_framework.exceptions import ValidationError
+
+
+def parse_fieldset(value):
+    """'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}}; None when not given."""
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(','):
+        parts = [part.strip() for part in path.split('.')]
+        if not all(parts):
+            continue
+        node = tree
+        for part in parts:
+            node = node.setdefault(part, {})
+    return tree
+
+
+def ordering_columns(queryset):
+    """
+    Columns KeysetPagination reads from a page's rows: the ordering field,
+    or created_at when ordering on an annotation.
+    """
+    meta = queryset.model._meta
+    concrete = {field.name for field in meta.concrete_fields}
+    columns = set()
+    for term in queryset.query.order_by or meta.ordering:
+        name = term.lstrip('-') if isinstance(term, str) else None
+        if name in concrete:
+            columns.add(name)
+        elif 'created_at' in concrete:
+            columns.add('created_at')
+    return columns
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer side of sparse fieldsets. A fieldset passed in the context as
+    ``fieldset`` = (only, exclude) (trees from parse_fieldset) is applied when
+    the serializer is created; nested opted-in serializers are trimmed by
+    their parent.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fieldset = self._context.get('fieldset')
+        if fieldset:
+            self.apply_fieldset(*fieldset)
+
+    def apply_fieldset(self, only=None, exclude=None, prefix=''):
+        exclude = exclude or {}
+        unknown = (set(only or ()) | set(exclude)) - set(self.fields)
+        if unknown:
+            raise ValidationError({
+                'fields': [f'Unknown field: {prefix}{name}' for name in sorted(unknown)],
+            })
+        for name in list(self.fields):
+            if (only is not None and name not in only) or (name in exclude and not exclude[name]):
+                self.fields.pop(name)
+        for name, field in self.fields.items():
+            nested_only = (only or {}).get(name) or None
+            nested_exclude = exclude.get(name)
+            if not (nested_only or nested_exclude):
+                continue
+            target = getattr(field, 'child', field)
+            if not isinstance(target, SparseFieldsetSerializerMixin):
+                raise ValidationError({'fields': [f'{prefix}{name} has no nested fields']})
+            target.apply_fieldset(nested_only, nested_exclude, prefix=f'{prefix}{name}.')
+
+    def get_field_columns(self):
+        """Model columns needed to render the remaining fields."""
+        meta = self.Meta.model._meta
+        concrete = {field.name for field in meta.concrete_fields}
+        extra = getattr(self.Meta, 'field_columns', {})
+        columns = {meta.pk.name}
+        for name, field in self.fields.items():
+            if name in extra:
+                columns.update(extra[name])
+            elif field.source in concrete:
+                columns.add(field.source)
+        return columns
+
+
+class SparseFieldsetMixin:
+    """
+    View side of sparse fieldsets: parse ?fields= / ?exclude=, hand them to
+    the serializer and load only the columns it renders.
+    """
+
+    def get_fieldset(self):
+        if not hasattr(self, '_fieldset'):
+            params = self.request.query_params
+            self._fieldset = (parse_fieldset(params.get('fields')), parse_fieldset(params.get('exclude')) or {})
+        return self._fieldset
+
+    def has_fieldset(self):
+        only, exclude = self.get_fieldset()
+        return only is not None or bool(exclude)
+
+    def wants(self, name):
+        """Whether the top-level field ``name`` will be rendered."""
+        only, exclude = self.get_fieldset()
+        return (only is None or name in only) and not (name in exclude and not exclude[name])
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.has_fieldset():
+            context['fieldset'] = self.get_fieldset()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.has_fieldset():
+            return queryset
+        # Building the serializer validates the fieldset before any query runs.
+        columns = self.get_serializer().get_field_columns() | ordering_columns(queryset)
+        if not any('__' in column for column in columns):
+            # select_related only feeds fields that were not requested.
+            queryset = queryset.select_related(None)
+        return queryset.only(*columns)
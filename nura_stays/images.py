@@ -0,0 +1,156 @@
+"""
+Responsive image variants for uploaded photos.
+
+Each source image is decoded once, orientation-corrected, and re-encoded at
+the configured widths and formats with all metadata (EXIF, GPS) dropped.
+Variant names embed a hash of the source bytes, so they can be served with
+immutable caching. The resulting map is stored on the model's ``variants``
+JSONField:
+
+    {'source': 'properties/a.jpg', 'width': 4000, 'height': 3000,
+     'formats': {'webp': {'320': 'properties/variants/a-1f2e...-320.webp', ...}}}
+"""
+import hashlib
+import logging
+import os
+import re
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'avif': ('AVIF', 'avif', {'quality': 60}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Files seeded by nura_stays.synthetic are shared by many rows, so deleting
+# one row must leave them (and their variants, which keep the stem) in place.
+SHARED_PREFIX = 'synthetic-placeholder-'
+
+# Names written by build_variants(), allowing for storage's collision suffix.
+CONTENT_HASHED_RE = re.compile(r'(^|/)variants/[^/]+-[0-9a-f]{16}-\d+(_[A-Za-z0-9]{7})?\.[a-z]+$')
+
+
+def get_widths():
+    return sorted(getattr(settings, 'IMAGE_VARIANT_WIDTHS', [320, 640, 1024, 1600]))
+
+
+def get_formats():
+    return [fmt for fmt in getattr(settings, 'IMAGE_VARIANT_FORMATS', ['webp']) if fmt in FORMATS]
+
+
+def generate_variants(field_file):
+    """
+    Write every variant of ``field_file`` to its storage and return the
+    variants map. If the file cannot be read or decoded as an image, the map
+    is just {'source': name}, so the same file is not retried on every save.
+    """
+    try:
+        field_file.open('rb')
+    except OSError as e:
+        logger.warning("Could not read %s for variants: %s", field_file.name, e)
+        return {'source': field_file.name}
+    try:
+        return build_variants(field_file.name, field_file.storage, field_file) or {'source': field_file.name}
+    finally:
+        field_file.close()
+
+
+def build_variants(name, storage, source):
+    """
+    Variants for the stored file ``name``, read from the seekable binary file
+    ``source``. The file is hashed in chunks and decoded from disk, so the
+    encoded bytes are never held in memory as a whole.
+    """
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+
+    try:
+        source.seek(0)
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        digest = digest.hexdigest()[:16]
+        source.seek(0)
+        with Image.open(source) as opened:
+            image = ImageOps.exif_transpose(opened)
+            image.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        logger.warning("Could not generate variants for %s: %s", name, e)
+        return {}
+
+    if image.mode not in ('RGB', 'RGBA'):
+        has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    widths = sorted({min(width, image.width) for width in get_widths()})
+    formats = {}
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in get_formats():
+            pil_format, extension, options = FORMATS[fmt]
+            variant_name = f'{directory}/variants/{stem}-{digest}-{width}.{extension}'
+            if not storage.exists(variant_name):
+                encoded = resized.convert('RGB') if pil_format == 'JPEG' else resized
+                buffer = BytesIO()
+                # No exif=/icc_profile= arguments: metadata is stripped.
+                encoded.save(buffer, format=pil_format, **options)
+                variant_name = storage.save(variant_name, ContentFile(buffer.getvalue()))
+            formats.setdefault(fmt, {})[str(width)] = variant_name
+
+    return {
+        'source': name,
+        'width': image.width,
+        'height': image.height,
+        'formats': formats,
+    }
+
+
+def is_shared(name):
+    return os.path.basename(name or '').startswith(SHARED_PREFIX)
+
+
+def variant_names(variants):
+    return {name for names in (variants or {}).get('formats', {}).values() for name in names.values()}
+
+
+def delete_variants(variants, storage, keep=None):
+    """Delete the files of ``variants``, except any also used by ``keep``."""
+    for name in variant_names(variants) - variant_names(keep):
+        if not is_shared(name):
+            storage.delete(name)
+
+
+def delete_source(field_file):
+    """Delete an image's file from storage, unless it is a shared placeholder."""
+    if field_file and not is_shared(field_file.name):
+        field_file.delete(save=False)
+
+
+def is_content_hashed(name):
+    """True for variant files, whose names change whenever their bytes do."""
+    return bool(CONTENT_HASHED_RE.search(name))
+
+
+def needs_variants(field_file, variants):
+    return bool(field_file) and (variants or {}).get('source') != field_file.name
+
+
+def variant_urls(variants, storage, request=None):
+    """Return {format: {width: url}} for serializers, or None without variants."""
+    formats = (variants or {}).get('formats')
+    if not formats:
+        return None
+    build = request.build_absolute_uri if request else (lambda url: url)
+    return {
+        fmt: {width: build(storage.url(name)) for width, name in names.items()}
+        for fmt, names in formats.items()
+    }
@@ -0,0 +1,129 @@
+"""
+HTTP load generator for comparing server setups (see the loadtest command).
+
+``run(base_url, paths, concurrency, duration)`` keeps ``concurrency``
+keep-alive HTTP/1.1 connections busy for ``duration`` seconds, each sending
+requests round-robin over ``paths``, and reports throughput, status counts
+and latency percentiles. A path is a GET path or a (method, path, body)
+tuple. With ``vary_ip`` every request carries its own X-Forwarded-For, so
+per-client throttles see many clients. It needs only asyncio, so it can
+drive any server.
+"""
+import asyncio
+import itertools
+import random
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list (0 when empty)."""
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, statuses, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'requests_per_second': round(len(latencies) / elapsed, 1) if elapsed else 0,
+        'latency_ms': {
+            name: round(percentile(latencies, fraction) * 1000, 2)
+            for name, fraction in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99), ('max', 1.0))
+        },
+    }
+
+
+async def _read_response(reader):
+    """Read one response; return (status, keep_alive)."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    else:
+        await reader.read()
+        return status, False
+    return status, headers.get('connection', '').lower() != 'close'
+
+
+# Shared by every run in the process, so no two runs reuse an address (and
+# its throttle history); the random start keeps separate processes apart
+# when the server's throttle cache outlives them.
+_client_numbers = itertools.count(random.randrange(1 << 24))
+
+
+def client_ip():
+    """A private address no earlier simulated client in this process used."""
+    number = next(_client_numbers)
+    return f'10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}'
+
+
+def _encode(url, path, headers):
+    method, path, body = ('GET', path, b'') if isinstance(path, str) else path
+    prefix = url.path.rstrip('/')
+    head = f'{method} {prefix}{path} HTTP/1.1\r\nHost: {url.netloc}\r\n'
+    if body:
+        head += f'Content-Length: {len(body)}\r\n'
+    head += ''.join(f'{name}: {value}\r\n' for name, value in headers.items())
+    return head.encode(), body
+
+
+async def _client(host, port, requests, deadline, vary_ip, latencies, statuses, errors):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        head, body = next(requests)
+        if vary_ip:
+            head += f'X-Forwarded-For: {client_ip()}\r\n'.encode()
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(head + b'\r\n' + body)
+            await writer.drain()
+            status, keep_alive = await _read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            errors[0] += 1
+            keep_alive = False
+            status = None
+        if status is not None:
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _run(base_url, paths, concurrency, duration, headers, vary_ip):
+    url = urlsplit(base_url)
+    requests = itertools.cycle([_encode(url, path, headers) for path in paths])
+    latencies, statuses, errors = [], {}, [0]
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _client(url.hostname, url.port or 80, requests, deadline, vary_ip, latencies, statuses, errors)
+        for _ in range(concurrency)
+    ))
+    return summarize(latencies, statuses, errors[0], time.perf_counter() - started)
+
+
+def run(base_url, paths, concurrency=10, duration=10, headers=None, vary_ip=False):
+    """Drive ``base_url`` + each of ``paths``; return a summary dict."""
+    return asyncio.run(_run(base_url, paths, concurrency, duration, headers or {}, vary_ip))
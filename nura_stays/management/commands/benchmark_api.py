@@ -0,0 +1,260 @@
+"""
+Management command to benchmark the API endpoints.
+"""
+import itertools
+import json
+import subprocess
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import DailyStats
+from contact.models import ContactSubmission, OutboundEmail
+from nura_stays import loadtest, synthetic
+from nura_stays.cache import bump_version
+from properties.models import Property
+from reviews.models import Review, ReviewStats
+from team.models import TeamMember
+
+# Seeded rows carry these markers (properties are tracked by id) so a
+# server-mode run can remove them again, including leads it submitted.
+EMAIL_DOMAIN = 'benchmark.invalid'
+TEAM_PREFIX = 'Benchmark Member '
+USERNAME = 'benchmark-api'
+CACHED_MODELS = (Property, Review, TeamMember, ContactSubmission)
+
+
+class Rollback(Exception):
+    pass
+
+
+def endpoint_specs(property_ids, slug):
+    """(name, method, path, body, needs_admin) for every benchmarked route."""
+    contact = json.dumps({
+        'name': 'Benchmark Client', 'email': f'client@{EMAIL_DOMAIN}',
+        'subject': 'Availability', 'message': 'Is the property free next month?',
+    }).encode()
+    return [
+        ('property_list', 'GET', '/api/properties/', b'', False),
+        ('property_list_filtered', 'GET', '/api/properties/?property_type=villa&ordering=price_per_night', b'', False),
+        ('property_detail', 'GET', f'/api/properties/{slug}/', b'', False),
+        ('featured', 'GET', '/api/properties/featured/', b'', False),
+        ('reviews', 'GET', '/api/reviews/', b'', False),
+        ('property_reviews', 'GET', f'/api/reviews/property/{property_ids[0]}/', b'', False),
+        ('review_stats', 'GET', '/api/reviews/stats/', b'', False),
+        ('team', 'GET', '/api/team/', b'', False),
+        ('contact_submit', 'POST', '/api/contact/', contact, False),
+        ('admin_properties', 'GET', '/api/admin/properties/', b'', True),
+        ('admin_reviews', 'GET', '/api/admin/reviews/', b'', True),
+        ('admin_leads', 'GET', '/api/admin/leads/', b'', True),
+        ('dashboard_stats', 'GET', '/api/admin/dashboard/stats/', b'', True),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a deterministic dataset (see seed_data), then drive the real API routes (public '
+        'reads, contact submit, admin lists) either in-process with the test '
+        'client or against a running server with concurrent clients, and print '
+        'throughput, p50/p95/p99 latency and SQL queries per endpoint as JSON. '
+        'In-process runs are rolled back; server runs delete what they seeded.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--properties', type=int, default=200, help='Properties to seed (default 200)')
+        parser.add_argument('--reviews-per-property', type=int, default=10, help='Reviews per property (default 10)')
+        parser.add_argument('--images-per-property', type=int, default=1, help='Images per property (default 1)')
+        parser.add_argument('--team-members', type=int, default=8, help='Team members to seed (default 8)')
+        parser.add_argument('--leads', type=int, default=500, help='Contact submissions to seed (default 500)')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help='Only run this endpoint; repeatable (default: all)')
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Sequential requests per endpoint in-process (default 200)')
+        parser.add_argument('--no-response-cache', action='store_true',
+                            help='Measure in-process with RESPONSE_CACHE_ENABLED off')
+        parser.add_argument('--url', help='Benchmark this running server instead of in-process; it must use '
+                                          'the same database, which the seeded rows are committed to')
+        parser.add_argument('--concurrency', type=int, default=10, help='Concurrent connections with --url (default 10)')
+        parser.add_argument('--duration', type=float, default=5, help='Seconds per endpoint with --url (default 5)')
+        parser.add_argument('--keep', action='store_true', help='With --url, keep the seeded rows afterwards')
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+        parser.add_argument('--baseline', help='Earlier JSON report to compare latency and queries against')
+
+    def handle(self, *args, **options):
+        if options['properties'] < 1:
+            raise CommandError('--properties must be at least 1.')
+        # The test client sends Host: testserver.
+        hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+        if options['url']:
+            with transaction.atomic():
+                context = self.seed(options)
+            try:
+                with override_settings(ALLOWED_HOSTS=hosts):
+                    results = self.run(context, options)
+            finally:
+                if not options['keep']:
+                    self.cleanup(context)
+        else:
+            try:
+                with transaction.atomic():
+                    context = self.seed(options)
+                    overrides = {'RESPONSE_CACHE_ENABLED': False} if options['no_response_cache'] else {}
+                    with override_settings(ALLOWED_HOSTS=hosts, **overrides):
+                        results = self.run(context, options)
+                    raise Rollback
+            except Rollback:
+                # Bumps are deferred to a commit that never came; drop the
+                # responses cached from the rolled-back rows.
+                for model in CACHED_MODELS:
+                    bump_version(model)
+        if options['baseline']:
+            self.compare(results, options['baseline'])
+        report = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as out:
+                out.write(report + '\n')
+        self.stdout.write(report)
+
+    def seed(self, options):
+        summary = synthetic.generate(
+            properties=options['properties'],
+            reviews_per_property=options['reviews_per_property'],
+            images_per_property=options['images_per_property'],
+            leads=options['leads'],
+            seed=options['seed'],
+            email_domain=EMAIL_DOMAIN,
+        )
+        TeamMember.objects.bulk_create([
+            TeamMember(name=f'{TEAM_PREFIX}{i}', role=role, bio=f'{role} at Nura Stays.', order_index=i)
+            for i, role in zip(range(options['team_members']), itertools.cycle(['Host', 'Manager', 'Cleaner']))
+        ])
+        bump_version(TeamMember)
+        user, _ = User.objects.get_or_create(
+            username=USERNAME, defaults={'email': f'admin@{EMAIL_DOMAIN}', 'is_staff': True},
+        )
+        ids = summary['property_ids']
+        return {
+            'dataset': {
+                **{key: summary[key] for key in ('seed', 'properties', 'images', 'reviews', 'leads')},
+                'team_members': options['team_members'],
+            },
+            'property_ids': ids,
+            'token': str(AccessToken.for_user(user)),
+            'specs': endpoint_specs(ids, Property.objects.get(pk=ids[0]).slug),
+        }
+
+    def cleanup(self, context):
+        with transaction.atomic():
+            leads = ContactSubmission.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}')
+            OutboundEmail.objects.filter(submission__in=leads).delete()
+            leads.delete()
+            ids = context['property_ids']
+            for start in range(0, len(ids), 500):
+                Property.objects.filter(pk__in=ids[start:start + 500]).delete()
+            TeamMember.objects.filter(name__startswith=TEAM_PREFIX).delete()
+            User.objects.filter(username=USERNAME).delete()
+            ReviewStats.rebuild()
+            DailyStats.backfill()
+            for model in CACHED_MODELS:
+                bump_version(model)
+
+    def run(self, context, options):
+        specs = context['specs']
+        if options['endpoints']:
+            unknown = set(options['endpoints']) - {spec[0] for spec in specs}
+            if unknown:
+                raise CommandError(f'Unknown endpoint(s): {", ".join(sorted(unknown))}. '
+                                   f'Choose from: {", ".join(spec[0] for spec in specs)}.')
+            specs = [spec for spec in specs if spec[0] in options['endpoints']]
+        results = {
+            'mode': 'server' if options['url'] else 'in-process',
+            'commit': self.commit(),
+            'vendor': connection.vendor,
+            'settings': {name: getattr(settings, name, None) for name in (
+                'RESPONSE_CACHE_ENABLED', 'FAST_SERIALIZATION', 'ASYNC_VIEWS', 'COMPRESSION_MIN_SIZE',
+            )},
+            'dataset': context['dataset'],
+            'endpoints': {},
+        }
+        if options['url']:
+            results.update(url=options['url'], concurrency=options['concurrency'], duration=options['duration'])
+        else:
+            results['requests_per_endpoint'] = options['requests']
+        client = Client(raise_request_exception=False)
+        bearer = f'Bearer {context["token"]}'
+        for name, method, path, body, needs_admin in specs:
+            auth = bearer if needs_admin else None
+            # Before the timed run, so the first request still misses the response cache.
+            queries = self.count_queries(client, method, path, body, auth)
+            if options['url']:
+                summary = self.measure_server(method, path, body, auth, options)
+            else:
+                summary = self.measure_in_process(client, method, path, body, auth, options['requests'])
+            results['endpoints'][name] = {'method': method, 'path': path, **summary, 'queries': queries}
+        return results
+
+    def request(self, client, method, path, body, auth):
+        extra = {'REMOTE_ADDR': loadtest.client_ip()}
+        if auth:
+            extra['HTTP_AUTHORIZATION'] = auth
+        # A fresh address per request keeps the per-client throttles out of the numbers.
+        return client.generic(method, path, body, content_type='application/json', **extra)
+
+    def measure_in_process(self, client, method, path, body, auth, requests):
+        latencies, statuses = [], {}
+        started = time.perf_counter()
+        for _ in range(requests):
+            sent = time.perf_counter()
+            response = self.request(client, method, path, body, auth)
+            latencies.append(time.perf_counter() - sent)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        return loadtest.summarize(latencies, statuses, 0, time.perf_counter() - started)
+
+    def measure_server(self, method, path, body, auth, options):
+        headers = {'Content-Type': 'application/json'} if body else {}
+        if auth:
+            headers['Authorization'] = auth
+        summary = loadtest.run(options['url'], [(method, path, body)], options['concurrency'],
+                               options['duration'], headers, vary_ip=True)
+        if not summary['requests']:
+            raise CommandError(f'No responses from {options["url"]}{path} ({summary["errors"]} connection errors).')
+        return summary
+
+    def count_queries(self, client, method, path, body, auth):
+        """SQL queries of a first (cold) and a repeated (warm) request, measured in-process."""
+        counts = {}
+        for label in ('cold', 'warm'):
+            with CaptureQueriesContext(connection) as queries:
+                self.request(client, method, path, body, auth)
+            counts[label] = len(queries)
+        return counts
+
+    def commit(self):
+        try:
+            return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                  cwd=settings.BASE_DIR, check=True).stdout.strip() or None
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def compare(self, results, path):
+        with open(path) as source:
+            baseline = json.load(source)
+        for name, result in results['endpoints'].items():
+            before = baseline.get('endpoints', {}).get(name)
+            if not before:
+                continue
+            result['change'] = {
+                'p50_ratio': round(result['latency_ms']['p50'] / before['latency_ms']['p50'], 2)
+                if before['latency_ms']['p50'] else None,
+                'p99_ratio': round(result['latency_ms']['p99'] / before['latency_ms']['p99'], 2)
+                if before['latency_ms']['p99'] else None,
+                'queries_warm': result['queries']['warm'] - before['queries']['warm'],
+            }
+        results['baseline'] = {'commit': baseline.get('commit'), 'file': path}
@@ -0,0 +1,38 @@
+"""
+Management command to load-test a running server.
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+from nura_stays import loadtest
+
+DEFAULT_PATHS = [
+    '/api/properties/', '/api/properties/featured/', '/api/reviews/', '/api/team/',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Send concurrent keep-alive GETs to a running server (e.g. gunicorn with '
+        'wsgi.py vs asgi.py) and print throughput and latency percentiles as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server base URL')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help=f'Path to request; repeatable (default: {", ".join(DEFAULT_PATHS)})')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[10],
+                            help='Concurrent connections; several values run one after another')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds per run (default 10)')
+        parser.add_argument('--header', action='append', default=[], help='Extra "Name: value" header')
+
+    def handle(self, *args, **options):
+        headers = dict(header.split(':', 1) for header in options['header'])
+        headers = {name.strip(): value.strip() for name, value in headers.items()}
+        paths = options['paths'] or DEFAULT_PATHS
+        results = []
+        for concurrency in options['concurrency']:
+            summary = loadtest.run(options['url'], paths, concurrency, options['duration'], headers)
+            results.append({'concurrency': concurrency, **summary})
+        self.stdout.write(json.dumps({'url': options['url'], 'paths': paths, 'runs': results}, indent=2))
@@ -0,0 +1,179 @@
+"""
+Media file serving for uploads.
+
+``serve_media`` replaces ``django.views.static.serve``. Conditional requests
+(If-None-Match / If-Modified-Since) are answered from a stat() without
+opening the file. The body is then handed off in one of two ways, set by
+MEDIA_SERVE_BACKEND:
+
+* ``nginx`` / ``sendfile``: an empty response carrying X-Accel-Redirect
+  (under MEDIA_ACCEL_PREFIX) or X-Sendfile, so the proxy streams the file and
+  handles Range itself while the worker is released immediately.
+* ``django`` (default): a FileResponse, which gunicorn sends with
+  os.sendfile() through wsgi.file_wrapper. Under ASGI there is no sendfile;
+  the file is read and sent in batches (nura_stays.streaming). Single
+  ``Range`` requests are answered with 206 by seeking the file and
+  bounding Content-Length.
+
+Content-hashed variant names (see images.is_content_hashed) are sent with
+``Cache-Control: immutable``; everything else is revalidated after
+MEDIA_CACHE_MAX_AGE seconds.
+"""
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .images import is_content_hashed
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """
+    A file positioned at ``start`` that reads at most ``length`` bytes.
+
+    Exposes fileno() so gunicorn can still use sendfile(); it starts at the
+    current offset and stops at Content-Length.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) inclusive for a single satisfiable byte range, None to
+    ignore the header (malformed or multiple ranges), or False when it cannot
+    be satisfied.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return False
+    return start, end
+
+
+def get_etag(st):
+    return f'"{int(st.st_mtime):x}-{st.st_size:x}"'
+
+
+def get_cache_headers(path):
+    if is_content_hashed(path):
+        return {'public': True, 'max_age': IMMUTABLE_MAX_AGE, 'immutable': True}
+    return {'public': True, 'max_age': getattr(settings, 'MEDIA_CACHE_MAX_AGE', 3600)}
+
+
+def _range_is_current(request, etag, last_modified):
+    """If-Range: only honour Range when the client's copy is still current."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+@require_safe
+def serve_media(request, path):
+    fullpath = safe_join(settings.MEDIA_ROOT, path)
+    try:
+        st = os.stat(fullpath)
+    except (OSError, ValueError):
+        raise Http404('File not found')
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404('File not found')
+
+    etag, last_modified = get_etag(st), int(st.st_mtime)
+    cache_headers = get_cache_headers(path)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _file_response(request, path, fullpath, st, etag, last_modified)
+    if response.status_code in (200, 206, 304):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, **cache_headers)
+    return response
+
+
+def _file_response(request, path, fullpath, st, etag, last_modified):
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    content_type = content_type or 'application/octet-stream'
+    backend = getattr(settings, 'MEDIA_SERVE_BACKEND', 'django')
+
+    if backend == 'nginx':
+        response = HttpResponse(content_type=content_type)
+        prefix = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/')
+        # Percent-encoded, as nginx decodes the URI; a raw space, '?', '#' or
+        # non-ASCII name would be misparsed (or MIME-encoded by Django).
+        response['X-Accel-Redirect'] = quote(prefix.rstrip('/') + '/' + path.lstrip('/'))
+        return response
+    if backend == 'sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = fullpath
+        return response
+
+    size = st.st_size
+    byte_range = None
+    if 'HTTP_RANGE' in request.META and _range_is_current(request, etag, last_modified):
+        byte_range = parse_range(request.META['HTTP_RANGE'], size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+        response['Content-Length'] = size
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    file = open(fullpath, 'rb')
+    if byte_range:
+        start, end = byte_range
+        response = FileResponse(FileRange(file, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    else:
+        response = FileResponse(file, content_type=content_type)
+        response['Content-Length'] = size
+    response['Accept-Ranges'] = 'bytes'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,155 @@
+"""
+Prometheus metrics, served in the text format at /api/metrics.
+
+MetricsMiddleware counts every request by method, URL route (the pattern,
+not the path, so labels stay bounded) and status, and observes its latency,
+response size and SQL query count (from the request's RequestTimer, see
+timing.py), plus response cache hits and misses by route. Throttles in
+nura_stays.throttling count rejections, and the outbox counts email
+outcomes; the scrape also reports how many OutboundEmail rows are in each
+status, read from the database, so the backlog is visible even when the
+worker runs elsewhere.
+
+With PROMETHEUS_MULTIPROC_DIR set (before the process starts), every
+process writes its samples to files in that directory and a scrape of any
+gunicorn worker sums them, including a ``run_outbox`` worker on the same
+host. Empty the directory when the server starts, as start.sh does;
+no gauges are kept per process, so exited workers need no cleanup. Without
+it each process reports only itself, which is enough for development.
+
+Scrapes must send ``Authorization: Bearer <METRICS_TOKEN>`` or come from an
+address in METRICS_ALLOWED_IPS (REMOTE_ADDR, never X-Forwarded-For); with
+neither configured the endpoint is only open when DEBUG is on. A Prometheus
+job for it:
+
+    - job_name: nura-stays
+      metrics_path: /api/metrics
+      scheme: https
+      authorization:
+        credentials_file: /etc/prometheus/nura-stays-token
+      static_configs:
+        - targets: ['api.example.com']
+"""
+import hmac
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.models import Count
+from django.http import HttpResponse
+from django.views.decorators.cache import never_cache
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from .timing import current_timer
+
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+REQUESTS = Counter('http_requests', 'HTTP requests handled.', ['method', 'route', 'status'])
+LATENCY = Histogram('http_request_duration_seconds', 'Time to produce the response.', ['method', 'route'])
+RESPONSE_SIZE = Histogram('http_response_size_bytes', 'Response body size as sent (after compression).',
+                          ['method', 'route'], buckets=SIZE_BUCKETS)
+QUERIES = Histogram('http_request_db_queries', 'SQL queries run per request.', ['method', 'route'],
+                    buckets=QUERY_BUCKETS)
+RESPONSE_CACHE = Counter('response_cache_requests', 'Response cache lookups.', ['route', 'result'])
+THROTTLED = Counter('throttle_rejections', 'Requests rejected by a throttle.', ['throttle', 'route'])
+EMAILS = Counter('contact_emails', 'Contact emails by outcome: queued, sent, retry or dead.', ['outcome'])
+
+
+def route(request):
+    """The URL pattern the request resolved to, e.g. ``api/properties/<slug:slug>/``."""
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match is not None else '<unmatched>'
+
+
+class OutboxCollector:
+    """OutboundEmail rows per status, counted when scraped."""
+
+    def collect(self):
+        from contact.models import OutboundEmail
+
+        family = GaugeMetricFamily('contact_outbox_emails', 'Outbound emails by status.', labels=['status'])
+        counts = dict(OutboundEmail.objects.values_list('status').annotate(n=Count('pk')).order_by())
+        for status, _ in OutboundEmail.STATUS_CHOICES:
+            family.add_metric([status], counts.get(status, 0))
+        yield family
+
+
+_outbox = CollectorRegistry()
+_outbox.register(OutboxCollector())
+
+
+def exposition():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry) + generate_latest(_outbox)
+
+
+def scrape_allowed(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    allowed_ips = getattr(settings, 'METRICS_ALLOWED_IPS', [])
+    if request.META.get('REMOTE_ADDR') in allowed_ips:
+        return True
+    return settings.DEBUG and not token and not allowed_ips
+
+
+@never_cache
+def metrics_view(request):
+    if not scrape_allowed(request):
+        return HttpResponse('Forbidden\n', status=403, content_type='text/plain')
+    return HttpResponse(exposition(), content_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """
+    Record request metrics (see the module docstring); list it right after
+    ServerTimingMiddleware so the request's query count is available.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started)
+        return response
+
+    def observe(self, request, response, seconds):
+        method = request.method if request.method in METHODS else 'OTHER'
+        name = route(request)
+        REQUESTS.labels(method, name, str(response.status_code)).inc()
+        LATENCY.labels(method, name).observe(seconds)
+        if response.streaming:
+            size = response.get('Content-Length')
+        else:
+            size = len(response.content)
+        if size is not None:
+            RESPONSE_SIZE.labels(method, name).observe(int(size))
+        timer = current_timer()
+        if timer is not None:
+            QUERIES.labels(method, name).observe(timer.queries)
+        if response.has_header('X-Cache'):
+            RESPONSE_CACHE.labels(name, response['X-Cache'].lower()).inc()
@@ -0,0 +1,181 @@
+"""
+Pagination classes shared by the list endpoints.
+"""
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keep full microsecond precision; DjangoJSONEncoder truncates to ms."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    Requests carrying ``?pagination=cursor`` or a ``cursor`` are paginated by
+    seeking on ``(<ordering field>, id)`` instead of COUNT(*) + OFFSET, so every
+    page costs the same as the first and no total count is computed. The
+    ordering field is the first one applied by OrderingFilter (or the model's
+    default ordering); orderings on non-model fields seek on ``created_at``.
+    Responses in this mode contain ``next``, ``previous`` and ``results``.
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    fallback_ordering = '-created_at'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_keyset(request):
+            return super().paginate_queryset(queryset, request, view)
+        queryset, reverse = self.seek(queryset, request)
+        return self.finish_page(list(queryset[:self.page_size + 1]), reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset with the page fetched through the async ORM."""
+        if self.is_keyset(request):
+            queryset, reverse = self.seek(queryset, request)
+            return self.finish_page([row async for row in queryset[:self.page_size + 1]], reverse)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached_property: fill it without a sync query.
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        self.page.object_list = [row async for row in self.page.object_list]
+        return list(self.page)
+
+    def is_keyset(self, request):
+        self.keyset = (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+        return self.keyset
+
+    def seek(self, queryset, request):
+        """Order and filter ``queryset`` past the cursor; returns (queryset, reverse)."""
+        self.request = request
+        self.model = queryset.model
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_keyset_ordering(queryset)
+        self.cursor = cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['r'])
+
+        keys = ['pk'] if self.field == 'pk' else [self.field, 'pk']
+        queryset = queryset.order_by(*[f'-{key}' if self.descending else key for key in keys])
+        if cursor:
+            # Walking forward through a descending list means "less than".
+            lookup = 'lt' if self.descending != reverse else 'gt'
+            if self.field == 'pk':
+                queryset = queryset.filter(**{f'pk__{lookup}': cursor['pk']})
+            else:
+                queryset = queryset.filter(
+                    Q(**{f'{self.field}__{lookup}': cursor['v']})
+                    | Q(**{self.field: cursor['v'], f'pk__{lookup}': cursor['pk']})
+                )
+            if reverse:
+                queryset = queryset.reverse()
+        return queryset, reverse
+
+    def finish_page(self, rows, reverse):
+        """Trim the page_size + 1 fetched rows and note the neighbouring pages."""
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = bool(self.cursor) if not reverse else has_more
+        self.first, self.last = (rows[0], rows[-1]) if rows else (None, None)
+        return rows
+
+    def get_keyset_ordering(self, queryset):
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        first = ordering[0] if ordering and isinstance(ordering[0], str) else self.fallback_ordering
+        name = first.lstrip('-')
+        if name in ('pk', 'id'):
+            return 'pk', first.startswith('-')
+        try:
+            field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            field = None
+        if field is None or not field.concrete or field.is_relation:
+            first = self.fallback_ordering
+            name = first.lstrip('-')
+        return name, first.startswith('-')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            if self.field != 'pk':
+                cursor['v'] = self.model._meta.get_field(self.field).to_python(cursor['v'])
+            return {'v': cursor.get('v'), 'pk': int(cursor['pk']), 'r': bool(cursor.get('r'))}
+        except (TypeError, ValueError, KeyError, ValidationError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def row_value(row, name):
+        # Rows are model instances, or dicts on the .values() fast path.
+        return row[name] if isinstance(row, dict) else getattr(row, name)
+
+    def encode_cursor(self, row, reverse):
+        payload = {'pk': self.row_value(row, 'pk'), 'r': 1 if reverse else 0}
+        if self.field != 'pk':
+            payload['v'] = self.row_value(row, self.field)
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, cls=CursorEncoder).encode()
+        ).decode('ascii')
+        url = self.request.build_absolute_uri()
+        for param in (self.mode_query_param, self.page_query_param):
+            url = remove_query_param(url, param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or self.last is None:
+            return None
+        return self.encode_cursor(self.last, reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or self.first is None:
+            return None
+        return self.encode_cursor(self.first, reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
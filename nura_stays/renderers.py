@@ -0,0 +1,27 @@
+"""
+JSON renderer backed by orjson.
+
+Produces the same bytes as DRF's compact JSONRenderer (UTF-8, no spaces,
+U+2028/U+2029 escaped, datetimes and decimals through DRF's encoder) in a
+fraction of the time. Indented output, and anything orjson rejects, falls
+back to the stock renderer.
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
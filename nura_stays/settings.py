@@ -29,6 +29,7 @@ INSTALLED_APPS = [
     'corsheaders',
     'django_filters',
     # Local apps
+    'nura_stays',  # project-wide management commands (benchmark_api, loadtest)
     'properties',
     'reviews',
     'team',
@@ -37,7 +38,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'nura_stays.timing.ServerTimingMiddleware',
+    'nura_stays.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'nura_stays.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -81,7 +85,28 @@ else:
     db_host = os.getenv('DATABASE_HOST', 'localhost')
     # Cloud SQL Unix socket (e.g. /cloudsql/PROJECT:REGION:INSTANCE)
     if db_host.startswith('/cloudsql/'):
-        db_options['OPTIONS'] = {'connect_timeout': 10}
+        db_options['connect_timeout'] = 10
+    # Connection reuse, so requests stop paying connect + auth. With
+    # DATABASE_POOL (PostgreSQL only) each worker process keeps a psycopg pool
+    # of DATABASE_POOL_MIN_SIZE..DATABASE_POOL_MAX_SIZE connections that
+    # requests borrow and return. Size it so workers x max size stays under
+    # the server's max_connections. Without a pool, each thread keeps a
+    # persistent connection for DATABASE_CONN_MAX_AGE seconds (not suitable
+    # under ASGI). Either way, DATABASE_CONN_HEALTH_CHECKS checks a reused
+    # connection before handing it out.
+    db_pool = (
+        'postgresql' in db_engine
+        and os.getenv('DATABASE_POOL', 'True').lower() == 'true'
+    )
+    if db_pool:
+        db_options['pool'] = {
+            'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', '10')),
+            # Seconds a request waits for a free connection before failing.
+            'timeout': float(os.getenv('DATABASE_POOL_TIMEOUT', '10')),
+            'max_idle': float(os.getenv('DATABASE_POOL_MAX_IDLE', '300')),
+            'max_lifetime': float(os.getenv('DATABASE_POOL_MAX_LIFETIME', '1800')),
+        }
     DATABASES = {
         'default': {
             'ENGINE': db_engine,
@@ -90,7 +115,10 @@ else:
             'PASSWORD': os.getenv('DATABASE_PASSWORD', ''),
             'HOST': db_host,
             'PORT': os.getenv('DATABASE_PORT', '') or ('5432' if 'postgresql' in os.getenv('DATABASE_ENGINE', '') else '3306'),
-            **db_options,
+            # Pooled connections must not also be persistent.
+            'CONN_MAX_AGE': 0 if db_pool else int(os.getenv('DATABASE_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': os.getenv('DATABASE_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
+            'OPTIONS': db_options,
         }
     }
 
@@ -106,6 +134,47 @@ TIME_ZONE = 'UTC'
 USE_I18N = True
 USE_TZ = True
 
+# Cache. Defaults to per-process memory; point CACHE_BACKEND at a shared
+# backend (Redis, or DatabaseCache/FileBasedCache without Redis) so response
+# cache invalidation reaches every worker and instance. The Dockerfile uses
+# DatabaseCache.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'nura-stays'),
+    }
+}
+# The locmem, file and database backends keep only 300 entries by default,
+# far fewer than the response cache stores (one per URL, query and media
+# type). Past CACHE_MAX_ENTRIES they drop 1/CACHE_CULL_FREQUENCY of them
+# (0 drops them all). Redis and memcached hand OPTIONS to their client and
+# evict on their own memory limits instead.
+if CACHES['default']['BACKEND'].rsplit('.', 1)[-1] in ('LocMemCache', 'FileBasedCache', 'DatabaseCache'):
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '20000')),
+        'CULL_FREQUENCY': int(os.getenv('CACHE_CULL_FREQUENCY', '4')),
+    }
+
+# Versioned response cache for public read endpoints (see nura_stays/cache.py).
+# Off by default on a per-process backend, where other workers would keep
+# serving pages another worker has invalidated.
+RESPONSE_CACHE_ENABLED = os.getenv(
+    'RESPONSE_CACHE_ENABLED', str(not CACHES['default']['BACKEND'].endswith('.LocMemCache'))
+).lower() == 'true'
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '3600'))
+# Build hot list pages from .values() rows instead of model serializers (nura_stays.fastpath).
+FAST_SERIALIZATION = os.getenv('FAST_SERIALIZATION', 'True').lower() == 'true'
+# Route public read endpoints to their async views (nura_stays.asyncviews);
+# on by default under asgi.py, off under wsgi.py.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False').lower() == 'true'
+# brotli or gzip for bodies of at least this many bytes; cached responses
+# store theirs precompressed.
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+# Cache-Control for public GETs carrying ETag/Last-Modified: browsers always
+# revalidate, shared caches (CDN) may serve for HTTP_CACHE_S_MAXAGE seconds.
+HTTP_CACHE_MAX_AGE = int(os.getenv('HTTP_CACHE_MAX_AGE', '0'))
+HTTP_CACHE_S_MAXAGE = int(os.getenv('HTTP_CACHE_S_MAXAGE', '60'))
+
 # Static files
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
@@ -113,6 +182,14 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # Media files (uploads). Use MEDIA_ROOT=/tmp/media on Cloud Run for writable storage.
 MEDIA_URL = '/media/'
 MEDIA_ROOT = Path(os.getenv('MEDIA_ROOT', str(BASE_DIR / 'media')))
+# How /media/ bodies are sent (nura_stays/media.py): 'django' streams with
+# sendfile from the worker; 'nginx' (X-Accel-Redirect to MEDIA_ACCEL_PREFIX,
+# an internal location aliased to MEDIA_ROOT) and 'sendfile' (X-Sendfile,
+# Apache/lighttpd) hand the transfer to the proxy.
+MEDIA_SERVE_BACKEND = os.getenv('MEDIA_SERVE_BACKEND', 'django')
+MEDIA_ACCEL_PREFIX = os.getenv('MEDIA_ACCEL_PREFIX', '/protected-media/')
+# max-age for media that is not content-hashed (originals, team photos)
+MEDIA_CACHE_MAX_AGE = int(os.getenv('MEDIA_CACHE_MAX_AGE', '3600'))
 
 # Behind Cloud Run load balancer: use X-Forwarded-Proto so image URLs are https://
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
@@ -133,6 +210,11 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.AllowAny',
     ),
+    # Same bytes as DRF's JSONRenderer, rendered with orjson.
+    'DEFAULT_RENDERER_CLASSES': [
+        'nura_stays.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 12,
     'DEFAULT_FILTER_BACKENDS': [
@@ -141,7 +223,7 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
+        'nura_stays.throttling.AnonRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
@@ -171,7 +253,63 @@ EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True').lower() == 'true'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER or 'noreply@nurastays.com')
+# Contact emails are queued in the outbox and sent by `manage.py run_outbox`
+# (the Dockerfile runs one next to the web server). Without a worker, leave
+# OUTBOX_DELIVER_ON_COMMIT on: each submission then starts a background
+# delivery thread once committed.
+OUTBOX_DELIVER_ON_COMMIT = os.getenv('OUTBOX_DELIVER_ON_COMMIT', 'True').lower() == 'true'
+# Failed sends are retried after base * 2**(attempts - 1) seconds (capped)
+# and dead-lettered after OUTBOX_MAX_ATTEMPTS.
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '50'))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+OUTBOX_RETRY_BASE_SECONDS = int(os.getenv('OUTBOX_RETRY_BASE_SECONDS', '60'))
+OUTBOX_RETRY_MAX_SECONDS = int(os.getenv('OUTBOX_RETRY_MAX_SECONDS', str(6 * 60 * 60)))
+# A claimed batch is retried by another worker if not finished within this time.
+OUTBOX_LEASE_SECONDS = int(os.getenv('OUTBOX_LEASE_SECONDS', '300'))
+
+# Responsive image variants (nura_stays/images.py): widths in px and output
+# formats (webp, avif, jpeg) generated for property images and team photos.
+IMAGE_VARIANT_WIDTHS = [int(w) for w in os.getenv('IMAGE_VARIANT_WIDTHS', '320,640,1024,1600').split(',')]
+IMAGE_VARIANT_FORMATS = os.getenv('IMAGE_VARIANT_FORMATS', 'webp').split(',')
+
+# Request timing (nura_stays/timing.py): a Server-Timing header and one JSON
+# log line per request; slower queries and requests are logged as warnings.
+# The header goes to staff users and requests sending X-Server-Timing-Token,
+# or to everyone with SERVER_TIMING_HEADER.
+SERVER_TIMING_HEADER = os.getenv('SERVER_TIMING_HEADER', 'False').lower() == 'true'
+SERVER_TIMING_TOKEN = os.getenv('SERVER_TIMING_TOKEN', '')
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '100'))
+SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', '1000'))
+
+# Prometheus metrics at /api/metrics (nura_stays/metrics.py). Worker processes
+# are aggregated through PROMETHEUS_MULTIPROC_DIR, read from the environment.
+# Scrapes need the bearer token or an allowed address (open only under DEBUG
+# when neither is set).
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = [ip for ip in os.getenv('METRICS_ALLOWED_IPS', '').split(',') if ip]
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # INFO: every request; WARNING: slow ones only (the default with
+        # DEBUG, where runserver already logs each request).
+        'nura_stays.timing': {
+            'handlers': ['console'],
+            'level': os.getenv('REQUEST_LOG_LEVEL', 'WARNING' if DEBUG else 'INFO'),
+            'propagate': False,
+        },
+    },
+}
 
 # File upload limits
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+# Stream every uploaded file to a temporary file instead of buffering it in
+# memory; storage then moves it into MEDIA_ROOT without another copy.
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+# Threads used to decode and resize a batch of property image uploads
+IMAGE_UPLOAD_WORKERS = int(os.getenv('IMAGE_UPLOAD_WORKERS', '4'))
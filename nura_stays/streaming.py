@@ -0,0 +1,42 @@
+"""
+Incremental streaming of synchronous response iterators under ASGI.
+
+Django's ASGI handler consumes the sync iterator of a StreamingHttpResponse
+(FileResponse media, CSV/JSONL exports, compress_stream output) with
+``sync_to_async(list)``, holding the whole body in the worker before the
+first byte is sent. ASGIHandler here swaps such iterators for an async one
+that pulls up to STREAM_BATCH_SIZE bytes per thread hop, in the request's
+thread-sensitive thread, so database cursors behind exports stay on the
+connection they were opened on.
+"""
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler as BaseASGIHandler
+
+STREAM_BATCH_SIZE = 64 * 1024
+
+
+def _next_batch(iterator):
+    """Up to about STREAM_BATCH_SIZE bytes from ``iterator``; empty at the end."""
+    parts, size = [], 0
+    for part in iterator:
+        parts.append(part)
+        size += len(part)
+        if size >= STREAM_BATCH_SIZE:
+            break
+    return b''.join(parts)
+
+
+async def iterate_in_batches(content):
+    iterator = iter(content)
+    while True:
+        batch = await sync_to_async(_next_batch, thread_sensitive=True)(iterator)
+        if not batch:
+            return
+        yield batch
+
+
+class ASGIHandler(BaseASGIHandler):
+    async def send_response(self, response, send):
+        if response.streaming and not response.is_async:
+            response.streaming_content = iterate_in_batches(response.streaming_content)
+        return await super().send_response(response, send)
@@ -0,0 +1,319 @@
+"""
+Deterministic synthetic data at production scale (see seed_data).
+
+Rows are generated in fixed-size chunks, each with its own random.Random
+seeded from (seed, kind, chunk number), so one seed always yields the same
+data whether the chunks run in this process or are spread over worker
+processes. Rows go in with bulk_create a batch at a time; the rollups,
+search index and cache versions that signals keep current on single saves
+are rebuilt once at the end.
+
+Property images reference a small palette of generated placeholder JPEGs
+(with their responsive variants), shared by all rows instead of one file
+per image; their names carry images.SHARED_PREFIX, so deleting a row
+leaves the files for the others.
+"""
+import multiprocessing
+import random
+import time
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, connections, transaction
+from PIL import Image, ImageDraw
+
+from nura_stays.cache import bump_version
+from nura_stays.images import SHARED_PREFIX, build_variants
+
+CHUNK_SIZE = 500  # properties (with their reviews) or leads per chunk
+PLACEHOLDERS = 8
+
+# (city, neighbourhoods, latitude, longitude)
+CITIES = [
+    ('London', ['Shoreditch', 'Canary Wharf', 'South Bank', 'Camden', 'Notting Hill', 'Greenwich'], 51.5072, -0.1276),
+    ('Manchester', ['Didsbury', 'Ancoats', 'Northern Quarter', 'Salford Quays'], 53.4808, -2.2426),
+    ('Birmingham', ['City Centre', 'Jewellery Quarter', 'Edgbaston'], 52.4862, -1.8904),
+    ('Brighton', ['Kemptown', 'North Laine', 'Hove'], 50.8225, -0.1372),
+    ('Edinburgh', ['Old Town', 'Leith', 'Stockbridge'], 55.9533, -3.1883),
+    ('Bristol', ['Clifton', 'Harbourside', 'Stokes Croft'], 51.4545, -2.5879),
+    ('Zanzibar', ['Stone Town', 'Nungwi', 'Paje', 'Kendwa'], -6.1659, 39.2026),
+]
+ADJECTIVES = [
+    'Bright', 'Cosy', 'Elegant', 'Modern', 'Quiet', 'Spacious', 'Stylish', 'Sunny', 'Charming',
+    'Luxury', 'Airy', 'Restored', 'Contemporary', 'Peaceful',
+]
+FEATURES = [
+    'Waterfront', 'Garden', 'Loft', 'Skyline', 'Courtyard', 'Riverside', 'Terrace', 'Beachfront', 'Canal-side',
+]
+# property_type: (price range per night, bedroom range)
+TYPES = {
+    'apartment': ((70, 260), (1, 3)),
+    'studio': ((50, 140), (1, 1)),
+    'house': ((120, 420), (2, 5)),
+    'cottage': ((90, 240), (1, 3)),
+    'villa': ((220, 900), (3, 6)),
+    'penthouse': ((280, 950), (2, 4)),
+}
+AMENITIES = [
+    'WiFi', 'Smart TV', 'Kitchen', 'Washing Machine', 'Dryer', 'Parking', 'Gym Access', 'Air Conditioning',
+    'Pool', 'Garden', 'BBQ', 'Concierge', 'Coffee Machine', 'Workspace', 'Pet Friendly', 'Sea View',
+]
+FIRST_NAMES = [
+    'Amelia', 'Oliver', 'Aisha', 'James', 'Priya', 'Noah', 'Sofia', 'Daniel', 'Fatma', 'Lucas', 'Grace',
+    'Omar', 'Chloe', 'Ethan', 'Zara', 'Samuel', 'Hannah', 'Yusuf', 'Mia', 'Thomas', 'Leila', 'Jack',
+]
+LAST_NAMES = [
+    'Smith', 'Patel', 'Jones', 'Okafor', 'Brown', 'Khan', 'Taylor', 'Wilson', 'Hassan', 'Evans', 'Chen',
+    'Murphy', 'Ali', 'Roberts', 'Walker', 'Mwangi', 'Wright', 'Hughes', 'Said', 'Clarke',
+]
+REVIEW_SENTENCES = {
+    1: ['The place was not as described.', 'Check-in was a struggle and nobody answered the phone.',
+        'It was not clean when we arrived.', 'Would not stay again.'],
+    2: ['The location was fine but the flat needs work.', 'Several things in the kitchen were broken.',
+        'Noisy at night and the bed was uncomfortable.', 'Communication was slow.'],
+    3: ['A decent stay overall.', 'Good location, though the photos flatter it a little.',
+        'Clean enough and the host replied quickly.', 'Fine for a short trip.'],
+    4: ['Really comfortable and well equipped.', 'Great location close to restaurants and transport.',
+        'Check-in was easy and the host was helpful.', 'Only minor issues, we would book again.'],
+    5: ['Absolutely wonderful stay!', 'Spotlessly clean and beautifully decorated.',
+        'The host thought of everything.', 'Perfect location and stunning views.',
+        'Better than the photos, we are already planning our next visit.'],
+}
+RATING_WEIGHTS = [3, 5, 12, 35, 45]
+LEAD_SUBJECTS = ['Availability', 'Group booking', 'Long stay discount', 'Corporate stays', 'Property management']
+LEAD_MESSAGES = [
+    'Is the property available for the dates below?', 'We are a family of four travelling in the summer.',
+    'Do you offer discounts for stays longer than a month?', 'Could you send more photos of the bedrooms?',
+    'I own a flat nearby and would like to talk about management.', 'Is parking included in the price?',
+]
+PALETTE = [
+    (38, 70, 83), (42, 157, 143), (233, 196, 106), (244, 162, 97),
+    (231, 111, 81), (69, 123, 157), (168, 218, 220), (29, 53, 87),
+]
+
+
+def _rng(seed, kind, chunk):
+    return random.Random(f'{seed}:{kind}:{chunk}')
+
+
+def _chunks(total):
+    return [(number, start, min(start + CHUNK_SIZE, total)) for number, start in enumerate(range(0, total, CHUNK_SIZE))]
+
+
+def placeholder_images(count=PLACEHOLDERS):
+    """[(name, variants)] of generated placeholder photos, created on first use."""
+    images = []
+    for i in range(count):
+        name = f'properties/{SHARED_PREFIX}{i}.jpg'
+        color = PALETTE[i % len(PALETTE)]
+        image = Image.new('RGB', (1600, 1067), color)
+        draw = ImageDraw.Draw(image)
+        # A horizon and a window grid, so variants and blur-up previews look like photos.
+        draw.rectangle((0, 700, 1600, 1067), fill=tuple(max(0, c - 40) for c in color))
+        for x in range(200, 1400, 300):
+            draw.rectangle((x, 300, x + 180, 560), fill=tuple(min(255, c + 60) for c in color))
+        buffer = BytesIO()
+        image.save(buffer, format='JPEG', quality=80)
+        data = buffer.getvalue()
+        if not default_storage.exists(name):
+            name = default_storage.save(name, ContentFile(data))
+        images.append((name, build_variants(name, default_storage, buffer)))
+    return images
+
+
+def build_properties(seed, number, start, stop):
+    """Unsaved Property rows ``start`` to ``stop`` (without slugs)."""
+    from properties import geo
+    from properties.models import Property
+
+    rng = _rng(seed, 'properties', number)
+    rows = []
+    for _ in range(start, stop):
+        city, areas, latitude, longitude = rng.choice(CITIES)
+        area = rng.choice(areas)
+        property_type = rng.choice(list(TYPES))
+        (low, high), (min_beds, max_beds) = TYPES[property_type]
+        bedrooms = rng.randint(min_beds, max_beds)
+        latitude = round(latitude + rng.uniform(-0.08, 0.08), 6)
+        longitude = round(longitude + rng.uniform(-0.12, 0.12), 6)
+        name = f'{rng.choice(ADJECTIVES)} {rng.choice(FEATURES)} {property_type.title()} in {area}'
+        rows.append(Property(
+            name=name,
+            location=f'{city}, {area}',
+            short_description=f'{name}, sleeping {bedrooms * 2}, a short walk from the best of {area}.',
+            description=' '.join(rng.sample(REVIEW_SENTENCES[5] + REVIEW_SENTENCES[4], 4)
+                                 + [f'The {property_type} is in {area}, {city}.']),
+            price_per_night=Decimal(rng.randrange(low, high, 5)),
+            bedrooms=bedrooms,
+            bathrooms=max(1, bedrooms - rng.randint(0, 2)),
+            max_guests=bedrooms * 2 + rng.randint(0, 2),
+            property_type=property_type,
+            latitude=latitude,
+            longitude=longitude,
+            geohash=geo.encode(latitude, longitude),
+            amenities=rng.sample(AMENITIES, rng.randint(4, 9)),
+            house_rules='No smoking. No parties. Quiet hours 10pm-8am.',
+            cancellation_policy=rng.choice([
+                'Free cancellation up to 48 hours before check-in.',
+                'Free cancellation up to 7 days before check-in.',
+            ]),
+            is_featured=rng.random() < 0.05,
+        ))
+    return rows
+
+
+def build_images(seed, number, property_ids, per_property, placeholders):
+    from properties.models import PropertyImage
+
+    rng = _rng(seed, 'images', number)
+    return [
+        PropertyImage(property_id=property_id, image=name, variants=variants, is_primary=i == 0, order_index=i)
+        for property_id in property_ids
+        for i, (name, variants) in enumerate(rng.choices(placeholders, k=per_property))
+    ]
+
+
+def build_reviews(seed, number, property_ids, per_property):
+    from reviews.models import Review
+
+    rng = _rng(seed, 'reviews', number)
+    ratings = rng.choices(range(1, 6), RATING_WEIGHTS, k=len(property_ids) * per_property)
+    return [
+        Review(
+            property_id=property_id,
+            guest_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)[0]}.',
+            rating=rating,
+            review_text=' '.join(rng.sample(REVIEW_SENTENCES[rating], 2)),
+            is_approved=rng.random() < 0.95,
+        )
+        for property_id, rating in zip(
+            (property_id for property_id in property_ids for _ in range(per_property)), ratings,
+        )
+    ]
+
+
+def build_leads(seed, number, start, stop, email_domain):
+    from contact.models import ContactSubmission
+
+    rng = _rng(seed, 'leads', number)
+    rows = []
+    for n in range(start, stop):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        rows.append(ContactSubmission(
+            name=f'{first} {last}',
+            email=f'{first}.{last}{n}@{email_domain}'.lower(),
+            phone=f'+44 7{rng.randrange(10 ** 8, 10 ** 9)}',
+            subject=rng.choice(LEAD_SUBJECTS),
+            message=' '.join(rng.sample(LEAD_MESSAGES, 2)),
+            is_read=rng.random() < 0.6,
+        ))
+    return rows
+
+
+def _write_reviews(task):
+    seed, number, property_ids, per_property, batch_size = task
+    from reviews.models import Review
+    rows = build_reviews(seed, number, property_ids, per_property)
+    with transaction.atomic():
+        Review.objects.bulk_create(rows, batch_size=batch_size)
+    return 'reviews', len(rows)
+
+
+def _write_leads(task):
+    seed, number, start, stop, email_domain, batch_size = task
+    from contact.models import ContactSubmission
+    rows = build_leads(seed, number, start, stop, email_domain)
+    with transaction.atomic():
+        ContactSubmission.objects.bulk_create(rows, batch_size=batch_size)
+    return 'leads', len(rows)
+
+
+def _run_task(task):
+    function, args = task
+    return function(args)
+
+
+def generate(properties=0, reviews_per_property=0, images_per_property=0, leads=0, seed=1,
+             workers=1, batch_size=2000, email_domain='example.com', progress=None):
+    """
+    Insert ``properties`` properties, each with ``images_per_property``
+    images and ``reviews_per_property`` reviews, plus ``leads`` contact
+    submissions. Reviews and leads are written by ``workers`` forked
+    processes when more than one is asked for (never on SQLite, which
+    allows a single writer). ``progress(kind, done, total)`` is called
+    after each chunk. Returns a summary with the new property ids.
+    """
+    from accounts.models import DailyStats
+    from contact.models import ContactSubmission
+    from properties.models import Property, PropertyImage
+    from properties.search import get_backend
+    from reviews.models import Review, ReviewStats
+
+    if connection.vendor == 'sqlite':
+        workers = 1
+    if workers > 1 and connection.in_atomic_block:
+        raise RuntimeError('Parallel generation cannot run inside a transaction.')
+    started = time.perf_counter()
+    report = progress or (lambda kind, done, total: None)
+    summary = {'seed': seed, 'workers': workers, 'property_ids': []}
+
+    placeholders = placeholder_images() if properties and images_per_property else []
+    images = 0
+    for number, start, stop in _chunks(properties):
+        rows = build_properties(seed, number, start, stop)
+        for row, slug in zip(rows, Property.allocate_slugs([row.name for row in rows])):
+            row.slug = slug
+        with transaction.atomic():
+            ids = [row.pk for row in Property.objects.bulk_create(rows, batch_size=batch_size)]
+            if placeholders:
+                images += len(PropertyImage.objects.bulk_create(
+                    build_images(seed, number, ids, images_per_property, placeholders), batch_size=batch_size,
+                ))
+        summary['property_ids'] += ids
+        report('properties', stop, properties)
+
+    property_ids = summary['property_ids']
+    tasks = []
+    if reviews_per_property:
+        tasks += [
+            (_write_reviews, (seed, number, property_ids[start:stop], reviews_per_property, batch_size))
+            for number, start, stop in _chunks(len(property_ids))
+        ]
+    tasks += [
+        (_write_leads, (seed, number, start, stop, email_domain, batch_size))
+        for number, start, stop in _chunks(leads)
+    ]
+    totals = {'reviews': len(property_ids) * reviews_per_property, 'leads': leads}
+    done = {'reviews': 0, 'leads': 0}
+    if workers > 1 and tasks:
+        # Forked children must open their own connections.
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            results = pool.imap_unordered(_run_task, tasks)
+            for kind, count in results:
+                done[kind] += count
+                report(kind, done[kind], totals[kind])
+    else:
+        for task in tasks:
+            kind, count = _run_task(task)
+            done[kind] += count
+            report(kind, done[kind], totals[kind])
+
+    # bulk_create sends no signals: rebuild what they would have maintained.
+    if done['reviews']:
+        Property.rebuild_ratings(property_ids)
+        ReviewStats.rebuild()
+    backend = get_backend()
+    if backend is not None and property_ids:
+        backend.index_many(property_ids)
+    DailyStats.backfill()
+    for model in (Property, PropertyImage, Review, ContactSubmission):
+        bump_version(model)
+
+    summary.update(
+        properties=len(property_ids), images=images, reviews=done['reviews'], leads=done['leads'],
+        seconds=round(time.perf_counter() - started, 1),
+    )
+    return summary
@@ -0,0 +1,87 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from properties.models import PropertyImage
+from properties.tests import make_image_file, make_property
+from reviews.models import Review
+from team.models import TeamMember
+
+
+@override_settings(MEDIA_ROOT='/tmp/nura-stays-test-media', IMAGE_VARIANT_WIDTHS=[320], RESPONSE_CACHE_ENABLED=True)
+class AsyncViewTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.sea = make_property(name='Sea View', is_featured=True, amenities=['WiFi'])
+        self.garden = make_property(name='Garden Flat', price_per_night=80)
+        PropertyImage.objects.create(property=self.sea, image=make_image_file('a.jpg', size=(400, 300)))
+        Review.objects.create(property=self.sea, guest_name='Ada', rating=4, review_text='Lovely')
+        TeamMember.objects.create(name='Cy', role='Host')
+
+    def call(self, view_class, params=None, **kwargs):
+        from asgiref.sync import async_to_sync
+        from django.test import RequestFactory
+        view = view_class.as_view()
+        request = RequestFactory().get('/api/', params or {}, **kwargs.pop('headers', {}))
+        if view_class.view_is_async:
+            response = async_to_sync(view)(request, **kwargs)
+        else:
+            response = view(request, **kwargs)
+        return response.render() if hasattr(response, 'render') else response
+
+    def assertSameResponse(self, name, params=None, **kwargs):
+        from properties import views
+        from reviews import views as review_views
+        from team import views as team_views
+        module = next(m for m in (views, review_views, team_views) if hasattr(m, name))
+        sync_view, async_view = getattr(module, name), getattr(module, f'Async{name}')
+        self.assertTrue(async_view.view_is_async)
+        self.call(sync_view, params, **kwargs)  # memoize the validators
+        with CaptureQueriesContext(connection) as sync_queries:
+            expected = self.call(sync_view, params, **kwargs)
+        with CaptureQueriesContext(connection) as async_queries:
+            response = self.call(async_view, params, **kwargs)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(len(async_queries), len(sync_queries))
+        return response
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_bodies_match_sync_views(self):
+        self.assertSameResponse('PropertyListView')
+        self.assertSameResponse('PropertyListView', {'pagination': 'cursor', 'ordering': 'name'})
+        self.assertSameResponse('PropertyListView', {'page': 9})
+        self.assertSameResponse('PropertyListView', {'fields': 'name', 'search': 'garden'})
+        with override_settings(FAST_SERIALIZATION=False):
+            self.assertSameResponse('PropertyListView')
+        self.assertSameResponse('FeaturedPropertiesView')
+        self.assertSameResponse('PropertyDetailView', slug=self.sea.slug)
+        self.assertSameResponse('PropertyDetailView', {'fields': 'name,images.image_url'}, slug=self.sea.slug)
+        self.assertSameResponse('PropertyDetailView', slug='missing')
+        self.assertSameResponse('ReviewListView', {'property': self.sea.pk})
+        self.assertSameResponse('ReviewListView', {'property': 'x'})
+        self.assertSameResponse('PropertyReviewsView', property_id=self.sea.pk)
+        self.assertSameResponse('TeamMemberListView')
+
+    def test_cache_and_conditional_get(self):
+        from properties.views import AsyncPropertyListView
+        response = self.call(AsyncPropertyListView)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            hit = self.call(AsyncPropertyListView)
+        self.assertEqual((hit['X-Cache'], hit.content), ('HIT', response.content))
+        not_modified = self.call(AsyncPropertyListView, headers={'HTTP_IF_NONE_MATCH': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_options_describe_the_endpoint(self):
+        from properties.views import AsyncPropertyListView
+        response = self.call(AsyncPropertyListView, headers={'REQUEST_METHOD': 'OPTIONS'})
+        self.assertEqual(response.data['name'], 'Property List')
+        self.assertTrue(response.data['description'].startswith('List all active properties'))
+
+    def test_routes_follow_setting(self):
+        from django.urls import resolve
+        self.assertFalse(resolve(reverse('property-list')).func.view_class.view_is_async)
@@ -0,0 +1,80 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from contact.models import ContactSubmission
+from nura_stays import loadtest
+from properties.models import Property
+from team.models import TeamMember
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(404 if self.path.endswith('/missing/') else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LoadtestTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def test_summarize(self):
+        summary = loadtest.summarize([0.003, 0.001, 0.002, 0.004], {200: 3, 500: 1}, 0, 2)
+        self.assertEqual(summary['requests'], 4)
+        self.assertEqual(summary['requests_per_second'], 2.0)
+        self.assertEqual(summary['statuses'], {'200': 3, '500': 1})
+        self.assertEqual(summary['latency_ms'], {'p50': 2.0, 'p95': 4.0, 'p99': 4.0, 'max': 4.0})
+
+    def test_command_reports_each_run(self):
+        out = StringIO()
+        call_command('loadtest', '--url', self.url, '--path', '/api/team/', '--path', '/missing/',
+                     '--concurrency', '1', '2', '--duration', '0.2', stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['paths'], ['/api/team/', '/missing/'])
+        self.assertEqual([run['concurrency'] for run in report['runs']], [1, 2])
+        for run in report['runs']:
+            self.assertGreater(run['requests'], 0)
+            self.assertEqual(run['errors'], 0)
+            self.assertEqual(set(run['statuses']), {'200', '404'})
+
+
+@override_settings(MEDIA_ROOT='/tmp/nura-stays-test-media', IMAGE_VARIANT_WIDTHS=[320])
+class BenchmarkApiTests(TestCase):
+    def test_in_process_run(self):
+        out = StringIO()
+        call_command(
+            'benchmark_api', '--properties', '2', '--reviews-per-property', '2', '--images-per-property', '1',
+            '--team-members', '2', '--leads', '2', '--requests', '3', stdout=out,
+        )
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['mode'], 'in-process')
+        self.assertEqual(report['dataset'], {
+            'seed': 1, 'properties': 2, 'images': 2, 'reviews': 4, 'leads': 2, 'team_members': 2,
+        })
+        self.assertIn('property_list', report['endpoints'])
+        self.assertIn('dashboard_stats', report['endpoints'])
+        for name, result in report['endpoints'].items():
+            self.assertEqual(result['requests'], 3, name)
+            self.assertEqual(set(result['statuses']), {'201' if result['method'] == 'POST' else '200'}, name)
+            self.assertEqual(set(result['queries']), {'cold', 'warm'})
+        # Everything it seeded was rolled back.
+        self.assertFalse(Property.objects.exists())
+        self.assertFalse(TeamMember.objects.exists())
+        self.assertFalse(ContactSubmission.objects.exists())
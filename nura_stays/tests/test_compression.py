@@ -0,0 +1,98 @@
+import gzip
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from properties.tests import make_property
+
+
+@override_settings(MEDIA_ROOT='/tmp/nura-stays-test-media', COMPRESSION_MIN_SIZE=200, RESPONSE_CACHE_ENABLED=True)
+class CompressionTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        for number in range(5):
+            make_property(name=f'Flat {number}', amenities=['WiFi', 'Pool', 'Kitchen'])
+
+    def test_cached_response_is_compressed_once(self):
+        url = reverse('property-list')
+        plain = self.client.get(url)
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        cache.clear()
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual((response['X-Cache'], response['Content-Encoding']), ('MISS', 'gzip'))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertTrue(response['ETag'].startswith('W/"'))
+
+        with mock.patch('nura_stays.compression.compress') as compress, self.assertNumQueries(0):
+            hit = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        compress.assert_not_called()
+        self.assertEqual((hit['X-Cache'], hit['Content-Encoding']), ('HIT', 'gzip'))
+        self.assertEqual(hit.content, response.content)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=hit['ETag']).status_code, 304)
+
+    def test_brotli_is_preferred_and_stored(self):
+        import brotli
+        url = reverse('property-list')
+        plain = self.client.get(url, HTTP_ACCEPT_ENCODING='identity')
+        cache.clear()
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual((response['X-Cache'], response['Content-Encoding']), ('MISS', 'br'))
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+
+        with mock.patch('nura_stays.compression.compress') as compress:
+            hit = self.client.get(url, HTTP_ACCEPT_ENCODING='br')
+        compress.assert_not_called()
+        self.assertEqual((hit['X-Cache'], hit['Content-Encoding']), ('HIT', 'br'))
+        self.assertEqual(hit.content, response.content)
+        # The gzip variant was stored next to it.
+        self.assertEqual(self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')['Content-Encoding'], 'gzip')
+
+    def test_small_and_refused_bodies_are_sent_as_is(self):
+        url = reverse('property-list')
+        self.assertFalse(self.client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0, *;q=0').has_header('Content-Encoding'))
+        with override_settings(COMPRESSION_MIN_SIZE=10 ** 6):
+            cache.clear()
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            self.assertFalse(response.has_header('Content-Encoding'))
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertFalse(self.client.get(url, HTTP_ACCEPT_ENCODING='gzip').has_header('Content-Encoding'))
+
+    def test_export_is_compressed_while_streaming(self):
+        from django.contrib.auth.models import User
+        self.client.force_authenticate(User.objects.create_user('admin', is_staff=True))
+        url = reverse('admin-property-export')
+        plain = b''.join(self.client.get(url).streaming_content)
+        with mock.patch('nura_stays.compression.STREAM_FLUSH_SIZE', 100):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            self.assertTrue(response.streaming)
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertFalse(response.has_header('Content-Length'))
+            chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual(gzip.decompress(b''.join(chunks)), plain)
+
+        import brotli
+        with mock.patch('nura_stays.compression.STREAM_FLUSH_SIZE', 100):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='br')
+            self.assertEqual(response['Content-Encoding'], 'br')
+            chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual(brotli.decompress(b''.join(chunks)), plain)
+
+    def test_choose_encoding(self):
+        from django.test import RequestFactory
+        from nura_stays.compression import choose_encoding
+
+        def choose(header):
+            return choose_encoding(RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header), ['br', 'gzip'])
+        self.assertEqual(choose('gzip, br'), 'br')
+        self.assertEqual(choose('br;q=0.5, gzip'), 'gzip')
+        self.assertEqual(choose('*'), 'br')
+        self.assertEqual(choose('identity'), None)
+        self.assertEqual(choose('br;q=0, *;q=0.1'), 'gzip')
@@ -0,0 +1,63 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from properties.models import PropertyImage
+from properties.serializers import PropertyListSerializer
+from properties.tests import make_image_file, make_property
+from reviews.models import Review
+from team.models import TeamMember
+
+
+@override_settings(MEDIA_ROOT='/tmp/nura-stays-test-media', IMAGE_VARIANT_WIDTHS=[320], RESPONSE_CACHE_ENABLED=False)
+class FastSerializationTests(APITestCase):
+    def setUp(self):
+        self.sea = make_property(name='Sea View \u2028 Café', amenities=['WiFi', 'Pool'], price_per_night='120.50',
+                                 latitude=-6.16, longitude=39.19)
+        self.garden = make_property(name='Garden Flat', location='Stone Town', price_per_night=80)
+        PropertyImage.objects.create(property=self.sea, image=make_image_file('a.jpg', size=(400, 300)), order_index=1)
+        PropertyImage.objects.create(property=self.sea, image=make_image_file('b.jpg', size=(400, 300)), is_primary=True)
+        Review.objects.create(property=self.sea, guest_name='Ada', rating=4, review_text='Lovely')
+        Review.objects.create(guest_name='Bo', rating=5, review_text='General')
+        TeamMember.objects.create(name='Cy', role='Host', photo=make_image_file('cy.jpg', size=(400, 300)),
+                                  social_links={'x': 'https://x.com/cy'})
+        TeamMember.objects.create(name='Di', role='Cleaner')
+
+    def assertSameBody(self, url, params=None):
+        fast = self.client.get(url, params)
+        with override_settings(FAST_SERIALIZATION=False):
+            regular = self.client.get(url, params)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, regular.content)
+        return fast
+
+    def test_list_output_matches_serializer(self):
+        url = reverse('property-list')
+        response = self.assertSameBody(url)
+        primary = self.sea.images.get(is_primary=True)
+        self.assertTrue(response.data['results'][1]['primary_image'].endswith(primary.image.url))
+        self.assertSameBody(url, {'search': 'garden'})
+        self.assertSameBody(url, {'near': '-6.16,39.19', 'ordering': 'distance'})
+        self.assertSameBody(url, {'pagination': 'cursor', 'ordering': '-price_per_night'})
+        self.assertSameBody(url, {'fields': 'id,name,primary_image_srcset'})
+        self.assertSameBody(reverse('review-list'))
+        self.assertSameBody(reverse('team-list'))
+
+    def test_list_skips_model_serializer(self):
+        with mock.patch.object(PropertyListSerializer, 'to_representation') as to_representation:
+            self.client.get(reverse('property-list'))
+        to_representation.assert_not_called()
+        # count, page, primary images (validators are cached)
+        with self.assertNumQueries(3):
+            self.client.get(reverse('property-list'))
+
+    def test_renderer_matches_drf(self):
+        from rest_framework.renderers import JSONRenderer
+        from nura_stays.renderers import ORJSONRenderer
+        data = {'text': 'é \u2028 \u2029', 'n': [1, 2.5, None, True], 'when': timezone.now(),
+                'price': Decimal('1.50'), 1: 'int key'}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from properties.models import PropertyImage
+from properties.tests import make_image_file, make_property
+
+
+@override_settings(MEDIA_ROOT='/tmp/nura-stays-test-media', IMAGE_VARIANT_WIDTHS=[320])
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.prop = make_property(name='Sea View', amenities=['WiFi'])
+        PropertyImage.objects.create(property=self.prop, image=make_image_file(), is_primary=True)
+
+    def test_fields_trim_response_and_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('property-list'), {'fields': 'id,name'})
+        self.assertEqual(response.data['results'], [{'id': self.prop.pk, 'name': 'Sea View'}])
+        select = ctx.captured_queries[-1]['sql']
+        self.assertNotIn('amenities', select)
+        self.assertNotIn('description', select)
+        # The primary image prefetch is skipped when no image field is wanted.
+        self.assertNotIn('properties_propertyimage', select)
+
+    def test_exclude_and_nested_images(self):
+        url = reverse('property-detail', args=[self.prop.slug])
+        response = self.client.get(url, {'fields': 'name,images.id,images.image_url'})
+        self.assertEqual(set(response.data), {'name', 'images'})
+        self.assertEqual(set(response.data['images'][0]), {'id', 'image_url'})
+
+        response = self.client.get(url, {'exclude': 'description,images.srcset'})
+        self.assertNotIn('description', response.data)
+        self.assertIn('name', response.data)
+        self.assertNotIn('srcset', response.data['images'][0])
+
+        with self.assertNumQueries(1):  # property only: validators are cached, images not loaded
+            response = self.client.get(url, {'exclude': 'images'})
+        self.assertNotIn('images', response.data)
+
+    def test_cursor_pages_need_no_deferred_loads(self):
+        make_property(name='Two', price_per_night=50)
+        # The cursor is built from price_per_night, which is loaded though not rendered.
+        with self.assertNumQueries(2):  # validators + page
+            response = self.client.get(reverse('property-list'), {
+                'fields': 'name', 'pagination': 'cursor', 'ordering': 'price_per_night',
+            })
+        self.assertEqual(response.data['results'], [{'name': 'Two'}, {'name': 'Sea View'}])
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(reverse('property-list'), {'fields': 'name,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['fields'], ['Unknown field: secret'])
+        response = self.client.get(reverse('property-featured'), {'exclude': 'name.first'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,71 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework.test import APITestCase
+
+from properties.tests import make_property
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class MetricsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        make_property(name='Sea View')
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_request_metrics_by_route(self):
+        labels = {'method': 'GET', 'route': 'api/properties/<slug:slug>/'}
+        before = {
+            'requests': self.sample('http_requests_total', status='200', **labels),
+            'latency': self.sample('http_request_duration_seconds_count', **labels),
+            'queries': self.sample('http_request_db_queries_sum', **labels),
+            'miss': self.sample('response_cache_requests_total', route=labels['route'], result='miss'),
+            'hit': self.sample('response_cache_requests_total', route=labels['route'], result='hit'),
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('property-detail', args=['sea-view']))
+        cold_queries = len(queries)  # the next request resets the query log
+        self.client.get(reverse('property-detail', args=['sea-view']))
+        self.assertEqual(self.sample('http_requests_total', status='200', **labels), before['requests'] + 2)
+        self.assertEqual(self.sample('http_request_duration_seconds_count', **labels), before['latency'] + 2)
+        self.assertEqual(self.sample('http_request_db_queries_sum', **labels), before['queries'] + cold_queries)
+        self.assertGreaterEqual(self.sample('http_response_size_bytes_sum', **labels), len(response.content))
+        self.assertEqual(self.sample('response_cache_requests_total', route=labels['route'], result='miss'),
+                         before['miss'] + 1)
+        self.assertEqual(self.sample('response_cache_requests_total', route=labels['route'], result='hit'),
+                         before['hit'] + 1)
+
+        with override_settings(METRICS_TOKEN='secret'):
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('http_requests_total{method="GET",route="api/properties/<slug:slug>/",status="200"}', body)
+        self.assertIn('contact_outbox_emails{status="pending"} 0.0', body)
+
+    def test_throttle_rejections(self):
+        labels = {'throttle': 'AnonRateThrottle', 'route': 'api/team/'}
+        before = self.sample('throttle_rejections_total', **labels)
+        with mock.patch('nura_stays.throttling.AnonRateThrottle.THROTTLE_RATES', {'anon': '1/hour'}):
+            statuses = [self.client.get(reverse('team-list')).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 429, 429])
+        self.assertEqual(self.sample('throttle_rejections_total', **labels), before + 2)
+
+    def test_scrape_access(self):
+        url = reverse('metrics')
+        self.assertEqual(self.client.get(url).status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        with override_settings(METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+            self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+        with override_settings(METRICS_ALLOWED_IPS=['10.0.0.5']):
+            self.assertEqual(self.client.get(url, REMOTE_ADDR='10.0.0.5').status_code, 200)
+            self.assertEqual(self.client.get(url, HTTP_X_FORWARDED_FOR='10.0.0.5').status_code, 403)
@@ -0,0 +1,36 @@
+import warnings
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+
+from nura_stays import streaming
+from properties.models import PropertyImage
+from properties.tests import make_image_file, make_property
+
+
+@override_settings(MEDIA_ROOT='/tmp/nura-stays-test-media', IMAGE_VARIANT_WIDTHS=[320])
+class ASGIStreamingTests(TestCase):
+    def setUp(self):
+        self.image = PropertyImage.objects.create(
+            property=make_property(), image=make_image_file('serve.jpg', (640, 480))
+        )
+        self.url = self.image.image.url
+
+    def test_asgi_streams_in_batches(self):
+        with self.image.image.open('rb') as f:
+            data = f.read()
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        response = self.client.get(self.url)
+        with mock.patch.object(streaming, 'STREAM_BATCH_SIZE', 1024), warnings.catch_warnings():
+            # Django warns before reading a sync iterator whole.
+            warnings.simplefilter('error')
+            async_to_sync(streaming.ASGIHandler().send_response)(response, send)
+        bodies = [message['body'] for message in messages[1:-1]]
+        self.assertGreater(len(bodies), 1)
+        self.assertTrue(all(len(body) < 1024 + 8192 for body in bodies))
+        self.assertEqual(b''.join(bodies), data)
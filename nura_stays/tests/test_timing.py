@@ -0,0 +1,71 @@
+import json
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APITestCase
+
+from properties.tests import make_property
+from reviews.models import Review
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False, SERVER_TIMING_HEADER=True)
+class ServerTimingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        prop = make_property(name='Sea View')
+        Review.objects.create(property=prop, guest_name='Ada', rating=5, review_text='Lovely')
+
+    def metrics(self, response):
+        metrics = {}
+        for entry in response['Server-Timing'].split(', '):
+            name, *params = entry.split(';')
+            metrics[name] = dict(param.split('=', 1) for param in params)
+        return metrics
+
+    def test_header_counts_queries_and_spans(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('property-detail', args=['sea-view']))
+        metrics = self.metrics(response)
+        self.assertEqual(metrics['db']['desc'], f'"{len(queries)} queries"')
+        self.assertEqual(set(metrics), {'db', 'serialize', 'view', 'total'})
+        self.assertLessEqual(float(metrics['view']['dur']), float(metrics['total']['dur']))
+        # Fast-path lists report their row building as serialization too.
+        self.assertIn('serialize', self.metrics(self.client.get(reverse('property-list'))))
+
+    def test_log_line_and_slow_thresholds(self):
+        url = reverse('review-list')
+        with self.assertLogs('nura_stays.timing', 'INFO') as logs:
+            self.client.get(url)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record['path'], record['status']), (url, 200))
+        self.assertEqual(record['view'], 'reviews.views.ReviewListView')
+        self.assertGreater(record['queries'], 0)
+
+        with override_settings(SLOW_QUERY_MS=0, SLOW_REQUEST_MS=0), \
+                self.assertLogs('nura_stays.timing', 'WARNING') as logs:
+            self.client.get(url)
+        messages = [record.getMessage() for record in logs.records]
+        self.assertTrue(any('Slow query' in m and 'ReviewListView' in m and 'SELECT' in m for m in messages))
+        self.assertTrue(any(m.startswith('Slow request') for m in messages))
+
+    def test_async_handler_and_header_setting(self):
+        response = async_to_sync(AsyncClient().get)(reverse('team-list'))
+        self.assertIn('db', self.metrics(response))
+        self.assertNotEqual(self.metrics(response)['db']['desc'], '"0 queries"')
+
+    @override_settings(SERVER_TIMING_HEADER=False, SERVER_TIMING_TOKEN='s3cret')
+    def test_header_only_for_staff_or_token(self):
+        url = reverse('team-list')
+        self.assertFalse(self.client.get(url).has_header('Server-Timing'))
+        self.assertFalse(self.client.get(url, HTTP_X_SERVER_TIMING_TOKEN='wrong').has_header('Server-Timing'))
+        self.assertIn('db', self.metrics(self.client.get(url, HTTP_X_SERVER_TIMING_TOKEN='s3cret')))
+        self.client.force_authenticate(User.objects.create_user('admin', is_staff=True))
+        self.assertIn('db', self.metrics(self.client.get(url)))
+        # Serialization is timed in the views, not by patching DRF.
+        self.assertFalse(hasattr(BaseSerializer.data.fget, 'timed'))
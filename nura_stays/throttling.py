@@ -0,0 +1,17 @@
+"""
+Throttles that count their rejections in the ``throttle_rejections``
+metric (see metrics.py), labelled with the throttle class and URL route.
+"""
+from rest_framework import throttling
+
+from .metrics import THROTTLED, route
+
+
+class AnonRateThrottle(throttling.AnonRateThrottle):
+    """DRF's AnonRateThrottle (same ``anon`` scope and cache keys), counted."""
+
+    def allow_request(self, request, view):
+        if super().allow_request(request, view):
+            return True
+        THROTTLED.labels(type(self).__name__, route(request)).inc()
+        return False
@@ -0,0 +1,244 @@
+"""
+Per-request timing: SQL queries, database time, serializer and view time.
+
+ServerTimingMiddleware opens a RequestTimer for each request in a context
+variable. A wrapper installed once on every database connection (through
+``connection.execute_wrapper``) adds each query's duration to the current
+timer and keeps the SQL of statements slower than SLOW_QUERY_MS; outside a
+request (management commands, the outbox worker) it only passes queries
+through. Serializer ``.data`` in the read views (SerializeTimingMixin and
+the async mixins of nura_stays.asyncviews) and FastPlan rendering add to
+the ``serialize`` span, and the view span runs from the view call to the
+response it returns, before rendering.
+
+Spans overlap: queries that run lazily while serializing count in both
+``db`` and ``serialize``, and both sit inside ``view``. The middleware logs
+one JSON line per request on the ``nura_stays.timing`` logger; slow
+requests and queries are logged as warnings with their SQL (placeholders,
+not parameters) and DRF view class. The Server-Timing header, which shows
+query counts and timings, goes only to staff users and to requests sending
+``X-Server-Timing-Token: <SERVER_TIMING_TOKEN>``, unless
+SERVER_TIMING_HEADER turns it on for everyone (development).
+"""
+import hmac
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_timer', default=None)
+
+MAX_SQL_LENGTH = 2000
+
+
+class RequestTimer:
+    __slots__ = ('started', 'queries', 'db', 'spans', 'active', 'slow_queries', 'view_started', 'view_ended')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.spans = {}
+        self.active = set()
+        self.slow_queries = []
+        self.view_started = self.view_ended = None
+
+
+def current_timer():
+    """The RequestTimer of the request being handled, or None."""
+    return _current.get()
+
+
+@contextmanager
+def span(name):
+    """Add the time spent inside the block to the current request's ``name`` span."""
+    timer = _current.get()
+    if timer is None or name in timer.active:
+        # No request, or already inside this span (nested serializers).
+        yield
+        return
+    timer.active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.spans[name] = timer.spans.get(name, 0.0) + time.perf_counter() - started
+        timer.active.discard(name)
+
+
+def record_query(execute, sql, params, many, context):
+    timer = _current.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        timer.queries += 1
+        timer.db += elapsed
+        if elapsed * 1000 >= getattr(settings, 'SLOW_QUERY_MS', 100):
+            timer.slow_queries.append((elapsed, sql))
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    # Fires on every (re)connect of the same wrapper, e.g. with the pool.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_on_open_connections(**kwargs):
+    # Connections opened before the middleware was loaded sent no
+    # connection_created for it. Like close_old_connections, this runs on
+    # request_started, in the thread that will run the request's queries.
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection.__class__, connection)
+
+
+def serialized(serializer):
+    """``serializer.data``, timed as the ``serialize`` span."""
+    with span('serialize'):
+        return serializer.data
+
+
+class SerializeTimingMixin:
+    """
+    DRF's list() and retrieve() with the serializer's ``.data`` timed (see
+    ``serialized``); list it before the generic view class.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialized(self.get_serializer(page, many=True)))
+        return Response(serialized(self.get_serializer(queryset, many=True)))
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(serialized(self.get_serializer(self.get_object())))
+
+
+def _mark(attribute):
+    timer = _current.get()
+    if timer is not None:
+        setattr(timer, attribute, time.perf_counter())
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    view = getattr(match.func, 'view_class', match.func)
+    return f'{view.__module__}.{view.__qualname__}'
+
+
+class ServerTimingMiddleware:
+    """
+    Measure every request (see the module docstring); list it first in
+    MIDDLEWARE so ``total`` covers the other middleware too.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        connection_created.connect(install_query_recorder, dispatch_uid='nura_stays.timing')
+        request_started.connect(install_on_open_connections, dispatch_uid='nura_stays.timing')
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Keep the view hooks on the event loop instead of a thread hop each.
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = RequestTimer()
+        token = _current.set(timer)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.report(request, response, timer)
+        return response
+
+    async def __acall__(self, request):
+        timer = RequestTimer()
+        token = _current.set(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.report(request, response, timer)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _mark('view_started')
+
+    def process_template_response(self, request, response):
+        # Called as the view returns, before the response is rendered.
+        _mark('view_ended')
+        return response
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        _mark('view_started')
+
+    async def aprocess_template_response(self, request, response):
+        _mark('view_ended')
+        return response
+
+    def header_allowed(self, request):
+        if getattr(settings, 'SERVER_TIMING_HEADER', False):
+            return True
+        token = getattr(settings, 'SERVER_TIMING_TOKEN', '')
+        if token and hmac.compare_digest(request.headers.get('X-Server-Timing-Token', ''), token):
+            return True
+        # DRF copies the user it authenticated onto the Django request.
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_staff)
+
+    def report(self, request, response, timer):
+        ended = time.perf_counter()
+        total = ended - timer.started
+        view = None
+        if timer.view_started is not None:
+            view = (timer.view_ended or ended) - timer.view_started
+        metrics = [('db', timer.db, f'{timer.queries} queries')]
+        metrics += [(name, seconds, None) for name, seconds in timer.spans.items()]
+        if view is not None:
+            metrics.append(('view', view, None))
+        metrics.append(('total', total, None))
+
+        if self.header_allowed(request):
+            header = ', '.join(
+                f'{name};dur={seconds * 1000:.2f}' + (f';desc="{desc}"' if desc else '')
+                for name, seconds, desc in metrics
+            )
+            if response.has_header('Server-Timing'):
+                header = f'{response["Server-Timing"]}, {header}'
+            response['Server-Timing'] = header
+
+        name = view_name(request)
+        if logger.isEnabledFor(logging.INFO):
+            record = {
+                'method': request.method, 'path': request.path, 'status': response.status_code,
+                'view': name, 'queries': timer.queries,
+                **{f'{metric}_ms': round(seconds * 1000, 2) for metric, seconds, _ in metrics},
+            }
+            logger.info(json.dumps(record, separators=(',', ':')))
+        for seconds, sql in timer.slow_queries:
+            logger.warning('Slow query (%.1f ms) in %s %s [%s]: %s',
+                           seconds * 1000, request.method, request.path, name, sql[:MAX_SQL_LENGTH])
+        if total * 1000 >= getattr(settings, 'SLOW_REQUEST_MS', 1000):
+            logger.warning('Slow request (%.1f ms) %s %s [%s]: %d queries, %.1f ms in the database',
+                           total * 1000, request.method, request.path, name, timer.queries, timer.db * 1000)
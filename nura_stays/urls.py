@@ -1,10 +1,14 @@
 """
 URL configuration for Nura Stays project.
 """
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+
+from .media import serve_media
+from .metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -14,7 +18,11 @@ urlpatterns = [
     path('api/', include('contact.urls')),
     path('api/admin/', include('accounts.urls')),
     path('api/admin/leads/', include('contact.admin_urls')),
+    path('api/metrics', metrics_view, name='metrics'),
 ]
 
-# Serve media files (uploaded images) in both dev and production
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Serve media files (uploaded images) in both dev and production; see
+# nura_stays/media.py for proxy hand-off and caching.
+urlpatterns += [
+    re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media, name='media'),
+]
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class PropertiesConfig(AppConfig):
     name = 'properties'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from nura_stays.cache import watch_models
+        from .models import Booking, Property, PropertyImage
+        watch_models(Property, PropertyImage, Booking)
@@ -0,0 +1,126 @@
+"""
+Availability search and overlap protection for bookings.
+
+A property is available for [check_in, check_out) when it has no confirmed
+Booking whose range overlaps it. Both the search and the overlap guard run in
+the database:
+
+* PostgreSQL: an exclusion constraint on
+  (property_id WITH =, daterange(check_in, check_out) WITH &&) over confirmed
+  rows, backed by a GiST index (btree_gist). Searches probe the same
+  expression, so they use that index.
+* SQLite: BEFORE INSERT/UPDATE triggers that abort on an overlapping
+  confirmed row, using the partial (property, check_in, check_out) index and
+  the interval test ``check_in < :check_out AND check_out > :check_in``.
+  Because confirmed rows never overlap, a property is free exactly when its
+  last booking starting before ``check_out`` ends by ``check_in``; searches
+  look that one row up with a single index seek per property.
+
+Other databases get the interval query without a database-level guard.
+SQLite drops triggers when a migration rebuilds the table, so such migrations
+must call ``get_backend().create()`` again.
+"""
+from django.db import connection
+from django.db.models import BooleanField, Exists, OuterRef, Subquery, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+BOOKING_TABLE = 'properties_booking'
+CONSTRAINT_NAME = 'booking_no_overlap'
+
+
+class AvailabilityBackend:
+    """Interval query shared by every database."""
+
+    def create(self, schema_editor):
+        pass
+
+    def drop(self, schema_editor):
+        pass
+
+    def overlapping(self, bookings, check_in, check_out):
+        return bookings.filter(check_in__lt=check_out, check_out__gt=check_in)
+
+    def available(self, queryset, bookings, check_in, check_out):
+        taken = self.overlapping(bookings.filter(property=OuterRef('pk')), check_in, check_out)
+        return queryset.filter(~Exists(taken))
+
+
+class SQLiteAvailabilityBackend(AvailabilityBackend):
+    """Overlap triggers; searches seek booking_active_range_idx once per property."""
+
+    def _trigger(self, event, extra=''):
+        return (
+            f"CREATE TRIGGER IF NOT EXISTS {CONSTRAINT_NAME}_{event.split()[0].lower()} "
+            f"BEFORE {event} ON {BOOKING_TABLE} WHEN NEW.status = 'confirmed' BEGIN "
+            f"SELECT RAISE(ABORT, '{CONSTRAINT_NAME}') WHERE EXISTS ("
+            f"SELECT 1 FROM {BOOKING_TABLE} WHERE property_id = NEW.property_id "
+            f"AND status = 'confirmed' AND check_in < NEW.check_out AND check_out > NEW.check_in{extra}); "
+            f"END"
+        )
+
+    def create(self, schema_editor):
+        schema_editor.execute(self._trigger('INSERT'))
+        schema_editor.execute(self._trigger(
+            'UPDATE OF property_id, check_in, check_out, status', extra=' AND id != NEW.id'
+        ))
+
+    def drop(self, schema_editor):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {CONSTRAINT_NAME}_insert')
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {CONSTRAINT_NAME}_update')
+
+    def available(self, queryset, bookings, check_in, check_out):
+        # Relies on the triggers: with no overlaps, only the latest booking
+        # starting before check_out can reach past check_in.
+        last_check_out = bookings.filter(
+            property=OuterRef('pk'), check_in__lt=check_out
+        ).order_by('-check_in').values('check_out')[:1]
+        return queryset.alias(
+            _last_check_out=Coalesce(Subquery(last_check_out), Value(check_in))
+        ).filter(_last_check_out__lte=check_in)
+
+
+class PostgreSQLAvailabilityBackend(AvailabilityBackend):
+    """Exclusion constraint over daterange; GiST-indexed overlap probe."""
+
+    def create(self, schema_editor):
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        schema_editor.execute(
+            f"ALTER TABLE {BOOKING_TABLE} ADD CONSTRAINT {CONSTRAINT_NAME} EXCLUDE USING gist "
+            f"(property_id WITH =, daterange(check_in, check_out, '[)') WITH &&) "
+            f"WHERE (status = 'confirmed')"
+        )
+
+    def drop(self, schema_editor):
+        schema_editor.execute(f'ALTER TABLE {BOOKING_TABLE} DROP CONSTRAINT IF EXISTS {CONSTRAINT_NAME}')
+
+    def overlapping(self, bookings, check_in, check_out):
+        # Booking is the only table in the subquery, so bare column names
+        # resolve to it whatever alias Django picks.
+        return bookings.filter(RawSQL(
+            "daterange(check_in, check_out, '[)') && daterange(%s, %s, '[)')",
+            [check_in, check_out], output_field=BooleanField(),
+        ))
+
+
+_BACKENDS = {
+    'sqlite': SQLiteAvailabilityBackend,
+    'postgresql': PostgreSQLAvailabilityBackend,
+}
+
+
+def get_backend(conn=None):
+    return _BACKENDS.get((conn or connection).vendor, AvailabilityBackend)()
+
+
+def overlapping(bookings, check_in, check_out):
+    """Filter a Booking queryset to confirmed rows overlapping [check_in, check_out)."""
+    from .models import Booking
+    return get_backend().overlapping(bookings.filter(status=Booking.CONFIRMED), check_in, check_out)
+
+
+def available(queryset, check_in, check_out):
+    """Filter a Property queryset to those free for the whole of [check_in, check_out)."""
+    from .models import Booking
+    bookings = Booking.objects.filter(status=Booking.CONFIRMED)
+    return get_backend().available(queryset, bookings, check_in, check_out)
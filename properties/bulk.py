@@ -0,0 +1,81 @@
+"""
+Bulk export/import dataset for properties.
+"""
+from rest_framework import serializers
+
+from nura_stays.bulk import Dataset
+from nura_stays.cache import bump_version
+
+from . import geo
+from .models import Property
+from .search import get_backend
+from .serializers import PropertyAdminSerializer
+
+
+class PropertyImportSerializer(PropertyAdminSerializer):
+    """Admin property fields for import; a blank slug is allocated from the name."""
+    images = None
+    slug = serializers.SlugField(max_length=220, required=False)
+
+    class Meta(PropertyAdminSerializer.Meta):
+        fields = [
+            'name', 'slug', 'location', 'description', 'short_description',
+            'price_per_night', 'bedrooms', 'bathrooms', 'max_guests', 'property_type',
+            'amenities', 'house_rules', 'cancellation_policy', 'latitude', 'longitude',
+            'is_active', 'is_featured',
+        ]
+        read_only_fields = []
+
+
+class PropertyDataset(Dataset):
+    name = 'properties'
+    model = Property
+    serializer_class = PropertyImportSerializer
+    fields = [
+        'id', 'name', 'slug', 'location', 'description', 'short_description',
+        'price_per_night', 'bedrooms', 'bathrooms', 'max_guests', 'property_type',
+        'amenities', 'house_rules', 'cancellation_policy', 'latitude', 'longitude',
+        'is_active', 'is_featured', 'average_rating', 'rating_count',
+        'created_at', 'updated_at',
+    ]
+    json_fields = ['amenities']
+
+    def validate_batch(self, items):
+        """Given slugs must be unique within the batch and not taken by another row."""
+        errors = {}
+        seen = {}
+        for line, data, _ in items:
+            slug = data.get('slug')
+            if slug in seen:
+                errors[line] = {'slug': [f'Duplicate slug in file (line {seen[slug]}).']}
+            elif slug:
+                seen[slug] = line
+        if seen:
+            taken = dict(Property.objects.filter(slug__in=seen).values_list('slug', 'pk'))
+            for line, data, instance in items:
+                slug = data.get('slug')
+                if slug in taken and line not in errors and taken[slug] != getattr(instance, 'pk', None):
+                    errors[line] = {'slug': ['A property with this slug already exists.']}
+        return errors
+
+    def prepare(self, created, updated, context):
+        missing = [instance for instance in created if not instance.slug]
+        if missing:
+            reserved = {instance.slug for instance in created if instance.slug}
+            slugs = Property.allocate_slugs([instance.name for instance in missing], reserved=reserved)
+            for instance, slug in zip(missing, slugs):
+                instance.slug = slug
+        for instance in created + updated:
+            has_point = instance.latitude is not None and instance.longitude is not None
+            instance.geohash = geo.encode(instance.latitude, instance.longitude) if has_point else ''
+
+    def prepared_fields(self):
+        return ['geohash']
+
+    def after_import(self, created_ids, updated_ids, context):
+        from accounts.models import DailyStats
+        backend = get_backend()
+        if backend is not None:
+            backend.index_many(created_ids + updated_ids)
+        DailyStats.refresh(self.model, created_ids + updated_ids)
+        bump_version(Property)
@@ -0,0 +1,109 @@
+"""
+Facet counts for the property listing.
+
+All facets for a filtered queryset come back from a single statement: a
+UNION ALL of grouped (facet, value, count) selects over the filtered ids, one
+per facet, with amenities expanded from the JSON list by the database
+(json_each on SQLite, jsonb_array_elements_text on PostgreSQL). Databases
+without a JSON expansion count amenities in Python.
+"""
+from collections import Counter
+
+from django.db import connection
+from django.db.models import Case, CharField, Count, IntegerField, Q, Value, When
+from django.db.models.functions import Cast, Least
+
+from .models import Property
+
+BEDROOM_CAP = 5
+# (label, lower bound inclusive, upper bound exclusive) on price_per_night
+PRICE_BUCKETS = [
+    ('0-100', None, 100),
+    ('100-200', 100, 200),
+    ('200-300', 200, 300),
+    ('300-500', 300, 500),
+    ('500+', 500, None),
+]
+
+_AMENITY_SQL = {
+    'sqlite': (
+        "SELECT 'amenities', j.value, COUNT(DISTINCT p.id) FROM {table} p, json_each(p.amenities) j "
+        "WHERE p.id IN ({ids}) AND j.type = 'text' GROUP BY j.value"
+    ),
+    'postgresql': (
+        "SELECT 'amenities', j.value, COUNT(DISTINCT p.id) FROM {table} p "
+        "CROSS JOIN LATERAL jsonb_array_elements_text(p.amenities) AS j(value) "
+        "WHERE p.id IN ({ids}) AND jsonb_typeof(p.amenities) = 'array' GROUP BY j.value"
+    ),
+}
+
+
+def _price_bucket():
+    whens = []
+    for label, low, high in PRICE_BUCKETS:
+        condition = Q()
+        if low is not None:
+            condition &= Q(price_per_night__gte=low)
+        if high is not None:
+            condition &= Q(price_per_night__lt=high)
+        whens.append(When(condition, then=Value(label)))
+    return Case(*whens, output_field=CharField())
+
+
+def _grouped(ids, facet, value):
+    return Property.objects.filter(pk__in=ids).order_by().annotate(
+        facet=Value(facet, output_field=CharField()), value=value,
+    ).values('facet', 'value').annotate(count=Count('pk'))
+
+
+def empty_facets():
+    return {
+        'property_type': {key: 0 for key, _ in Property.PROPERTY_TYPES},
+        'bedrooms': {str(n) if n < BEDROOM_CAP else f'{BEDROOM_CAP}+': 0 for n in range(1, BEDROOM_CAP + 1)},
+        'price': {label: 0 for label, _, _ in PRICE_BUCKETS},
+        'amenities': {},
+    }
+
+
+def facet_counts(queryset):
+    """Return {'count': n, 'facets': {...}} for a filtered Property queryset."""
+    ids = queryset.order_by().values('pk')
+    bedrooms = Least('bedrooms', Value(BEDROOM_CAP), output_field=IntegerField())
+    parts = [
+        _grouped(ids, 'total', Value('', output_field=CharField())),
+        _grouped(ids, 'property_type', Cast('property_type', CharField())),
+        _grouped(ids, 'bedrooms', Cast(bedrooms, CharField())),
+        _grouped(ids, 'price', _price_bucket()),
+    ]
+    union = parts[0].union(*parts[1:], all=True)
+    sql, params = union.query.sql_with_params()
+
+    amenity_sql = _AMENITY_SQL.get(connection.vendor)
+    if amenity_sql:
+        ids_sql, ids_params = ids.query.sql_with_params()
+        sql = f'{sql} UNION ALL ' + amenity_sql.format(table=Property._meta.db_table, ids=ids_sql)
+        params = tuple(params) + tuple(ids_params)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    result = empty_facets()
+    total = 0
+    for facet, value, count in rows:
+        if facet == 'total':
+            total = count
+        elif facet == 'bedrooms' and value is not None:
+            label = value if int(value) < BEDROOM_CAP else f'{BEDROOM_CAP}+'
+            result['bedrooms'][label] = result['bedrooms'].get(label, 0) + count
+        elif value is not None:
+            result[facet][value] = count
+
+    if not amenity_sql:
+        counter = Counter()
+        for amenities in queryset.order_by().values_list('amenities', flat=True):
+            counter.update(a for a in set(amenities or []) if isinstance(a, str))
+        result['amenities'] = dict(counter)
+
+    result['amenities'] = dict(sorted(result['amenities'].items(), key=lambda item: (-item[1], item[0])))
+    return {'count': total, 'facets': result}
@@ -2,7 +2,50 @@
 Filters for Properties app.
 """
 import django_filters
+from django import forms
+from rest_framework import filters
+from . import geo
+from .availability import available
 from .models import Property
+from .search import search
+
+
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 500
+
+
+class PropertyFilterForm(forms.Form):
+    """Cross-field validation for the availability and geo filters."""
+
+    def clean_near(self):
+        value = self.cleaned_data.get('near')
+        if not value:
+            return None
+        try:
+            return geo.parse_point(value)
+        except ValueError:
+            raise forms.ValidationError('Expected "latitude,longitude".')
+
+    def clean_bbox(self):
+        value = self.cleaned_data.get('bbox')
+        if not value:
+            return None
+        try:
+            return geo.parse_bbox(value)
+        except ValueError:
+            raise forms.ValidationError('Expected "west,south,east,north" in degrees.')
+
+    def clean(self):
+        cleaned = super().clean()
+        radius = cleaned.get('radius_km')
+        if radius is not None and not cleaned.get('near'):
+            raise forms.ValidationError('radius_km requires near.')
+        check_in, check_out = cleaned.get('check_in'), cleaned.get('check_out')
+        if bool(check_in) != bool(check_out):
+            raise forms.ValidationError('check_in and check_out must be given together.')
+        if check_in and check_out <= check_in:
+            raise forms.ValidationError('check_out must be after check_in.')
+        return cleaned
 
 
 class PropertyFilter(django_filters.FilterSet):
@@ -13,7 +56,68 @@ class PropertyFilter(django_filters.FilterSet):
     max_bedrooms = django_filters.NumberFilter(field_name='bedrooms', lookup_expr='lte')
     property_type = django_filters.CharFilter(field_name='property_type', lookup_expr='exact')
     location = django_filters.CharFilter(field_name='location', lookup_expr='icontains')
+    check_in = django_filters.DateFilter(method='filter_available')
+    check_out = django_filters.DateFilter(method='filter_available')
+    guests = django_filters.NumberFilter(field_name='max_guests', lookup_expr='gte', min_value=1)
+    near = django_filters.CharFilter(method='filter_near')
+    radius_km = django_filters.NumberFilter(method='filter_near', min_value=0, max_value=MAX_RADIUS_KM)
+    bbox = django_filters.CharFilter(method='filter_bbox')
 
     class Meta:
         model = Property
+        form = PropertyFilterForm
         fields = ['property_type', 'bedrooms', 'bathrooms', 'is_featured']
+
+    def filter_available(self, queryset, name, value):
+        # Applied once, from check_in; the form guarantees check_out is set.
+        if name != 'check_in':
+            return queryset
+        return available(queryset, value, self.form.cleaned_data['check_out'])
+
+    def filter_near(self, queryset, name, value):
+        # Applied once, from near; radius_km only parameterises it.
+        if name != 'near':
+            return queryset
+        radius = self.form.cleaned_data.get('radius_km')
+        return geo.near(queryset, *value, float(radius) if radius is not None else DEFAULT_RADIUS_KM)
+
+    def filter_bbox(self, queryset, name, value):
+        return geo.within_bbox(queryset, *value)
+
+
+class PropertySearchFilter(filters.SearchFilter):
+    """
+    ?search= backed by the full-text index (properties.search). Falls back to
+    the view's ``search_fields`` on databases without a full-text backend.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+        results = search(queryset, term)
+        if results is None:
+            return super().filter_queryset(request, queryset, view)
+        return results
+
+
+class PropertyOrderingFilter(filters.OrderingFilter):
+    """
+    Order search results by relevance unless ?ordering= is given.
+    ?ordering=distance is honoured only together with ?near=.
+    """
+    annotation_fields = ('distance',)
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        valid = super().remove_invalid_fields(queryset, fields, view, request)
+        return [
+            term for term in valid
+            if term.lstrip('-') not in self.annotation_fields or term.lstrip('-') in queryset.query.annotations
+        ]
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        params = request.query_params.get(self.ordering_param)
+        if not params and 'search_rank' in queryset.query.annotations:
+            return ['-search_rank'] + list(ordering or [])
+        return ordering
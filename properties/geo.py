@@ -0,0 +1,167 @@
+"""
+Geospatial search for properties without PostGIS.
+
+Each property stores a 12-character geohash of its coordinates in an indexed
+column. A bounding box is covered by a few geohash cells; runs of adjacent
+cells become ``geohash >= lo AND geohash < hi`` range scans on that index,
+which prune candidates before the exact checks: a latitude/longitude
+comparison for ``?bbox=`` and a haversine distance (built from Django's
+portable math functions) for ``?near=``.
+"""
+import math
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+PRECISION = 12
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# Sorts after every geohash character: the open end of the last range.
+_END = '{'
+
+
+def encode(latitude, longitude, precision=PRECISION):
+    """Geohash of a point."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+    return ''.join(chars)
+
+
+def _cell_size(precision):
+    """(height, width) in degrees of a geohash cell."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180 / 2 ** lat_bits, 360 / 2 ** lng_bits
+
+
+def _to_int(cell):
+    value = 0
+    for char in cell:
+        value = value * 32 + BASE32.index(char)
+    return value
+
+
+def _to_cell(value, precision):
+    chars = []
+    for _ in range(precision):
+        value, digit = divmod(value, 32)
+        chars.append(BASE32[digit])
+    return ''.join(reversed(chars))
+
+
+def _cells(south, west, north, east, precision):
+    height, width = _cell_size(precision)
+    rows = range(math.floor((south + 90) / height), math.floor((min(north, 90 - 1e-9) + 90) / height) + 1)
+    cols = range(math.floor((west + 180) / width), math.floor((min(east, 180 - 1e-9) + 180) / width) + 1)
+    return {
+        encode(-90 + (row + 0.5) * height, -180 + (col + 0.5) * width, precision)
+        for row in rows for col in cols
+    }
+
+
+def cover(south, west, north, east, max_cells=32):
+    """
+    Return sorted (lo, hi) geohash ranges that together contain every point
+    of the box. A box with west > east crosses the antimeridian.
+    """
+    boxes = [(south, west, north, 180.0), (south, -180.0, north, east)] if west > east else [(south, west, north, east)]
+    cells, precision = {''}, 0
+    # The finest precision whose cover still fits in max_cells.
+    for candidate in range(1, PRECISION + 1):
+        height, width = _cell_size(candidate)
+        estimate = sum(
+            (math.floor((n - s) / height) + 2) * (math.floor((e - w) / width) + 2) for s, w, n, e in boxes
+        )
+        if estimate > max_cells:
+            break
+        cells = set().union(*(_cells(*box, candidate) for box in boxes))
+        precision = candidate
+    if precision == 0:
+        return [('', _END)]
+
+    ranges = []
+    last = 32 ** precision - 1
+    for value in sorted(_to_int(cell) for cell in cells):
+        if ranges and ranges[-1][1] == value:
+            ranges[-1][1] = value + 1
+        else:
+            ranges.append([value, value + 1])
+    return [
+        (_to_cell(lo, precision), _END if hi > last else _to_cell(hi, precision))
+        for lo, hi in ranges
+    ]
+
+
+def bbox_around(latitude, longitude, radius_km):
+    """(south, west, north, east) containing the circle."""
+    dlat = radius_km / KM_PER_DEGREE
+    south, north = max(latitude - dlat, -90.0), min(latitude + dlat, 90.0)
+    if south == -90.0 or north == 90.0:
+        return south, -180.0, north, 180.0
+    dlng = radius_km / (KM_PER_DEGREE * math.cos(math.radians(max(abs(south), abs(north)))))
+    if dlng >= 180:
+        return south, -180.0, north, 180.0
+    west, east = longitude - dlng, longitude + dlng
+    return south, (west + 540) % 360 - 180, north, (east + 540) % 360 - 180
+
+
+def cell_filter(south, west, north, east):
+    """Q over the geohash index matching every property inside the box."""
+    query = Q()
+    for lo, hi in cover(south, west, north, east):
+        query |= Q(geohash__gte=lo, geohash__lt=hi)
+    return query
+
+
+def distance_km(latitude, longitude):
+    """Haversine distance expression from the given point to each row."""
+    lat0 = Value(math.radians(latitude), output_field=FloatField())
+    lng0 = Value(math.radians(longitude), output_field=FloatField())
+    lat, lng = Radians(F('latitude')), Radians(F('longitude'))
+    a = Power(Sin((lat - lat0) / 2), 2) + Cos(lat0) * Cos(lat) * Power(Sin((lng - lng0) / 2), 2)
+    return Value(2 * EARTH_RADIUS_KM, output_field=FloatField()) * ASin(Sqrt(a))
+
+
+def within_bbox(queryset, south, west, north, east):
+    queryset = queryset.filter(cell_filter(south, west, north, east), latitude__range=(south, north))
+    if west > east:
+        return queryset.filter(Q(longitude__gte=west) | Q(longitude__lte=east))
+    return queryset.filter(longitude__range=(west, east))
+
+
+def near(queryset, latitude, longitude, radius_km):
+    """Properties within ``radius_km``, annotated with ``distance``."""
+    return queryset.filter(cell_filter(*bbox_around(latitude, longitude, radius_km))).annotate(
+        distance=distance_km(latitude, longitude)
+    ).filter(distance__lte=radius_km)
+
+
+def parse_point(value):
+    """'lat,lng' -> (lat, lng); raises ValueError."""
+    latitude, longitude = (float(part) for part in value.split(','))
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError(value)
+    return latitude, longitude
+
+
+def parse_bbox(value):
+    """'west,south,east,north' (GeoJSON order) -> (south, west, north, east); raises ValueError."""
+    west, south, east, north = (float(part) for part in value.split(','))
+    if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError(value)
+    return south, west, north, east
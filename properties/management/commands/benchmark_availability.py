@@ -0,0 +1,110 @@
+"""
+Management command to benchmark availability search.
+"""
+import datetime
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from properties.availability import available
+from properties.models import Booking, Property
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill a throwaway dataset of properties with a year of back-to-back bookings, '
+        'then time ?check_in=&check_out= searches with the indexed query, the same '
+        'query without its index, and a Python scan over all bookings. All writes '
+        'are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--properties', type=int, default=10000, help='Properties (default 10000)')
+        parser.add_argument('--days', type=int, default=365, help='Days of bookings per property (default 365)')
+        parser.add_argument('--max-gap', type=int, default=4, help='Longest free gap between stays in nights (default 4)')
+        parser.add_argument('--queries', type=int, default=20, help='Random searches per mode (default 20)')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.start = datetime.date.today()
+        try:
+            with transaction.atomic():
+                results = self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run(self, options):
+        started = time.perf_counter()
+        self.populate(options['properties'], options['days'], options['max_gap'])
+        results = {
+            'vendor': connection.vendor,
+            'properties': options['properties'],
+            'bookings': Booking.objects.count(),
+            'populate_seconds': round(time.perf_counter() - started, 1),
+            'ms_per_search': {},
+        }
+        ranges = []
+        for _ in range(options['queries']):
+            check_in = self.start + datetime.timedelta(days=self.random.randrange(options['days']))
+            ranges.append((check_in, check_in + datetime.timedelta(days=self.random.randint(1, 14))))
+
+        results['plan'] = self.available_ids_query(*ranges[0]).explain()
+        results['ms_per_search']['indexed'] = self.time_searches(ranges, self.search_sql)
+        if connection.vendor == 'sqlite':
+            # DDL is transactional here, so the rollback restores the index.
+            with connection.cursor() as cursor:
+                cursor.execute('DROP INDEX booking_active_range_idx')
+            results['ms_per_search']['unindexed'] = self.time_searches(ranges, self.search_sql)
+        results['ms_per_search']['python_scan'] = self.time_searches(ranges, self.search_python)
+        return results
+
+    def populate(self, count, days, max_gap):
+        Property.objects.bulk_create([
+            Property(
+                name=f'Benchmark {i}', slug=f'benchmark-availability-{i}', location='-',
+                description='-', price_per_night=100, max_guests=4,
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        end = self.start + datetime.timedelta(days=days)
+        batch = []
+        for property_id in Property.objects.filter(slug__startswith='benchmark-availability-').values_list('pk', flat=True):
+            day = self.start + datetime.timedelta(days=self.random.randint(0, max_gap))
+            while day < end:
+                check_out = day + datetime.timedelta(days=self.random.randint(2, 7))
+                batch.append(Booking(property_id=property_id, check_in=day, check_out=check_out))
+                day = check_out + datetime.timedelta(days=self.random.randint(0, max_gap))
+            if len(batch) >= 5000:
+                Booking.objects.bulk_create(batch)
+                batch = []
+        Booking.objects.bulk_create(batch)
+
+    def available_ids_query(self, check_in, check_out):
+        return available(Property.objects.filter(is_active=True), check_in, check_out).values_list('pk', flat=True)
+
+    def search_sql(self, check_in, check_out):
+        return set(self.available_ids_query(check_in, check_out))
+
+    def search_python(self, check_in, check_out):
+        taken = {
+            property_id
+            for property_id, start, end in Booking.objects.filter(status=Booking.CONFIRMED)
+            .values_list('property_id', 'check_in', 'check_out').iterator(chunk_size=5000)
+            if start < check_out and end > check_in
+        }
+        return set(Property.objects.filter(is_active=True).values_list('pk', flat=True)) - taken
+
+    def time_searches(self, ranges, search):
+        started = time.perf_counter()
+        for check_in, check_out in ranges:
+            search(check_in, check_out)
+        return round((time.perf_counter() - started) * 1000 / len(ranges), 2)
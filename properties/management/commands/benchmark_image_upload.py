@@ -0,0 +1,98 @@
+"""
+Management command to benchmark batch image upload processing.
+"""
+import json
+import shutil
+import tempfile
+import time
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from PIL import Image
+from properties.models import Property, PropertyImage
+from properties.uploads import create_images, store_uploads
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare wall time of the serial per-image upload path with the parallel '
+        'pipeline used by AdminPropertyImageUploadView. Runs in a throwaway '
+        'MEDIA_ROOT and rolls back all database writes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--images', type=int, default=20, help='Images per batch (default 20)')
+        parser.add_argument('--size', default='3000x2000', help='Source image size WxH (default 3000x2000)')
+        parser.add_argument('--workers', default='1,2,4,8', help='Comma-separated worker counts to try')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per mode; the best is reported')
+
+    def handle(self, *args, **options):
+        width, height = (int(v) for v in options['size'].lower().split('x'))
+        payloads = [self.make_jpeg(width, height, seed) for seed in range(options['images'])]
+        results = {'images': options['images'], 'size': options['size'], 'seconds': {}}
+
+        media_root = tempfile.mkdtemp(prefix='nura-bench-media-')
+        try:
+            with override_settings(MEDIA_ROOT=media_root):
+                results['seconds']['serial'] = self.best_of(options['repeat'], self.run_serial, payloads)
+                for workers in (int(w) for w in options['workers'].split(',')):
+                    results['seconds'][f'parallel_{workers}'] = self.best_of(
+                        options['repeat'], self.run_parallel, payloads, workers
+                    )
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        serial = results['seconds']['serial']
+        results['speedup'] = {
+            mode: round(serial / seconds, 2) for mode, seconds in results['seconds'].items()
+        }
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def make_jpeg(self, width, height, seed):
+        # A gradient with some noise so the encoder has real work to do.
+        image = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+        noise = Image.effect_noise((width, height), 40 + seed).convert('RGB')
+        buffer = BytesIO()
+        Image.blend(image, noise, 0.3).save(buffer, format='JPEG', quality=90)
+        return buffer.getvalue()
+
+    def uploads(self, payloads):
+        return [
+            SimpleUploadedFile(f'bench-{i}.jpg', data, content_type='image/jpeg')
+            for i, data in enumerate(payloads)
+        ]
+
+    def best_of(self, repeat, func, *args):
+        timings = []
+        for _ in range(repeat):
+            try:
+                with transaction.atomic():
+                    prop = Property.objects.create(
+                        name='Benchmark Property', location='-', description='-', price_per_night=1
+                    )
+                    uploads = self.uploads(args[0])
+                    start = time.perf_counter()
+                    func(prop, uploads, *args[1:])
+                    timings.append(time.perf_counter() - start)
+                    raise Rollback
+            except Rollback:
+                pass
+        return round(min(timings), 3)
+
+    def run_serial(self, prop, uploads):
+        # One create (and one synchronous variant build) per image.
+        for i, upload in enumerate(uploads):
+            PropertyImage.objects.create(property=prop, image=upload, order_index=i)
+
+    def run_parallel(self, prop, uploads, workers):
+        stored, errors = store_uploads(uploads, workers=workers)
+        if errors:
+            raise RuntimeError(errors)
+        create_images(prop, stored)
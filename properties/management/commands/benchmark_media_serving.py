@@ -0,0 +1,121 @@
+"""
+Management command to benchmark media serving worker occupancy.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+from io import BytesIO
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from django.views.static import serve as legacy_serve
+from PIL import Image
+
+from nura_stays.images import build_variants
+from nura_stays.media import serve_media
+
+
+class Command(BaseCommand):
+    help = (
+        'Estimate how long a gunicorn sync worker is occupied while a browser '
+        'loads an image-heavy listing page, for the old static() view and for '
+        'nura_stays.media.serve_media with each MEDIA_SERVE_BACKEND. Occupancy '
+        'is the measured view time plus the time to push every body byte the '
+        'worker sends itself to a client at --bandwidth.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--images', type=int, default=24, help='Images on the page (default 24)')
+        parser.add_argument('--size', default='2000x1500', help='Source image size WxH (default 2000x1500)')
+        parser.add_argument('--width', type=int, default=640, help='Variant width the page loads (default 640)')
+        parser.add_argument('--bandwidth', type=float, default=10.0, help='Client bandwidth in Mbit/s (default 10)')
+        parser.add_argument('--repeat', type=int, default=5, help='Page loads per mode; the best is reported')
+
+    def handle(self, *args, **options):
+        width, height = (int(v) for v in options['size'].lower().split('x'))
+        options['width'] = min(options['width'], width)  # variants never upscale
+        self.bytes_per_ms = options['bandwidth'] * 1_000_000 / 8 / 1000
+        self.factory = RequestFactory()
+        media_root = tempfile.mkdtemp(prefix='nura-bench-media-')
+        try:
+            with override_settings(
+                MEDIA_ROOT=media_root, IMAGE_VARIANT_WIDTHS=[options['width']], IMAGE_VARIANT_FORMATS=['webp'],
+            ):
+                paths = self.make_page(media_root, options['images'], width, height, options['width'])
+                results = {
+                    'images': len(paths),
+                    'page_bytes': sum(os.path.getsize(os.path.join(media_root, p)) for p in paths),
+                    'bandwidth_mbit': options['bandwidth'],
+                    'modes': {},
+                }
+                modes = {
+                    'static_serve': (lambda request, path: legacy_serve(request, path, document_root=media_root), {}),
+                    'django': (serve_media, {'MEDIA_SERVE_BACKEND': 'django'}),
+                    'nginx': (serve_media, {'MEDIA_SERVE_BACKEND': 'nginx'}),
+                }
+                for mode, (view, overrides) in modes.items():
+                    with override_settings(**overrides):
+                        results['modes'][mode] = {
+                            'first_visit': self.best_of(options['repeat'], view, paths, None),
+                            'repeat_visit': self.best_of(options['repeat'], view, paths, self.validators(view, paths)),
+                        }
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def make_page(self, media_root, count, width, height, variant_width):
+        storage = FileSystemStorage(location=media_root)
+        paths = []
+        for i in range(count):
+            buffer = BytesIO()
+            noise = Image.effect_noise((width, height), 40 + i).convert('RGB')
+            noise.save(buffer, format='JPEG', quality=90)
+            name = storage.save(f'properties/bench-{i}.jpg', BytesIO(buffer.getvalue()))
+            variants = build_variants(name, storage, buffer)
+            paths.append(variants['formats']['webp'][str(variant_width)])
+        return paths
+
+    def validators(self, view, paths):
+        """What the browser holds after the first visit, keyed by path."""
+        held = {}
+        for path in paths:
+            response = view(self.factory.get('/media/' + path), path)
+            cache_control = response.get('Cache-Control', '')
+            held[path] = {
+                # A fresh immutable entry is reused without any request.
+                'fresh': 'immutable' in cache_control,
+                'HTTP_IF_NONE_MATCH': response.get('ETag'),
+                'HTTP_IF_MODIFIED_SINCE': response.get('Last-Modified'),
+            }
+            response.close()
+        return held
+
+    def best_of(self, repeat, view, paths, held):
+        return min((self.load_page(view, paths, held) for _ in range(repeat)), key=lambda r: r['occupancy_ms'])
+
+    def load_page(self, view, paths, held):
+        requests = view_ms = body_bytes = 0
+        for path in paths:
+            headers = {}
+            if held is not None:
+                if held[path]['fresh']:
+                    continue
+                headers = {k: v for k, v in held[path].items() if k.startswith('HTTP_') and v}
+            request = self.factory.get('/media/' + path, **headers)
+            start = time.perf_counter()
+            response = view(request, path)
+            view_ms += (time.perf_counter() - start) * 1000
+            requests += 1
+            handed_off = response.has_header('X-Accel-Redirect') or response.has_header('X-Sendfile')
+            if response.status_code in (200, 206) and not handed_off:
+                body_bytes += int(response.get('Content-Length') or 0)
+            response.close()
+        return {
+            'requests': requests,
+            'view_ms': round(view_ms, 2),
+            'worker_bytes': body_bytes,
+            'occupancy_ms': round(view_ms + body_bytes / self.bytes_per_ms, 2),
+        }
@@ -0,0 +1,40 @@
+"""
+Management command to backfill responsive variants for existing images.
+"""
+from django.core.management.base import BaseCommand
+from nura_stays.cache import bump_version
+from nura_stays.images import delete_variants, generate_variants, needs_variants
+from properties.models import PropertyImage
+from team.models import TeamMember
+
+
+class Command(BaseCommand):
+    help = 'Generate resized WebP/AVIF variants for property images and team photos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Regenerate variants even if they are up to date (e.g. after changing widths)',
+        )
+
+    def handle(self, *args, **options):
+        force = options['force']
+        targets = [
+            (PropertyImage, 'image', 'variants'),
+            (TeamMember, 'photo', 'photo_variants'),
+        ]
+        for model, file_field, variants_field in targets:
+            done = 0
+            for obj in model.objects.exclude(**{file_field: ''}).exclude(**{f'{file_field}__isnull': True}).iterator(chunk_size=200):
+                field_file = getattr(obj, file_field)
+                variants = getattr(obj, variants_field)
+                if not force and not needs_variants(field_file, variants):
+                    continue
+                if force:
+                    delete_variants(variants, field_file.storage)
+                model.objects.filter(pk=obj.pk).update(**{variants_field: generate_variants(field_file)})
+                done += 1
+            if done:
+                bump_version(model)
+            self.stdout.write(f'  {model._meta.verbose_name_plural}: {done} updated')
+        self.stdout.write(self.style.SUCCESS('Image variants generated.'))
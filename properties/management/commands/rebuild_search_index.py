@@ -0,0 +1,17 @@
+"""
+Management command to rebuild the property full-text search index.
+"""
+from django.core.management.base import BaseCommand
+from properties.search import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the property full-text search index (needed after bulk writes on SQLite)'
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if backend is None:
+            self.stdout.write(self.style.WARNING('No full-text backend for this database; nothing to do.'))
+            return
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
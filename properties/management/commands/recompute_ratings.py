@@ -0,0 +1,29 @@
+"""
+Management command to rebuild the denormalized rating aggregates on Property.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from properties.models import Property
+from reviews.models import ReviewStats
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute rating_sum, rating_count and average_rating for every property '
+        'and rebuild the ReviewStats rollup'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report drifted properties without writing changes',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = Property.rebuild_ratings(dry_run=options['dry_run'])
+            if not options['dry_run']:
+                ReviewStats.rebuild()
+
+        verb = 'Found' if options['dry_run'] else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {drifted} drifted properties.'))
@@ -1,17 +1,36 @@
 """
 Management command to seed the database with sample data.
 """
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
+from nura_stays import synthetic
 from properties.models import Property
 from reviews.models import Review
 from team.models import TeamMember
 
 
 class Command(BaseCommand):
-    help = 'Seed the database with sample data for development'
+    help = (
+        'Seed the database with sample data for development. With --properties '
+        'and/or --leads, generate that much deterministic synthetic data instead.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--properties', type=int, help='Synthetic properties to generate')
+        parser.add_argument('--reviews-per-property', type=int, default=10, help='Reviews per property (default 10)')
+        parser.add_argument('--images-per-property', type=int, default=3, help='Images per property (default 3)')
+        parser.add_argument('--leads', type=int, help='Synthetic contact submissions to generate')
+        parser.add_argument('--seed', type=int, default=1, help='Same seed, same data (default 1)')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Processes writing reviews and leads (PostgreSQL; default 1)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per INSERT (default 2000)')
 
     def handle(self, *args, **options):
+        if options['properties'] is not None or options['leads'] is not None:
+            return self.generate(options)
+
         self.stdout.write('Seeding database...')
 
         # Create admin user
@@ -183,3 +202,34 @@ class Command(BaseCommand):
                 self.stdout.write(f"  Created team member: {member_data['name']}")
 
         self.stdout.write(self.style.SUCCESS('Database seeded successfully!'))
+
+    def generate(self, options):
+        counts = [options[name] or 0 for name in (
+            'properties', 'reviews_per_property', 'images_per_property', 'leads', 'batch_size',
+        )]
+        if min(counts) < 0 or options['workers'] < 1 or not options['batch_size']:
+            raise CommandError('Counts must not be negative; --workers and --batch-size must be positive.')
+        started = time.perf_counter()
+        last = {}
+
+        def progress(kind, done, total):
+            # About every tenth of each kind, and when it completes.
+            if done == total or done - last.get(kind, 0) >= max(total // 10, 1):
+                last[kind] = done
+                self.stdout.write(f'  {kind}: {done}/{total} ({time.perf_counter() - started:.1f}s)')
+
+        summary = synthetic.generate(
+            properties=options['properties'] or 0,
+            reviews_per_property=options['reviews_per_property'],
+            images_per_property=options['images_per_property'],
+            leads=options['leads'] or 0,
+            seed=options['seed'],
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {summary['properties']} properties, {summary['images']} images, "
+            f"{summary['reviews']} reviews and {summary['leads']} leads in {summary['seconds']}s "
+            f"(seed {summary['seed']}, {summary['workers']} worker(s))."
+        ))
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:45
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_ratings(apps, schema_editor):
+    Property = apps.get_model('properties', 'Property')
+    Review = apps.get_model('reviews', 'Review')
+    totals = Review.objects.filter(
+        is_approved=True, property__isnull=False
+    ).values('property_id').annotate(total=Sum('rating'), count=Count('id'))
+    for row in totals:
+        Property.objects.filter(pk=row['property_id']).update(
+            rating_sum=row['total'],
+            rating_count=row['count'],
+            average_rating=row['total'] / row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0001_initial'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='average_rating',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
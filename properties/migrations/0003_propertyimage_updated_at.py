@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0002_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='propertyimage',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:10
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from properties.search import get_backend
+    backend = get_backend(schema_editor.connection)
+    if backend:
+        backend.create(schema_editor)
+
+
+def drop_search_index(apps, schema_editor):
+    from properties.search import get_backend
+    backend = get_backend(schema_editor.connection)
+    if backend:
+        backend.drop(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0003_propertyimage_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0004_property_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['is_active', 'created_at', 'id'], name='property_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['is_active', 'price_per_night', 'id'], name='property_active_price_idx'),
+        ),
+    ]
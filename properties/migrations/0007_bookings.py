@@ -0,0 +1,47 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_overlap_guard(apps, schema_editor):
+    from properties.availability import get_backend
+    get_backend(schema_editor.connection).create(schema_editor)
+
+
+def drop_overlap_guard(apps, schema_editor):
+    from properties.availability import get_backend
+    get_backend(schema_editor.connection).drop(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0006_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Booking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('booking', 'Booking'), ('block', 'Block')], default='booking', max_length=10)),
+                ('status', models.CharField(choices=[('confirmed', 'Confirmed'), ('cancelled', 'Cancelled')], default='confirmed', max_length=10)),
+                ('check_in', models.DateField()),
+                ('check_out', models.DateField()),
+                ('guests', models.PositiveIntegerField(default=1)),
+                ('guest_name', models.CharField(blank=True, max_length=255)),
+                ('guest_email', models.EmailField(blank=True, max_length=254)),
+                ('note', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='properties.property')),
+            ],
+            options={
+                'ordering': ['check_in'],
+                'indexes': [models.Index(condition=models.Q(('status', 'confirmed')), fields=['property', 'check_in', 'check_out'], name='booking_active_range_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(('check_out__gt', models.F('check_in'))), name='booking_valid_range')],
+            },
+        ),
+        migrations.RunPython(create_overlap_guard, drop_overlap_guard),
+    ]
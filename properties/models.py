@@ -1,10 +1,30 @@
 """
 Property models for Nura Stays.
 """
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Case, F, When
+from django.db.models.functions import Cast, RowNumber
+from django.db.models.lookups import GreaterThan
 from django.utils.text import slugify
 import uuid
 
+from . import geo
+
+# Which image represents a property in lists.
+PRIMARY_IMAGE_ORDER = ['-is_primary', 'order_index', 'created_at']
+
+
+class PropertyQuerySet(models.QuerySet):
+
+    def with_primary_image(self):
+        """Prefetch each property's primary image in a single query."""
+        return self.prefetch_related(models.Prefetch(
+            'images',
+            queryset=PropertyImage.objects.order_by(*PRIMARY_IMAGE_ORDER)[:1],
+            to_attr='primary_images',
+        ))
+
 
 class Property(models.Model):
     """Short-term rental property listing."""
@@ -28,17 +48,38 @@ class Property(models.Model):
     bathrooms = models.PositiveIntegerField(default=1)
     max_guests = models.PositiveIntegerField(default=2)
     property_type = models.CharField(max_length=50, choices=PROPERTY_TYPES, default='apartment')
+    latitude = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    longitude = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    # Geohash of (latitude, longitude) for indexed area searches; see properties.geo.
+    geohash = models.CharField(max_length=12, blank=True, default='', editable=False)
     amenities = models.JSONField(default=list, blank=True)
     house_rules = models.TextField(blank=True)
     cancellation_policy = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     is_featured = models.BooleanField(default=False)
+    # Denormalized rating aggregates over approved reviews. Maintained by
+    # reviews.signals; repair with `manage.py recompute_ratings`.
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    average_rating = models.FloatField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PropertyQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = 'properties'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination: (ordering field, id) under the is_active filter.
+            models.Index(fields=['is_active', 'created_at', 'id'], name='property_active_created_idx'),
+            models.Index(fields=['is_active', 'price_per_night', 'id'], name='property_active_price_idx'),
+            models.Index(fields=['geohash'], name='property_geohash_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -52,25 +93,113 @@ class Property(models.Model):
                 slug = f"{base_slug}-{counter}"
                 counter += 1
             self.slug = slug
+        has_point = self.latitude is not None and self.longitude is not None
+        self.geohash = geo.encode(self.latitude, self.longitude) if has_point else ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geohash'}
         super().save(*args, **kwargs)
 
+    @classmethod
+    def allocate_slugs(cls, names, reserved=(), chunk_size=200):
+        """
+        Unique slugs for ``names``, in order: ``base``, then ``base-1``,
+        ``base-2``... Existing slugs are fetched once per chunk of distinct
+        bases, so allocating a batch costs a few queries instead of one per
+        collision. ``reserved`` slugs are avoided too.
+        """
+        bases = [slugify(name) or 'property' for name in names]
+        distinct = sorted(set(bases))
+        taken = set(reserved)
+        for start in range(0, len(distinct), chunk_size):
+            query = models.Q()
+            for base in distinct[start:start + chunk_size]:
+                # Not a range on base: locale collations ignore the '-'.
+                query |= models.Q(slug=base) | models.Q(slug__startswith=f'{base}-')
+            taken.update(cls.objects.filter(query).values_list('slug', flat=True))
+
+        counters = {}
+        slugs = []
+        for base in bases:
+            counter = counters.get(base, 0)
+            slug = f'{base}-{counter}' if counter else base
+            while slug in taken:
+                counter += 1
+                slug = f'{base}-{counter}'
+            counters[base] = counter + 1
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
+
     @property
     def primary_image(self):
+        if hasattr(self, 'primary_images'):
+            return self.primary_images[0] if self.primary_images else None
         img = self.images.filter(is_primary=True).first()
         if not img:
             img = self.images.first()
         return img
 
     def get_average_rating(self):
-        from reviews.models import Review
-        avg = Review.objects.filter(
-            property=self, is_approved=True
-        ).aggregate(models.Avg('rating'))['rating__avg']
-        return round(avg, 1) if avg else None
+        return round(self.average_rating, 1) if self.average_rating else None
 
     def get_review_count(self):
+        return self.rating_count
+
+    @classmethod
+    def rebuild_ratings(cls, property_ids=None, dry_run=False, chunk_size=500):
+        """
+        Recompute the stored rating aggregates from approved reviews for
+        ``property_ids`` (default: every property). Returns how many drifted.
+        """
         from reviews.models import Review
-        return Review.objects.filter(property=self, is_approved=True).count()
+        if property_ids is None:
+            chunks = [None]
+        else:
+            property_ids = list(property_ids)
+            chunks = [property_ids[i:i + chunk_size] for i in range(0, len(property_ids), chunk_size)]
+
+        drifted = 0
+        for chunk in chunks:
+            reviews = Review.objects.filter(is_approved=True, property__isnull=False)
+            props = cls.objects.only('id', 'rating_sum', 'rating_count', 'average_rating')
+            if chunk is not None:
+                reviews = reviews.filter(property_id__in=chunk)
+                props = props.filter(pk__in=chunk)
+            totals = {
+                row['property_id']: (row['total'], row['count'])
+                for row in reviews.values('property_id').annotate(
+                    total=models.Sum('rating'), count=models.Count('id')
+                )
+            }
+            changed = []
+            for prop in props.iterator(chunk_size=2000):
+                rating_sum, rating_count = totals.get(prop.pk, (0, 0))
+                average = rating_sum / rating_count if rating_count else None
+                if (prop.rating_sum, prop.rating_count, prop.average_rating) != (rating_sum, rating_count, average):
+                    prop.rating_sum, prop.rating_count, prop.average_rating = rating_sum, rating_count, average
+                    changed.append(prop)
+            drifted += len(changed)
+            if changed and not dry_run:
+                cls.objects.bulk_update(changed, ['rating_sum', 'rating_count', 'average_rating'], batch_size=500)
+        return drifted
+
+    @classmethod
+    def apply_rating_delta(cls, property_id, sum_delta, count_delta):
+        """Atomically shift the stored rating aggregates of one property."""
+        if not property_id or (not sum_delta and not count_delta):
+            return
+        new_sum = F('rating_sum') + sum_delta
+        new_count = F('rating_count') + count_delta
+        cls.objects.filter(pk=property_id).update(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            average_rating=Case(
+                When(GreaterThan(new_count, 0), then=Cast(new_sum, models.FloatField()) / new_count),
+                default=None,
+                output_field=models.FloatField(),
+            ),
+        )
 
 
 class PropertyImage(models.Model):
@@ -80,12 +209,79 @@ class PropertyImage(models.Model):
         Property, on_delete=models.CASCADE, related_name='images'
     )
     image = models.ImageField(upload_to='properties/')
+    # Resized WebP/AVIF renditions; see nura_stays.images.
+    variants = models.JSONField(default=dict, blank=True, editable=False)
     is_primary = models.BooleanField(default=False)
     order_index = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order_index', 'created_at']
 
     def __str__(self):
         return f"Image for {self.property.name} (#{self.order_index})"
+
+    @classmethod
+    def _primary_rows(cls, property_ids):
+        return cls.objects.filter(property_id__in=property_ids).order_by().annotate(
+            position=models.Window(RowNumber(), partition_by=F('property_id'), order_by=PRIMARY_IMAGE_ORDER),
+        ).filter(position=1).values('property_id', 'image', 'variants')
+
+    @classmethod
+    def primary_for(cls, property_ids):
+        """{property_id: {'image': name, 'variants': {...}}} of each primary image, in one query."""
+        return {row['property_id']: row for row in cls._primary_rows(property_ids)}
+
+    @classmethod
+    async def aprimary_for(cls, property_ids):
+        return {row['property_id']: row async for row in cls._primary_rows(property_ids)}
+
+
+class Booking(models.Model):
+    """
+    A date range during which a property is unavailable: a guest booking or
+    an owner block. ``check_out`` is exclusive, so back-to-back stays do not
+    overlap. Overlapping confirmed rows are rejected by the database (see
+    properties.availability).
+    """
+
+    BOOKING = 'booking'
+    BLOCK = 'block'
+    KIND_CHOICES = [(BOOKING, 'Booking'), (BLOCK, 'Block')]
+
+    CONFIRMED = 'confirmed'
+    CANCELLED = 'cancelled'
+    STATUS_CHOICES = [(CONFIRMED, 'Confirmed'), (CANCELLED, 'Cancelled')]
+
+    property = models.ForeignKey(
+        Property, on_delete=models.CASCADE, related_name='bookings'
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default=BOOKING)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=CONFIRMED)
+    check_in = models.DateField()
+    check_out = models.DateField()
+    guests = models.PositiveIntegerField(default=1)
+    guest_name = models.CharField(max_length=255, blank=True)
+    guest_email = models.EmailField(blank=True)
+    note = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['check_in']
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(check_out__gt=F('check_in')), name='booking_valid_range',
+            ),
+        ]
+        indexes = [
+            # Overlap probe: property_id = ? AND check_in < ? AND check_out > ?
+            models.Index(
+                fields=['property', 'check_in', 'check_out'], name='booking_active_range_idx',
+                condition=models.Q(status='confirmed'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for {self.property.name}: {self.check_in} to {self.check_out}"
@@ -0,0 +1,184 @@
+"""
+Full-text search for properties.
+
+SQLite uses an FTS5 virtual table keyed by property id and kept in sync from
+Property post_save/post_delete. PostgreSQL uses a generated, weighted
+``search_vector`` tsvector column with a GIN index, which the database keeps
+in sync itself. Both rank name > location > short_description > description,
+match word prefixes and return a highlighted snippet. On any other database
+``get_backend()`` returns None and callers fall back to ``icontains``.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, TextField
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+FTS_TABLE = 'properties_property_fts'
+INDEXED_FIELDS = ('name', 'location', 'short_description', 'description')
+
+# Markers wrapped around matches in SQL, swapped for <mark> after escaping.
+_START, _STOP = '\x02', '\x03'
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def highlight(snippet):
+    """HTML-escape a raw snippet and turn match markers into <mark> tags."""
+    if not snippet:
+        return None
+    return escape(snippet).replace(_START, '<mark>').replace(_STOP, '</mark>')
+
+
+class SQLiteSearchBackend:
+    """FTS5 backend: bm25 ranking with per-column weights."""
+
+    def create(self, schema_editor):
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{', '.join(INDEXED_FIELDS)}, tokenize='porter unicode61', prefix='2 3')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(INDEXED_FIELDS)}) "
+            f"SELECT id, {', '.join(INDEXED_FIELDS)} FROM properties_property"
+        )
+
+    def drop(self, schema_editor):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+    def index(self, prop):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [prop.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(INDEXED_FIELDS)}) "
+                f"VALUES (%s, %s, %s, %s, %s)",
+                [prop.pk] + [getattr(prop, field) or '' for field in INDEXED_FIELDS],
+            )
+
+    def remove(self, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+    def index_many(self, pks, chunk_size=500):
+        """Re-index the given properties with two statements per chunk (bulk writes)."""
+        pks = list(pks)
+        with connection.cursor() as cursor:
+            for start in range(0, len(pks), chunk_size):
+                chunk = pks[start:start + chunk_size]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', chunk)
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(INDEXED_FIELDS)}) "
+                    f"SELECT id, {', '.join(INDEXED_FIELDS)} FROM properties_property "
+                    f"WHERE id IN ({placeholders})",
+                    chunk,
+                )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(INDEXED_FIELDS)}) "
+                f"SELECT id, {', '.join(INDEXED_FIELDS)} FROM properties_property"
+            )
+
+    def build_query(self, words):
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def apply(self, queryset, query):
+        table = queryset.model._meta.db_table
+        match = f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+        correlated = f'{match} AND {FTS_TABLE}.rowid = {table}.id'
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid {match}', [query])
+        ).annotate(
+            # bm25() is lower-is-better; negate so higher ranks sort first.
+            search_rank=RawSQL(
+                f'(SELECT -bm25({FTS_TABLE}, 10.0, 5.0, 2.0, 1.0) {correlated})',
+                [query], output_field=FloatField(),
+            ),
+            search_snippet=RawSQL(
+                f"(SELECT snippet({FTS_TABLE}, -1, char(2), char(3), '…', 16) {correlated})",
+                [query], output_field=TextField(),
+            ),
+        )
+
+
+class PostgreSQLSearchBackend:
+    """tsvector backend: setweight A-D per column, GIN-indexed."""
+
+    def create(self, schema_editor):
+        vector = ' || '.join(
+            f"setweight(to_tsvector('english', coalesce({field}, '')), '{weight}')"
+            for field, weight in zip(INDEXED_FIELDS, 'ABCD')
+        )
+        schema_editor.execute(
+            'ALTER TABLE properties_property ADD COLUMN IF NOT EXISTS search_vector tsvector '
+            f'GENERATED ALWAYS AS ({vector}) STORED'
+        )
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS properties_property_search_vector_idx '
+            'ON properties_property USING GIN (search_vector)'
+        )
+
+    def drop(self, schema_editor):
+        schema_editor.execute('DROP INDEX IF EXISTS properties_property_search_vector_idx')
+        schema_editor.execute('ALTER TABLE properties_property DROP COLUMN IF EXISTS search_vector')
+
+    def index(self, prop):
+        pass  # generated column
+
+    def remove(self, pk):
+        pass
+
+    def index_many(self, pks):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def build_query(self, words):
+        return ' & '.join(f'{word}:*' for word in words)
+
+    def apply(self, queryset, query):
+        table = queryset.model._meta.db_table
+        tsquery = "to_tsquery('english', %s)"
+        document = f"concat_ws(' ', {table}.short_description, {table}.description)"
+        return queryset.filter(
+            RawSQL(f'{table}.search_vector @@ {tsquery}', [query], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(
+                f'ts_rank({table}.search_vector, {tsquery})', [query], output_field=FloatField(),
+            ),
+            search_snippet=RawSQL(
+                f"ts_headline('english', {document}, {tsquery}, "
+                f"'StartSel=' || chr(2) || ', StopSel=' || chr(3) || ', MaxWords=16, MinWords=8')",
+                [query], output_field=TextField(),
+            ),
+        )
+
+
+_BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgreSQLSearchBackend,
+}
+
+
+def get_backend(conn=None):
+    backend = _BACKENDS.get((conn or connection).vendor)
+    return backend() if backend else None
+
+
+def search(queryset, term):
+    """
+    Filter ``queryset`` to properties matching ``term`` and annotate
+    ``search_rank`` and ``search_snippet``. Returns None when the database has
+    no full-text backend.
+    """
+    backend = get_backend()
+    if backend is None:
+        return None
+    words = _WORD_RE.findall(term)
+    if not words:
+        return queryset
+    return backend.apply(queryset, backend.build_query(words))
@@ -2,17 +2,24 @@
 Serializers for Properties app.
 """
 from rest_framework import serializers
-from .models import Property, PropertyImage
+from .availability import overlapping
+from .models import Booking, Property, PropertyImage
+from .search import highlight
+from nura_stays.fastpath import file_url
+from nura_stays.fieldsets import SparseFieldsetSerializerMixin
+from nura_stays.images import variant_urls
 
 
-class PropertyImageSerializer(serializers.ModelSerializer):
+class PropertyImageSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for property images."""
     image_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = PropertyImage
-        fields = ['id', 'image', 'image_url', 'is_primary', 'order_index', 'created_at']
+        fields = ['id', 'image', 'image_url', 'srcset', 'is_primary', 'order_index', 'created_at']
         read_only_fields = ['id', 'created_at']
+        field_columns = {'image_url': ['image'], 'srcset': ['image', 'variants']}
 
     def get_image_url(self, obj):
         request = self.context.get('request')
@@ -22,12 +29,18 @@ class PropertyImageSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
 
+    def get_srcset(self, obj):
+        return variant_urls(obj.variants, obj.image.storage, self.context.get('request'))
 
-class PropertyListSerializer(serializers.ModelSerializer):
+
+class PropertyListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for property list view (lightweight)."""
     primary_image = serializers.SerializerMethodField()
+    primary_image_srcset = serializers.SerializerMethodField()
     average_rating = serializers.FloatField(read_only=True)
-    review_count = serializers.IntegerField(read_only=True)
+    review_count = serializers.IntegerField(source='rating_count', read_only=True)
+    search_snippet = serializers.SerializerMethodField()
+    distance_km = serializers.SerializerMethodField()
 
     class Meta:
         model = Property
@@ -35,13 +48,13 @@ class PropertyListSerializer(serializers.ModelSerializer):
             'id', 'name', 'slug', 'location', 'short_description',
             'price_per_night', 'bedrooms', 'bathrooms', 'max_guests',
             'property_type', 'amenities', 'is_featured', 'primary_image',
-            'average_rating', 'review_count', 'created_at',
+            'primary_image_srcset', 'average_rating', 'review_count',
+            'search_snippet', 'latitude', 'longitude', 'distance_km', 'created_at',
         ]
+        fast_annotations = ['search_snippet', 'distance']
 
     def get_primary_image(self, obj):
-        img = obj.images.filter(is_primary=True).first()
-        if not img:
-            img = obj.images.first()
+        img = obj.primary_image
         if img:
             request = self.context.get('request')
             if request:
@@ -49,12 +62,63 @@ class PropertyListSerializer(serializers.ModelSerializer):
             return img.image.url
         return None
 
+    def get_primary_image_srcset(self, obj):
+        img = obj.primary_image
+        if img:
+            return variant_urls(img.variants, img.image.storage, self.context.get('request'))
+        return None
+
+    def get_search_snippet(self, obj):
+        # Only present when the queryset was filtered with ?search=.
+        return highlight(getattr(obj, 'search_snippet', None))
+
+    def get_distance_km(self, obj):
+        # Only present when the queryset was filtered with ?near=.
+        distance = getattr(obj, 'distance', None)
+        return round(distance, 2) if distance is not None else None
+
+    # Fast path (nura_stays.fastpath): the same fields from .values() rows.
+
+    def wants_primary_image(self):
+        return bool({'primary_image', 'primary_image_srcset'} & set(self.fields))
+
+    def prepare_fast_rows(self, rows):
+        if self.wants_primary_image():
+            images = PropertyImage.primary_for([row['pk'] for row in rows])
+            for row in rows:
+                row['primary_image'] = images.get(row['pk'])
+
+    async def aprepare_fast_rows(self, rows):
+        if self.wants_primary_image():
+            images = await PropertyImage.aprimary_for([row['pk'] for row in rows])
+            for row in rows:
+                row['primary_image'] = images.get(row['pk'])
+
+    def fast_primary_image(self, row):
+        image = row['primary_image']
+        if image:
+            return file_url(PropertyImage.image.field.storage, image['image'], self.context.get('request'))
+        return None
+
+    def fast_primary_image_srcset(self, row):
+        image = row['primary_image']
+        if image:
+            return variant_urls(image['variants'], PropertyImage.image.field.storage, self.context.get('request'))
+        return None
 
-class PropertyDetailSerializer(serializers.ModelSerializer):
+    def fast_search_snippet(self, row):
+        return highlight(row.get('search_snippet'))
+
+    def fast_distance_km(self, row):
+        distance = row.get('distance')
+        return round(distance, 2) if distance is not None else None
+
+
+class PropertyDetailSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for property detail view (full)."""
     images = PropertyImageSerializer(many=True, read_only=True)
     average_rating = serializers.FloatField(read_only=True)
-    review_count = serializers.IntegerField(read_only=True)
+    review_count = serializers.IntegerField(source='rating_count', read_only=True)
 
     class Meta:
         model = Property
@@ -62,8 +126,8 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
             'id', 'name', 'slug', 'location', 'description', 'short_description',
             'price_per_night', 'bedrooms', 'bathrooms', 'max_guests',
             'property_type', 'amenities', 'house_rules', 'cancellation_policy',
-            'is_active', 'is_featured', 'images', 'average_rating',
-            'review_count', 'created_at', 'updated_at',
+            'latitude', 'longitude', 'is_active', 'is_featured', 'images',
+            'average_rating', 'review_count', 'created_at', 'updated_at',
         ]
 
 
@@ -74,4 +138,43 @@ class PropertyAdminSerializer(serializers.ModelSerializer):
     class Meta:
         model = Property
         fields = '__all__'
-        read_only_fields = ['id', 'slug', 'created_at', 'updated_at']
+        read_only_fields = [
+            'id', 'slug', 'rating_sum', 'rating_count', 'average_rating',
+            'created_at', 'updated_at',
+        ]
+
+    def validate(self, attrs):
+        instance = self.instance
+        latitude = attrs.get('latitude', getattr(instance, 'latitude', None))
+        longitude = attrs.get('longitude', getattr(instance, 'longitude', None))
+        if (latitude is None) != (longitude is None):
+            raise serializers.ValidationError('latitude and longitude must be set together.')
+        return attrs
+
+
+class BookingSerializer(serializers.ModelSerializer):
+    """Serializer for admin management of bookings and blocks."""
+
+    class Meta:
+        model = Booking
+        fields = [
+            'id', 'property', 'kind', 'status', 'check_in', 'check_out', 'guests',
+            'guest_name', 'guest_email', 'note', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['id', 'property', 'created_at', 'updated_at']
+
+    def validate(self, attrs):
+        instance = self.instance
+        check_in = attrs.get('check_in', getattr(instance, 'check_in', None))
+        check_out = attrs.get('check_out', getattr(instance, 'check_out', None))
+        status = attrs.get('status', getattr(instance, 'status', Booking.CONFIRMED))
+        if check_in and check_out and check_out <= check_in:
+            raise serializers.ValidationError({'check_out': 'Must be after check_in.'})
+        if status == Booking.CONFIRMED:
+            property_id = instance.property_id if instance else self.context['property'].pk
+            clashes = overlapping(Booking.objects.filter(property_id=property_id), check_in, check_out)
+            if instance:
+                clashes = clashes.exclude(pk=instance.pk)
+            if clashes.exists():
+                raise serializers.ValidationError('These dates overlap an existing booking or block.')
+        return attrs
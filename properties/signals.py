@@ -0,0 +1,58 @@
+"""
+Signal handlers that keep the property search index and image variants in sync.
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from nura_stays.cache import bump_version
+from nura_stays.images import delete_variants, generate_variants, needs_variants
+from .models import Property, PropertyImage
+from .search import get_backend
+
+
+@receiver(post_save, sender=Property)
+def index_property(sender, instance, raw=False, **kwargs):
+    backend = get_backend()
+    if backend and not raw:
+        backend.index(instance)
+
+
+@receiver(post_delete, sender=Property)
+def unindex_property(sender, instance, **kwargs):
+    backend = get_backend()
+    if backend:
+        backend.remove(instance.pk)
+
+
+def _current_source(instance):
+    return instance.image.name if instance.image else None
+
+
+@receiver(pre_save, sender=PropertyImage)
+def capture_stale_variants(sender, instance, raw=False, **kwargs):
+    variants = instance.variants
+    stale = not raw and variants and variants.get('source') != _current_source(instance)
+    instance._stale_variants = variants if stale else None
+
+
+@receiver(post_save, sender=PropertyImage)
+def build_image_variants(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    stale = getattr(instance, '_stale_variants', None)
+    if stale:
+        instance.variants = {}
+    if needs_variants(instance.image, instance.variants):
+        instance.variants = generate_variants(instance.image)
+    elif not stale:
+        return
+    PropertyImage.objects.filter(pk=instance.pk).update(variants=instance.variants)
+    if stale:
+        # Only once the row points at the new ones, which may share names.
+        delete_variants(stale, instance.image.storage, keep=instance.variants)
+    # The version bump from this save may already have been cached without variants.
+    bump_version(PropertyImage)
+
+
+@receiver(post_delete, sender=PropertyImage)
+def delete_image_variants(sender, instance, **kwargs):
+    delete_variants(instance.variants, instance.image.storage)
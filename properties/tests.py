@@ -1,3 +1,729 @@
-from django.test import TestCase
+import datetime
+import json
+import os
+import tempfile
+import time
+from io import BytesIO, StringIO
+from unittest import mock
+from urllib.parse import quote
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import parse_http_date
+from rest_framework.test import APITestCase
+
+from reviews.models import Review
+from PIL import Image
+
+from .models import Booking, Property, PropertyImage
+
+
+def make_image_file(name='photo.jpg', size=(800, 600)):
+    buffer = BytesIO()
+    exif = Image.Exif()
+    exif[0x010F] = 'TestCam'  # Make
+    Image.new('RGB', size, 'teal').save(buffer, format='JPEG', exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+def make_property(**kwargs):
+    data = {
+        'name': 'Test Flat',
+        'location': 'London',
+        'description': 'A test property.',
+        'price_per_night': 100,
+    }
+    data.update(kwargs)
+    return Property.objects.create(**data)
+
+
+class RatingAggregateTests(TestCase):
+    def setUp(self):
+        self.prop = make_property()
+        self.other = make_property(name='Other Flat')
+
+    def assertRating(self, prop, rating_sum, rating_count):
+        prop.refresh_from_db()
+        self.assertEqual(prop.rating_sum, rating_sum)
+        self.assertEqual(prop.rating_count, rating_count)
+        expected = rating_sum / rating_count if rating_count else None
+        self.assertEqual(prop.average_rating, expected)
+
+    def test_create_edit_and_delete(self):
+        review = Review.objects.create(property=self.prop, guest_name='A', rating=4, review_text='x')
+        Review.objects.create(property=self.prop, guest_name='B', rating=5, review_text='x')
+        self.assertRating(self.prop, 9, 2)
+
+        review.rating = 2
+        review.save()
+        self.assertRating(self.prop, 7, 2)
+
+        review.delete()
+        self.assertRating(self.prop, 5, 1)
+
+    def test_approval_toggle(self):
+        review = Review.objects.create(
+            property=self.prop, guest_name='A', rating=3, review_text='x', is_approved=False
+        )
+        self.assertRating(self.prop, 0, 0)
+        review.is_approved = True
+        review.save()
+        self.assertRating(self.prop, 3, 1)
+        review.is_approved = False
+        review.save()
+        self.assertRating(self.prop, 0, 0)
+
+    def test_move_and_orphan(self):
+        review = Review.objects.create(property=self.prop, guest_name='A', rating=4, review_text='x')
+        review.property = self.other
+        review.save()
+        self.assertRating(self.prop, 0, 0)
+        self.assertRating(self.other, 4, 1)
+
+        review.property = None
+        review.save()
+        self.assertRating(self.other, 0, 0)
+
+    def test_queryset_delete(self):
+        Review.objects.create(property=self.prop, guest_name='A', rating=4, review_text='x')
+        Review.objects.create(property=self.prop, guest_name='B', rating=2, review_text='x')
+        Review.objects.filter(rating=4).delete()
+        self.assertRating(self.prop, 2, 1)
+
+    def test_recompute_ratings_repairs_drift(self):
+        Review.objects.create(property=self.prop, guest_name='A', rating=4, review_text='x')
+        Review.objects.filter(property=self.prop).update(rating=1)
+        call_command('recompute_ratings', stdout=StringIO())
+        self.assertRating(self.prop, 1, 1)
+
+
+@override_settings(MEDIA_ROOT='/tmp/nura-stays-test-media', RESPONSE_CACHE_ENABLED=False)
+class PropertyListQueryTests(APITestCase):
+    def add_properties(self, count):
+        # Cache versions are bumped on commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(count):
+                prop = make_property(name=f'Flat {Property.objects.count()}', is_featured=True)
+                for j in range(3):
+                    PropertyImage.objects.create(
+                        property=prop,
+                        image=make_image_file(f'p{prop.pk}-{j}.jpg', size=(40, 30)),
+                        is_primary=(j == 2),
+                        order_index=j,
+                    )
+
+    def test_list_query_count_is_constant(self):
+        self.add_properties(2)
+        # validators, count, page, primary images
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('property-list'))
+        self.assertEqual(response.status_code, 200)
+
+        self.add_properties(10)
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('property-list'))
+        self.assertEqual(len(response.data['results']), 12)
+
+    def test_featured_query_count_is_constant(self):
+        self.add_properties(6)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('property-featured'))
+        self.assertEqual(len(response.data), 6)
+
+    def test_primary_image_prefers_flagged_image(self):
+        self.add_properties(1)
+        prop = Property.objects.get()
+        PropertyImage.objects.filter(property=prop, is_primary=True).update(is_primary=False)
+        response = self.client.get(reverse('property-list'))
+        first = prop.images.order_by('order_index').first()
+        self.assertTrue(response.data['results'][0]['primary_image'].endswith(first.image.url))
+
+        PropertyImage.objects.filter(pk=prop.images.last().pk).update(is_primary=True)
+        response = self.client.get(reverse('property-list'))
+        self.assertTrue(response.data['results'][0]['primary_image'].endswith(prop.images.last().image.url))
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.prop = make_property()
+
+    def test_hit_then_invalidated_by_save(self):
+        url = reverse('property-list')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.json()['results'][0]['name'], 'Test Flat')
+
+        self.prop.name = 'Renamed Flat'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.prop.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['name'], 'Renamed Flat')
+
+    def test_versions_are_bumped_on_commit(self):
+        url = reverse('property-list')
+        self.client.get(url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.prop.save()
+            # A reader must not cache uncommitted rows under a new version.
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+    def test_query_string_is_normalized(self):
+        url = reverse('property-list')
+        self.client.get(url + '?ordering=name&page=1')
+        self.assertEqual(self.client.get(url + '?page=1&ordering=name')['X-Cache'], 'HIT')
+
+    def test_review_change_invalidates_rating(self):
+        url = reverse('property-detail', args=[self.prop.slug])
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(property=self.prop, guest_name='A', rating=5, review_text='x')
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['review_count'], 1)
+
+
+@override_settings(MEDIA_ROOT='/tmp/nura-stays-test-media', RESPONSE_CACHE_ENABLED=True)
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.prop = make_property()
+
+    def test_if_none_match_returns_304_without_queries(self):
+        url = reverse('property-list')
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('must-revalidate', response['Cache-Control'])
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PropertyImage.objects.create(property=self.prop, image=make_image_file(size=(40, 30)))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_if_modified_since(self):
+        url = reverse('property-featured')
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_last_modified_follows_version_bumps(self):
+        from nura_stays.cache import bump_version
+        url = reverse('property-list')
+        first = self.client.get(url)
+        later = time.time_ns() + 5 * 10**9
+        # An .update() leaves updated_at alone; only the version records it.
+        with mock.patch('nura_stays.cache.time.time_ns', return_value=later), \
+                self.captureOnCommitCallbacks(execute=True):
+            Property.apply_rating_delta(self.prop.pk, 4, 1)
+            bump_version(Property)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        modified = response['Last-Modified']
+
+        # Deleting the newest row must not move Last-Modified backwards.
+        newer = make_property(name='Newer Flat')
+        with mock.patch('nura_stays.cache.time.time_ns', return_value=later + 5 * 10**9), \
+                self.captureOnCommitCallbacks(execute=True):
+            newer.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(parse_http_date(response['Last-Modified']), parse_http_date(modified))
+
+
+class PropertySearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.by_description = make_property(
+            name='Garden Flat', location='Leeds', description='Walk to the <b>riverside</b> market.'
+        )
+        self.by_name = make_property(name='Riverside Penthouse', location='London')
+        make_property(name='Seaside Cottage', location='Brighton')
+
+    def search(self, term, **params):
+        response = self.client.get(reverse('property-list'), {'search': term, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_ranks_name_above_description(self):
+        results = self.search('riverside')
+        self.assertEqual([r['id'] for r in results], [self.by_name.pk, self.by_description.pk])
+
+    def test_prefix_match_and_snippet(self):
+        results = self.search('river')
+        self.assertEqual(len(results), 2)
+        snippet = results[1]['search_snippet']
+        self.assertIn('<mark>riverside</mark>', snippet)
+        self.assertIn('&lt;b&gt;', snippet)
+
+    def test_index_follows_save_and_delete(self):
+        self.by_name.name = 'Harbour Penthouse'
+        self.by_name.save()
+        self.assertEqual([r['id'] for r in self.search('harbour')], [self.by_name.pk])
+        self.by_name.delete()
+        self.assertEqual(self.search('harbour'), [])
+
+    def test_explicit_ordering_wins(self):
+        results = self.search('riverside', ordering='name')
+        self.assertEqual([r['name'] for r in results], ['Garden Flat', 'Riverside Penthouse'])
+
+
+@override_settings(
+    MEDIA_ROOT='/tmp/nura-stays-test-media',
+    IMAGE_VARIANT_WIDTHS=[320, 640, 1600],
+    IMAGE_VARIANT_FORMATS=['webp'],
+)
+class ImageVariantTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.prop = make_property()
+
+    def test_variants_generated_on_upload(self):
+        image = PropertyImage.objects.create(property=self.prop, image=make_image_file())
+        formats = image.variants['formats']
+        # No upscaling: 1600 is capped at the 800px source width.
+        self.assertEqual(sorted(formats['webp'], key=int), ['320', '640', '800'])
+        storage = image.image.storage
+        with storage.open(formats['webp']['320']) as f, Image.open(f) as variant:
+            self.assertEqual(variant.format, 'WEBP')
+            self.assertEqual(variant.size, (320, 240))
+            self.assertFalse(variant.getexif())
+
+        response = self.client.get(reverse('property-list'))
+        srcset = response.data['results'][0]['primary_image_srcset']
+        self.assertTrue(srcset['webp']['640'].startswith('http://testserver/media/properties/variants/'))
+
+        image.delete()
+        self.assertFalse(storage.exists(formats['webp']['320']))
+
+    def test_replacing_the_file_deletes_old_variants(self):
+        image = PropertyImage.objects.create(property=self.prop, image=make_image_file())
+        old = image.variants['formats']['webp']['320']
+        image.image = make_image_file('other.jpg', size=(640, 480))
+        image.save()
+        image.refresh_from_db()
+        storage = image.image.storage
+        self.assertEqual(image.variants['source'], image.image.name)
+        self.assertTrue(storage.exists(image.variants['formats']['webp']['320']))
+        self.assertFalse(storage.exists(old))
+
+    def test_undecodable_file_is_not_retried(self):
+        bad = SimpleUploadedFile('bad.jpg', b'not an image', content_type='image/jpeg')
+        image = PropertyImage.objects.create(property=self.prop, image=bad)
+        image.refresh_from_db()
+        self.assertEqual(image.variants, {'source': image.image.name})
+        with mock.patch('properties.signals.generate_variants') as generate:
+            image.save()
+        generate.assert_not_called()
+
+    def test_backfill_command(self):
+        image = PropertyImage.objects.create(property=self.prop, image=make_image_file())
+        PropertyImage.objects.filter(pk=image.pk).update(variants={})
+        call_command('generate_image_variants', stdout=StringIO())
+        image.refresh_from_db()
+        self.assertIn('webp', image.variants['formats'])
+
+
+@override_settings(MEDIA_ROOT='/tmp/nura-stays-test-media', IMAGE_VARIANT_WIDTHS=[320])
+class ImageUploadTests(APITestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        self.client.force_authenticate(User.objects.create_user('admin', is_staff=True))
+        self.prop = make_property()
+        self.url = reverse('admin-property-image-upload', args=[self.prop.pk])
+
+    def upload(self, files, **data):
+        return self.client.post(self.url, {'images': files, **data}, format='multipart')
+
+    def test_batch_upload_assigns_order_and_demotes_primary(self):
+        response = self.upload([make_image_file(f'a{i}.jpg', (40, 30)) for i in range(3)], is_primary='true')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([r['order_index'] for r in response.data], [0, 1, 2])
+        self.assertTrue(response.data[0]['srcset']['webp']['40'])
+
+        with self.assertNumQueries(7):  # lookup, savepoint, lock, max, demote, insert, release
+            response = self.upload([make_image_file('b.jpg', (40, 30))], is_primary='true')
+        self.assertEqual(response.data[0]['order_index'], 3)
+        self.assertEqual(list(self.prop.images.filter(is_primary=True).values_list('pk', flat=True)),
+                         [response.data[0]['id']])
+
+    def test_variants_are_built_from_the_file_in_chunks(self):
+        from nura_stays.images import build_variants
+        from properties.uploads import store_upload
+        reads = []
+
+        class Spy(BytesIO):
+            def read(self, size=-1):
+                reads.append(size)
+                return super().read(size)
+
+        upload = make_image_file('c.jpg', (640, 480))
+        data = upload.read()
+        storage = PropertyImage._meta.get_field('image').storage
+        with mock.patch.object(storage, 'open', lambda name, mode='rb': Spy(data)):
+            name, variants = store_upload(upload)
+        self.assertTrue(reads)
+        self.assertNotIn(-1, reads)
+        self.assertNotIn(None, reads)
+        self.assertEqual(variants, build_variants(name, storage, BytesIO(data)))
+
+    def test_invalid_file_rejects_whole_batch(self):
+        bad = SimpleUploadedFile('bad.jpg', b'not an image', content_type='image/jpeg')
+        response = self.upload([make_image_file('ok.jpg', (40, 30)), bad])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['files'][0]['file'], 'bad.jpg')
+        self.assertFalse(self.prop.images.exists())
+
+    def test_worker_exception_removes_the_batch_and_reraises(self):
+        from nura_stays.images import build_variants
+        from properties.uploads import store_uploads
+
+        def flaky(name, storage, source):
+            if 'broken' in name:
+                raise OSError('disk full')
+            return build_variants(name, storage, source)
+
+        def files():
+            return {
+                os.path.join(root, name)
+                for root, _, names in os.walk('/tmp/nura-stays-test-media') for name in names
+            }
+
+        before = files()
+        uploads = [make_image_file('fine.jpg', (41, 30)), make_image_file('broken.jpg', (42, 30))]
+        with mock.patch('properties.uploads.build_variants', side_effect=flaky), \
+                self.assertRaisesMessage(OSError, 'disk full'):
+            store_uploads(uploads, workers=2)
+        self.assertEqual(files() - before, set())
+
+
+@override_settings(MEDIA_ROOT='/tmp/nura-stays-test-media', IMAGE_VARIANT_WIDTHS=[320])
+class MediaServingTests(TestCase):
+    def setUp(self):
+        self.image = PropertyImage.objects.create(
+            property=make_property(), image=make_image_file('serve.jpg', (640, 480))
+        )
+        self.url = self.image.image.url
+        self.variant_url = '/media/' + self.image.variants['formats']['webp']['320']
+        self.size = self.image.image.size
+
+    def test_full_response_and_cache_headers(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(int(response['Content-Length']), self.size)
+        self.assertEqual(len(b''.join(response.streaming_content)), self.size)
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+        response = self.client.get(self.variant_url)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+
+    def test_if_none_match(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_requests(self):
+        with self.image.image.open('rb') as f:
+            data = f.read()
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{self.size}')
+        self.assertEqual(b''.join(response.streaming_content), data[10:20])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), data[-5:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={self.size}-')
+        self.assertEqual(response.status_code, 416)
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(MEDIA_SERVE_BACKEND='nginx')
+    def test_accel_redirect(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + self.image.image.name)
+        self.assertEqual(response.content, b'')
+
+    @override_settings(MEDIA_SERVE_BACKEND='nginx')
+    def test_accel_redirect_quotes_the_name(self):
+        from django.core.files.base import ContentFile
+        storage = self.image.image.storage
+        name = storage.save('properties/café view #1?.jpg', ContentFile(b'jpeg'))
+        response = self.client.get('/media/' + quote(name))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + quote(name))
+        self.assertTrue(response['X-Accel-Redirect'].isascii())
+
+    def test_path_traversal_is_rejected(self):
+        self.assertEqual(self.client.get('/media/../manage.py').status_code, 400)
+
+
+class AvailabilityTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.free = make_property(name='Free Flat', max_guests=4)
+        self.booked = make_property(name='Booked Flat', max_guests=4)
+        self.small = make_property(name='Small Flat', max_guests=2)
+        self.book(self.booked, '2026-06-10', '2026-06-15')
+        self.book(self.free, '2026-06-10', '2026-06-15', status=Booking.CANCELLED)
+
+    def book(self, prop, check_in, check_out, **kwargs):
+        return Booking.objects.create(
+            property=prop, check_in=datetime.date.fromisoformat(check_in),
+            check_out=datetime.date.fromisoformat(check_out), **kwargs,
+        )
+
+    def names(self, **params):
+        response = self.client.get(reverse('property-list'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return sorted(p['name'] for p in response.data['results'])
+
+    def test_overlapping_bookings_are_excluded(self):
+        everyone = ['Booked Flat', 'Free Flat', 'Small Flat']
+        self.assertEqual(self.names(check_in='2026-06-12', check_out='2026-06-13'), ['Free Flat', 'Small Flat'])
+        self.assertEqual(self.names(check_in='2026-06-01', check_out='2026-06-30'), ['Free Flat', 'Small Flat'])
+        # check_out is exclusive on both sides: back-to-back stays are fine.
+        self.assertEqual(self.names(check_in='2026-06-15', check_out='2026-06-18'), everyone)
+        self.assertEqual(self.names(check_in='2026-06-05', check_out='2026-06-10'), everyone)
+        self.assertEqual(self.names(check_in='2026-06-12', check_out='2026-06-13', guests=3), ['Free Flat'])
+
+    def test_results_follow_new_bookings(self):
+        params = {'check_in': '2026-07-01', 'check_out': '2026-07-03'}
+        self.assertIn('Small Flat', self.names(**params))
+        self.book(self.small, '2026-07-02', '2026-07-04', kind=Booking.BLOCK)
+        self.assertNotIn('Small Flat', self.names(**params))
+
+    def test_invalid_ranges_are_rejected(self):
+        url = reverse('property-list')
+        self.assertEqual(self.client.get(url, {'check_in': '2026-06-12'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'check_in': '2026-06-12', 'check_out': '2026-06-12'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'check_in': 'soon', 'check_out': '2026-06-12'}).status_code, 400)
+
+    def test_database_rejects_overlaps(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.book(self.booked, '2026-06-14', '2026-06-20')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.book(self.booked, '2026-06-12', '2026-06-11')
+        later = self.book(self.booked, '2026-06-15', '2026-06-20')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Booking.objects.filter(pk=later.pk).update(check_in=datetime.date(2026, 6, 14))
+        # Cancelled rows never block.
+        self.book(self.free, '2026-06-11', '2026-06-12')
+
+    def test_admin_booking_api_validates_overlap(self):
+        from django.contrib.auth.models import User
+        self.client.force_authenticate(User.objects.create_user('admin', is_staff=True))
+        url = reverse('admin-booking-list-create', args=[self.booked.pk])
+        response = self.client.post(url, {'check_in': '2026-06-13', 'check_out': '2026-06-16'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(url, {'check_in': '2026-06-15', 'check_out': '2026-06-16', 'kind': 'block'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.booked.bookings.count(), 2)
+
+
+class GeoSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        make_property(name='Soho', latitude=51.5136, longitude=-0.1365)
+        make_property(name='Greenwich', latitude=51.4826, longitude=-0.0077)
+        make_property(name='Brighton', latitude=50.8225, longitude=-0.1372)
+        make_property(name='Fiji', latitude=-16.7784, longitude=179.9)
+        make_property(name='Nowhere')
+
+    def results(self, **params):
+        response = self.client.get(reverse('property-list'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data['results']
+
+    def test_geohash_is_kept_in_sync(self):
+        prop = Property.objects.get(name='Soho')
+        self.assertTrue(prop.geohash.startswith('gcpvh'))
+        prop.latitude, prop.longitude = None, None
+        prop.save(update_fields=['latitude', 'longitude'])
+        prop.refresh_from_db()
+        self.assertEqual(prop.geohash, '')
+
+    def test_near_with_radius_and_distance_ordering(self):
+        results = self.results(near='51.5074,-0.1278', radius_km=15, ordering='distance')
+        self.assertEqual([r['name'] for r in results], ['Soho', 'Greenwich'])
+        self.assertAlmostEqual(results[0]['distance_km'], 0.91, places=1)
+        self.assertEqual(
+            [r['name'] for r in self.results(near='51.5074,-0.1278', radius_km=100, ordering='-distance')],
+            ['Brighton', 'Greenwich', 'Soho'],
+        )
+
+    def test_bbox_including_antimeridian(self):
+        names = {r['name'] for r in self.results(bbox='-0.2,51.4,0.1,51.6')}
+        self.assertEqual(names, {'Soho', 'Greenwich'})
+        self.assertEqual([r['name'] for r in self.results(bbox='179,-20,-179,-10')], ['Fiji'])
+
+    def test_invalid_parameters(self):
+        url = reverse('property-list')
+        for params in ({'near': 'here'}, {'near': '91,0'}, {'bbox': '1,2,3'}, {'radius_km': 5},
+                       {'near': '51,0', 'radius_km': 5000}):
+            self.assertEqual(self.client.get(url, params).status_code, 400, params)
+        # Distance ordering without ?near= is ignored rather than failing.
+        self.assertEqual(self.client.get(url, {'ordering': 'distance'}).status_code, 200)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class FacetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        make_property(name='Flat A', property_type='apartment', bedrooms=1, price_per_night=80,
+                      amenities=['WiFi', 'Kitchen'])
+        make_property(name='Flat B', property_type='apartment', bedrooms=2, price_per_night=150,
+                      amenities=['WiFi'])
+        make_property(name='Villa', property_type='villa', bedrooms=6, price_per_night=650,
+                      amenities=['WiFi', 'Pool'])
+        make_property(name='Hidden', is_active=False, amenities=['Pool'])
+
+    def test_counts_in_one_query(self):
+        with self.assertNumQueries(2):  # validators + facets
+            response = self.client.get(reverse('property-facets'))
+        self.assertEqual(response.data['count'], 3)
+        facets = response.data['facets']
+        self.assertEqual(facets['property_type']['apartment'], 2)
+        self.assertEqual(facets['property_type']['house'], 0)
+        self.assertEqual(facets['bedrooms'], {'1': 1, '2': 1, '3': 0, '4': 0, '5+': 1})
+        self.assertEqual(facets['price'], {'0-100': 1, '100-200': 1, '200-300': 0, '300-500': 0, '500+': 1})
+        self.assertEqual(facets['amenities'], {'WiFi': 3, 'Kitchen': 1, 'Pool': 1})
+
+    def test_duplicated_amenity_counts_once(self):
+        make_property(name='Loft', amenities=['Gym', 'Gym'])
+        url = reverse('property-facets')
+        self.assertEqual(self.client.get(url).data['facets']['amenities']['Gym'], 1)
+        cache.clear()
+        with mock.patch.dict('properties.facets._AMENITY_SQL', clear=True):
+            self.assertEqual(self.client.get(url).data['facets']['amenities']['Gym'], 1)
+
+    def test_counts_follow_filters(self):
+        response = self.client.get(reverse('property-facets'), {'property_type': 'apartment', 'max_price': 100})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['facets']['amenities'], {'Kitchen': 1, 'WiFi': 1})
+        response = self.client.get(reverse('property-facets'), {'search': 'villa'})
+        self.assertEqual(response.data['facets']['property_type']['villa'], 1)
+
+    def test_equivalent_filters_share_a_cache_entry(self):
+        url = reverse('property-facets')
+        self.assertEqual(self.client.get(url, {'min_price': '100', 'property_type': 'villa'})['X-Cache'], 'MISS')
+        response = self.client.get(url, {'property_type': 'villa', 'min_price': '100.00', 'page': 3, 'ordering': 'name'})
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(url, {'min_price': 'lots'}).status_code, 400)
+
+
+class BulkImportExportTests(APITestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        cache.clear()
+        self.client.force_authenticate(User.objects.create_user('admin', is_staff=True))
+        self.existing = make_property(name='Sea View', amenities=['WiFi'])
+
+    def upload(self, content, name='properties.csv', **data):
+        file = SimpleUploadedFile(name, content.encode())
+        return self.client.post(reverse('admin-property-import'), {'file': file, **data}, format='multipart')
+
+    def test_export_streams_csv_and_jsonl(self):
+        response = self.client.get(reverse('admin-property-export'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment;', response['Content-Disposition'])
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertTrue(lines[0].startswith('id,name,slug,'))
+        self.assertIn('"[""WiFi""]"', lines[1])
+
+        response = self.client.get(reverse('admin-property-export'), {'output': 'jsonl'})
+        row = json.loads(b''.join(response.streaming_content))
+        self.assertEqual((row['slug'], row['amenities']), ('sea-view', ['WiFi']))
+        self.assertEqual(self.client.get(reverse('admin-property-export'), {'output': 'xml'}).status_code, 400)
+
+    def test_import_creates_rows_with_unique_slugs(self):
+        content = (
+            'name,location,description,price_per_night,amenities,latitude,longitude\n'
+            'Sea View,Stone Town,Nice.,120,"[""Pool""]",-6.16,39.19\n'
+            'Sea View,Nungwi,Nice.,90,,,\n'
+            'Broken,Nungwi,Nice.,lots,,,\n'
+        )
+        response = self.upload(content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['skipped']), (2, 1))
+        self.assertEqual(response.data['errors'][0]['line'], 4)
+        self.assertIn('price_per_night', response.data['errors'][0]['errors'])
+
+        first, second = Property.objects.exclude(pk=self.existing.pk).order_by('pk')
+        self.assertEqual((first.slug, second.slug), ('sea-view-1', 'sea-view-2'))
+        self.assertEqual(first.amenities, ['Pool'])
+        self.assertTrue(first.geohash)
+        # Bulk writes skip signals; the import refreshes search and dashboard rollups itself.
+        search = self.client.get(reverse('property-list'), {'search': 'Nungwi'})
+        self.assertEqual([p['id'] for p in search.data['results']], [second.pk])
+        from accounts.models import DailyStats
+        self.assertEqual(DailyStats.objects.get().properties_created, 3)
+
+    def test_allocate_slugs_skips_taken_suffixes(self):
+        for slug in ('sea-view-1', 'sea-view-3', 'sea-viewing'):
+            make_property(name='Other', slug=slug)
+        with self.assertNumQueries(1):
+            slugs = Property.allocate_slugs(['Sea View', 'Sea View', 'Sea Viewing'])
+        self.assertEqual(slugs, ['sea-view-2', 'sea-view-4', 'sea-viewing-1'])
+
+    def test_import_rejects_taken_slugs(self):
+        content = (
+            'name,slug,location,description,price_per_night\n'
+            'A,sea-view,X,Y,10\n'
+            'B,fresh,X,Y,10\n'
+            'C,fresh,X,Y,10\n'
+        )
+        response = self.upload(content)
+        self.assertEqual((response.data['created'], response.data['skipped']), (1, 2))
+        self.assertEqual([error['line'] for error in response.data['errors']], [2, 4])
+
+    def test_update_and_dry_run(self):
+        content = f'{{"id": {self.existing.pk}, "price_per_night": "75.00", "latitude": 1, "longitude": 2}}\n'
+        response = self.upload(content, name='properties.jsonl', update='true', dry_run='true')
+        self.assertEqual(response.data['updated'], 1)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.price_per_night, 100)
+
+        response = self.upload(content, name='properties.jsonl', update='true')
+        self.assertEqual((response.data['updated'], response.data['created']), (1, 0))
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.price_per_night, 75)
+        self.assertEqual(self.existing.name, 'Sea View')
+        self.assertTrue(self.existing.geohash)
+
+        response = self.upload('{"id": 999999, "name": "Ghost"}\n', name='properties.jsonl', update='true')
+        self.assertEqual(response.data['errors'][0]['errors'], {'id': ['No row with this id to update.']})
+
+    def test_commands_round_trip(self):
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'properties.jsonl')
+            call_command('export_data', 'properties', output=path, stdout=StringIO())
+            Property.objects.all().delete()
+            call_command('import_data', 'properties', path, stdout=out)
+        self.assertIn('1 created', out.getvalue())
+        self.assertEqual(Property.objects.get().slug, 'sea-view')
+
 
-# Create your tests here.
@@ -0,0 +1,97 @@
+"""
+Batch upload pipeline for property images.
+
+Uploaded files arrive as temporary files (see FILE_UPLOAD_HANDLERS). Each one
+is stored and decoded into its variants in a thread pool; Pillow releases
+the GIL while decoding, resizing and encoding, so a batch scales with the
+number of workers. Database rows are written afterwards in one bulk insert.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from nura_stays.cache import bump_version
+from nura_stays.images import build_variants, delete_variants
+from .models import Property, PropertyImage
+
+
+def store_upload(upload):
+    """
+    Store one uploaded file and build its variants. Returns (name, variants),
+    or (None, error message) if it is not a decodable image.
+    """
+    field = PropertyImage._meta.get_field('image')
+    storage = field.storage
+    upload.seek(0)
+    # Temporary uploads are moved into place rather than copied; variants are
+    # then decoded from the stored file instead of a copy in memory.
+    name = storage.save(field.generate_filename(None, upload.name), upload)
+    try:
+        with storage.open(name, 'rb') as stored:
+            variants = build_variants(name, storage, stored)
+    except BaseException:
+        storage.delete(name)
+        raise
+    if not variants:
+        storage.delete(name)
+        return None, 'Not a valid image file'
+    return name, variants
+
+
+def store_uploads(uploads, workers=None):
+    """
+    Store and process ``uploads`` concurrently. Returns (stored, errors), where
+    stored is a list of (name, variants) in upload order. If any file fails,
+    everything stored for the batch is removed again; an exception raised by
+    a worker (storage or I/O failure) is re-raised once that is done.
+    """
+    workers = workers or getattr(settings, 'IMAGE_UPLOAD_WORKERS', 4)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(uploads)))) as pool:
+        futures = [pool.submit(store_upload, upload) for upload in uploads]
+
+    # Leaving the block waited for every worker, so none is still writing.
+    failures = [future.exception() for future in futures if future.exception() is not None]
+    results = [future.result() for future in futures if future.exception() is None]
+    stored = [(name, variants) for name, variants in results if name is not None]
+    if not failures and len(stored) == len(uploads):
+        return stored, []
+
+    storage = PropertyImage._meta.get_field('image').storage
+    for name, variants in stored:
+        delete_variants(variants, storage)
+        storage.delete(name)
+    if failures:
+        raise failures[0]
+    errors = [
+        {'file': upload.name, 'error': result}
+        for upload, (name, result) in zip(uploads, results) if name is None
+    ]
+    return [], errors
+
+
+def create_images(prop, stored, is_primary=False):
+    """
+    Insert rows for stored files with one bulk INSERT. order_index continues
+    after the property's current images under a row lock on the property, and
+    an existing primary image is demoted with a single UPDATE.
+    """
+    with transaction.atomic():
+        Property.objects.select_for_update().filter(pk=prop.pk).first()
+        last = PropertyImage.objects.filter(property=prop).aggregate(last=Max('order_index'))['last']
+        start = 0 if last is None else last + 1
+        if is_primary:
+            PropertyImage.objects.filter(property=prop, is_primary=True).update(is_primary=False)
+        images = PropertyImage.objects.bulk_create([
+            PropertyImage(
+                property=prop,
+                image=name,
+                variants=variants,
+                is_primary=is_primary and i == 0,
+                order_index=start + i,
+            )
+            for i, (name, variants) in enumerate(stored)
+        ])
+    # bulk_create sends no post_save, so invalidate cached responses here.
+    bump_version(PropertyImage)
+    return images
@@ -2,16 +2,23 @@
 URL configuration for Properties app.
 """
 from django.urls import path
+
+from nura_stays.asyncviews import read_view
 from . import views
 
 urlpatterns = [
     # Public
-    path('properties/', views.PropertyListView.as_view(), name='property-list'),
-    path('properties/featured/', views.FeaturedPropertiesView.as_view(), name='property-featured'),
-    path('properties/<slug:slug>/', views.PropertyDetailView.as_view(), name='property-detail'),
+    path('properties/', read_view(views.PropertyListView, views.AsyncPropertyListView), name='property-list'),
+    path('properties/featured/', read_view(views.FeaturedPropertiesView, views.AsyncFeaturedPropertiesView), name='property-featured'),
+    path('properties/facets/', views.PropertyFacetsView.as_view(), name='property-facets'),
+    path('properties/<slug:slug>/', read_view(views.PropertyDetailView, views.AsyncPropertyDetailView), name='property-detail'),
     # Admin
     path('admin/properties/', views.AdminPropertyListCreateView.as_view(), name='admin-property-list-create'),
+    path('admin/properties/export/', views.AdminPropertyExportView.as_view(), name='admin-property-export'),
+    path('admin/properties/import/', views.AdminPropertyImportView.as_view(), name='admin-property-import'),
     path('admin/properties/<int:pk>/', views.AdminPropertyDetailView.as_view(), name='admin-property-detail'),
     path('admin/properties/<int:pk>/images/', views.AdminPropertyImageUploadView.as_view(), name='admin-property-image-upload'),
     path('admin/properties/<int:pk>/images/<int:image_id>/', views.AdminPropertyImageDeleteView.as_view(), name='admin-property-image-delete'),
+    path('admin/properties/<int:pk>/bookings/', views.AdminBookingListCreateView.as_view(), name='admin-booking-list-create'),
+    path('admin/properties/<int:pk>/bookings/<int:booking_id>/', views.AdminBookingDetailView.as_view(), name='admin-booking-detail'),
 ]
@@ -1,70 +1,153 @@
 """
 Views for Properties app.
 """
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
 from rest_framework import generics, filters, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Avg, Count
-from .models import Property, PropertyImage
+from .models import Booking, Property, PropertyImage
 from .serializers import (
     PropertyListSerializer,
     PropertyDetailSerializer,
     PropertyAdminSerializer,
     PropertyImageSerializer,
+    BookingSerializer,
 )
-from .filters import PropertyFilter
+from .bulk import PropertyDataset
+from .facets import facet_counts
+from .filters import PropertyFilter, PropertySearchFilter, PropertyOrderingFilter
+from .uploads import create_images, store_uploads
+from nura_stays.asyncviews import AsyncAPIViewMixin, AsyncListMixin, AsyncRetrieveMixin
+from nura_stays.bulk import ExportMixin, ImportView
+from nura_stays.cache import CachedResponseMixin, ConditionalGetMixin
+from nura_stays.fastpath import FastListMixin
+from nura_stays.fieldsets import SparseFieldsetMixin
+from nura_stays.images import delete_source
+from nura_stays.pagination import KeysetPagination
 
 
 # ─── Public Views ────────────────────────────────────────────────────────────
 
-class PropertyListView(generics.ListAPIView):
-    """List all active properties with filters, search, and pagination."""
+def with_primary_image(view, queryset):
+    """Prefetch primary images unless the fieldset leaves them out."""
+    if view.wants('primary_image') or view.wants('primary_image_srcset'):
+        return queryset.with_primary_image()
+    return queryset
+
+
+class PropertyListView(
+    ConditionalGetMixin, CachedResponseMixin, SparseFieldsetMixin, FastListMixin, AsyncListMixin, generics.ListAPIView,
+):
+    """
+    List all active properties with filters, search, and pagination.
+    ?check_in=&check_out= keeps properties with no overlapping booking and
+    ?guests= those that sleep at least that many. ?near=lat,lng&radius_km=
+    (default 10) and ?bbox=west,south,east,north search by area;
+    ?ordering=distance sorts ?near= results nearest first. ?fields= and
+    ?exclude= trim the response (see nura_stays.fieldsets).
+    """
+    cache_models = (
+        'properties.property', 'properties.propertyimage', 'reviews.review', 'properties.booking',
+    )
     serializer_class = PropertyListSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, PropertySearchFilter, PropertyOrderingFilter]
     filterset_class = PropertyFilter
-    search_fields = ['name', 'location', 'description']
-    ordering_fields = ['price_per_night', 'created_at', 'name']
+    # Fallback for databases without a full-text backend (see properties.search).
+    search_fields = ['name', 'location', 'short_description', 'description']
+    ordering_fields = ['price_per_night', 'created_at', 'name', 'distance']
     ordering = ['-created_at']
 
     def get_queryset(self):
-        from django.db.models import Q
-        return Property.objects.filter(is_active=True).annotate(
-            average_rating=Avg('reviews__rating', filter=Q(reviews__is_approved=True)),
-            review_count=Count('reviews', filter=Q(reviews__is_approved=True)),
-        )
+        return with_primary_image(self, Property.objects.filter(is_active=True))
+
+
+class PropertyFacetsView(PropertyListView):
+    """
+    Counts per property type, bedroom bucket, price range and amenity for the
+    properties matching the list view's filters (see properties.facets).
+    """
+    filter_backends = [DjangoFilterBackend, PropertySearchFilter]
+    pagination_class = None
+
+    def get_queryset(self):
+        return Property.objects.filter(is_active=True)
+
+    def get_cache_params(self, request):
+        # Key on the cleaned filter values so equivalent queries (reordered,
+        # padded, '100' vs '100.00', page/ordering noise) share one entry.
+        filterset = self.filterset_class(request.query_params, queryset=Property.objects.none())
+        if not filterset.is_valid():
+            return None
+        params = [
+            (name, str(value.normalize() if isinstance(value, Decimal) else value))
+            for name, value in filterset.form.cleaned_data.items()
+            if value not in (None, '')
+        ]
+        search = ' '.join(request.query_params.get('search', '').split()).lower()
+        if search:
+            params.append(('search', search))
+        return params
+
+    def list(self, request, *args, **kwargs):
+        return Response(facet_counts(self.filter_queryset(self.get_queryset())))
 
 
-class PropertyDetailView(generics.RetrieveAPIView):
-    """Get a single property by slug."""
+class PropertyDetailView(
+    ConditionalGetMixin, CachedResponseMixin, SparseFieldsetMixin, AsyncRetrieveMixin, generics.RetrieveAPIView,
+):
+    """Get a single property by slug; ?fields= / ?exclude= trim it, images included."""
+    cache_models = ('properties.property', 'properties.propertyimage', 'reviews.review')
     serializer_class = PropertyDetailSerializer
     permission_classes = [AllowAny]
     lookup_field = 'slug'
 
     def get_queryset(self):
-        from django.db.models import Q
-        return Property.objects.filter(is_active=True).annotate(
-            average_rating=Avg('reviews__rating', filter=Q(reviews__is_approved=True)),
-            review_count=Count('reviews', filter=Q(reviews__is_approved=True)),
+        queryset = Property.objects.filter(is_active=True)
+        if not self.wants('images'):
+            return queryset
+        if not self.has_fieldset():
+            # Loaded with the property, so the async view never queries lazily.
+            return queryset.prefetch_related('images')
+        columns = self.get_serializer().fields['images'].child.get_field_columns()
+        return queryset.prefetch_related(
+            Prefetch('images', queryset=PropertyImage.objects.only('property', *columns))
         )
 
 
-class FeaturedPropertiesView(generics.ListAPIView):
+class FeaturedPropertiesView(
+    ConditionalGetMixin, CachedResponseMixin, SparseFieldsetMixin, AsyncListMixin, generics.ListAPIView,
+):
     """Get featured properties."""
+    cache_models = ('properties.property', 'properties.propertyimage', 'reviews.review')
     serializer_class = PropertyListSerializer
     permission_classes = [AllowAny]
     pagination_class = None
 
     def get_queryset(self):
-        from django.db.models import Q
-        return Property.objects.filter(
-            is_active=True, is_featured=True
-        ).annotate(
-            average_rating=Avg('reviews__rating', filter=Q(reviews__is_approved=True)),
-            review_count=Count('reviews', filter=Q(reviews__is_approved=True)),
-        )[:6]
+        return with_primary_image(self, Property.objects.filter(is_active=True, is_featured=True))[:6]
+
+
+# Served instead of the views above under ASGI (nura_stays.asyncviews).
+
+class AsyncPropertyListView(AsyncAPIViewMixin, PropertyListView):
+    """PropertyListView with an async GET."""
+
+
+class AsyncPropertyDetailView(AsyncAPIViewMixin, PropertyDetailView):
+    """PropertyDetailView with an async GET."""
+
+
+class AsyncFeaturedPropertiesView(AsyncAPIViewMixin, FeaturedPropertiesView):
+    """FeaturedPropertiesView with an async GET."""
 
 
 # ─── Admin Views ─────────────────────────────────────────────────────────────
@@ -78,6 +161,16 @@ class AdminPropertyListCreateView(generics.ListCreateAPIView):
     ordering_fields = ['price_per_night', 'created_at', 'name']
 
 
+class AdminPropertyExportView(ExportMixin, AdminPropertyListCreateView):
+    """Admin: stream all (searched/ordered) properties as CSV or JSON Lines."""
+    dataset_class = PropertyDataset
+
+
+class AdminPropertyImportView(ImportView):
+    """Admin: bulk create or update properties from a CSV or JSON Lines file."""
+    dataset_class = PropertyDataset
+
+
 class AdminPropertyDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Admin: retrieve, update, or delete a property."""
     queryset = Property.objects.all()
@@ -86,7 +179,7 @@ class AdminPropertyDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 class AdminPropertyImageUploadView(APIView):
-    """Admin: upload images for a property."""
+    """Admin: upload a batch of images for a property (processed in parallel)."""
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
 
@@ -109,18 +202,15 @@ class AdminPropertyImageUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        created_images = []
-        is_primary = request.data.get('is_primary', 'false').lower() == 'true'
-        current_count = prop.images.count()
-
-        for i, img_file in enumerate(images):
-            img = PropertyImage.objects.create(
-                property=prop,
-                image=img_file,
-                is_primary=is_primary and i == 0,
-                order_index=current_count + i,
+        stored, errors = store_uploads(images)
+        if errors:
+            return Response(
+                {'error': 'Invalid image file(s)', 'files': errors},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            created_images.append(img)
+
+        is_primary = request.data.get('is_primary', 'false').lower() == 'true'
+        created_images = create_images(prop, stored, is_primary=is_primary)
 
         serializer = PropertyImageSerializer(
             created_images, many=True, context={'request': request}
@@ -140,6 +230,51 @@ class AdminPropertyImageDeleteView(APIView):
                 {'error': 'Image not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
-        image.image.delete(save=False)
+        delete_source(image.image)
         image.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class BookingWriteMixin:
+    """Turn a lost overlap race (database guard) into a 400."""
+
+    def save_booking(self, serializer, **kwargs):
+        try:
+            with transaction.atomic():
+                serializer.save(**kwargs)
+        except IntegrityError:
+            raise ValidationError('These dates overlap an existing booking or block.')
+
+
+class AdminBookingListCreateView(BookingWriteMixin, generics.ListCreateAPIView):
+    """Admin: list a property's bookings and blocks, or add one."""
+    serializer_class = BookingSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_property(self):
+        return generics.get_object_or_404(Property, pk=self.kwargs['pk'])
+
+    def get_queryset(self):
+        return Booking.objects.filter(property_id=self.kwargs['pk'])
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method == 'POST':
+            context['property'] = self.get_property()
+        return context
+
+    def perform_create(self, serializer):
+        self.save_booking(serializer, property=serializer.context['property'])
+
+
+class AdminBookingDetailView(BookingWriteMixin, generics.RetrieveUpdateDestroyAPIView):
+    """Admin: retrieve, update (e.g. cancel) or delete a booking or block."""
+    serializer_class = BookingSerializer
+    permission_classes = [IsAuthenticated]
+    lookup_url_kwarg = 'booking_id'
+
+    def get_queryset(self):
+        return Booking.objects.filter(property_id=self.kwargs['pk'])
+
+    def perform_update(self, serializer):
+        self.save_booking(serializer)
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class ReviewsConfig(AppConfig):
     name = 'reviews'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from nura_stays.cache import watch_models
+        from .models import Review
+        watch_models(Review)
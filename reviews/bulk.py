@@ -0,0 +1,50 @@
+"""
+Bulk export/import dataset for reviews.
+"""
+from rest_framework import serializers
+
+from nura_stays.bulk import Dataset
+from nura_stays.cache import bump_version
+
+from .models import Review, ReviewStats
+
+
+class ReviewImportSerializer(serializers.ModelSerializer):
+    """Review fields for import; ``property`` is a raw id checked once per batch."""
+    property = serializers.IntegerField(source='property_id', required=False, allow_null=True)
+
+    class Meta:
+        model = Review
+        fields = ['property', 'guest_name', 'rating', 'review_text', 'is_approved']
+
+
+class ReviewDataset(Dataset):
+    name = 'reviews'
+    model = Review
+    serializer_class = ReviewImportSerializer
+    fields = ['id', 'property', 'guest_name', 'rating', 'review_text', 'is_approved', 'created_at', 'updated_at']
+
+    def validate_batch(self, items):
+        from properties.models import Property
+        wanted = {data['property_id'] for _, data, _ in items if data.get('property_id') is not None}
+        found = set(Property.objects.filter(pk__in=wanted).values_list('pk', flat=True)) if wanted else set()
+        return {
+            line: {'property': [f'Property {data["property_id"]} does not exist.']}
+            for line, data, _ in items
+            if data.get('property_id') is not None and data['property_id'] not in found
+        }
+
+    def remember_previous(self, instance, context):
+        context.setdefault('property_ids', set()).add(instance.property_id)
+
+    def prepare(self, created, updated, context):
+        context.setdefault('property_ids', set()).update(instance.property_id for instance in created + updated)
+
+    def after_import(self, created_ids, updated_ids, context):
+        from accounts.models import DailyStats
+        from properties.models import Property
+        Property.rebuild_ratings(context.get('property_ids', set()) - {None})
+        ReviewStats.rebuild()
+        DailyStats.refresh(self.model, created_ids + updated_ids)
+        bump_version(Review)
+        bump_version(Property)
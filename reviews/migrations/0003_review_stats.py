@@ -0,0 +1,51 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_review_stats(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ReviewStats = apps.get_model('reviews', 'ReviewStats')
+    rows = {None: ReviewStats()}
+    counts = Review.objects.filter(is_approved=True).order_by().values(
+        'property_id', 'rating'
+    ).annotate(n=models.Count('id'))
+    for row in counts:
+        for key in {None, row['property_id']}:
+            stats = rows.setdefault(key, ReviewStats(property_id=key))
+            stats.review_count += row['n']
+            stats.rating_sum += row['rating'] * row['n']
+            bucket = f"rating_{row['rating']}"
+            setattr(stats, bucket, getattr(stats, bucket) + row['n'])
+    ReviewStats.objects.bulk_create(rows.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0005_keyset_indexes'),
+        ('reviews', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+                ('property', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='review_stats', to='properties.property')),
+            ],
+            options={
+                'verbose_name_plural': 'review stats',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('property__isnull', True)), fields=('property',), name='single_overall_review_stats')],
+            },
+        ),
+        migrations.RunPython(backfill_review_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-18 15:15
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+def drop_duplicate_overall_rows(apps, schema_editor):
+    # Duplicates were created together and then received the same deltas.
+    ReviewStats = apps.get_model('reviews', 'ReviewStats')
+    overall = ReviewStats.objects.filter(property__isnull=True).order_by('pk')
+    keep = overall.values_list('pk', flat=True).first()
+    overall.exclude(pk=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0008_geo_location'),
+        ('reviews', '0003_review_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_overall_rows, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='reviewstats',
+            name='single_overall_review_stats',
+        ),
+        migrations.AddConstraint(
+            model_name='reviewstats',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('property', models.Value(0)), name='single_review_stats_per_property'),
+        ),
+    ]
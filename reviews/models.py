@@ -1,7 +1,8 @@
 """
 Review models for Nura Stays.
 """
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
@@ -26,6 +27,121 @@ class Review(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination: (ordering field, id), public list filters on is_approved.
+            models.Index(fields=['is_approved', 'created_at', 'id'], name='review_approved_created_idx'),
+            models.Index(fields=['is_approved', 'rating', 'id'], name='review_approved_rating_idx'),
+            models.Index(fields=['created_at', 'id'], name='review_created_idx'),
+        ]
 
     def __str__(self):
         return f"Review by {self.guest_name} - {self.rating}★"
+
+    def save(self, *args, **kwargs):
+        # Keep the row write and the Property rating update (post_save) in one transaction.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+
+class ReviewStats(models.Model):
+    """
+    Rollup of approved-review statistics: one overall row (property is null)
+    and one row per reviewed property. Maintained incrementally by
+    reviews.signals; rebuilt by ``manage.py recompute_ratings``.
+    """
+
+    property = models.OneToOneField(
+        'properties.Property',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='review_stats'
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'review stats'
+        constraints = [
+            # NULLs are distinct in unique indexes, so the overall row is
+            # made unique through the property id it cannot have (ids start at 1).
+            models.UniqueConstraint(
+                Coalesce('property', models.Value(0)), name='single_review_stats_per_property',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Review stats for {self.property_id or 'all reviews'}"
+
+    def get_average_rating(self):
+        return round(self.rating_sum / self.review_count, 1) if self.review_count else 0
+
+    def get_distribution(self):
+        return {str(i): getattr(self, f'rating_{i}') for i in range(1, 6)}
+
+    @classmethod
+    def compute(cls):
+        """Compute the overall row and every property row in one grouped query."""
+        rows = {}
+        reviews = Review.objects.filter(is_approved=True).order_by()
+        for row in reviews.values('property_id', 'rating').annotate(n=models.Count('id')):
+            for key in {None, row['property_id']}:
+                cls._add(rows.setdefault(key, cls(property_id=key)), row['rating'], row['n'])
+        return rows
+
+    @classmethod
+    def compute_row(cls, property_id=None):
+        """Compute a single row (the overall row when ``property_id`` is None)."""
+        stats = cls(property_id=property_id)
+        reviews = Review.objects.filter(is_approved=True).order_by()
+        if property_id is not None:
+            reviews = reviews.filter(property_id=property_id)
+        for row in reviews.values('rating').annotate(n=models.Count('id')):
+            cls._add(stats, row['rating'], row['n'])
+        return stats
+
+    @staticmethod
+    def _add(stats, rating, n):
+        stats.review_count += n
+        stats.rating_sum += rating * n
+        setattr(stats, f'rating_{rating}', getattr(stats, f'rating_{rating}') + n)
+
+    @classmethod
+    def rebuild(cls):
+        """Replace every row from the reviews table."""
+        with transaction.atomic():
+            rows = cls.compute()
+            rows.setdefault(None, cls())
+            cls.objects.all().delete()
+            cls.objects.bulk_create(rows.values(), batch_size=500)
+
+    @classmethod
+    def rebuild_row(cls, property_id=None):
+        """Recompute one row in place, creating it if it does not exist."""
+        stats = cls.compute_row(property_id)
+        fields = ['review_count', 'rating_sum', *(f'rating_{i}' for i in range(1, 6))]
+        with transaction.atomic():
+            # Locks an existing row; a concurrent insert of the same row hits
+            # the unique constraint and falls back to updating the winner's.
+            cls.objects.select_for_update().update_or_create(
+                property_id=property_id, defaults={field: getattr(stats, field) for field in fields},
+            )
+
+    @classmethod
+    def apply_delta(cls, property_id, rating, delta):
+        """
+        Shift one row's count, sum and histogram bucket. Returns False when
+        the row does not exist yet, in which case nothing was changed.
+        """
+        return bool(cls.objects.filter(
+            models.Q(property__isnull=True) if property_id is None else models.Q(property_id=property_id)
+        ).update(**{
+            'review_count': models.F('review_count') + delta,
+            'rating_sum': models.F('rating_sum') + rating * delta,
+            f'rating_{rating}': models.F(f'rating_{rating}') + delta,
+        }))
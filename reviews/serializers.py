@@ -2,10 +2,11 @@
 Serializers for Reviews app.
 """
 from rest_framework import serializers
-from .models import Review
+from .models import Review, ReviewStats
+from nura_stays.fieldsets import SparseFieldsetSerializerMixin
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for public review display."""
     property_name = serializers.CharField(source='property.name', read_only=True, default=None)
 
@@ -16,6 +17,7 @@ class ReviewSerializer(serializers.ModelSerializer):
             'rating', 'review_text', 'created_at',
         ]
         read_only_fields = ['id', 'created_at']
+        field_columns = {'property_name': ['property__name']}
 
 
 class ReviewAdminSerializer(serializers.ModelSerializer):
@@ -26,3 +28,27 @@ class ReviewAdminSerializer(serializers.ModelSerializer):
         model = Review
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class ReviewStatsSerializer(serializers.ModelSerializer):
+    """Serializer for the review statistics rollup."""
+    average_rating = serializers.SerializerMethodField()
+    total_reviews = serializers.IntegerField(source='review_count', read_only=True)
+    distribution = serializers.SerializerMethodField()
+    property = serializers.IntegerField(source='property_id', read_only=True)
+
+    class Meta:
+        model = ReviewStats
+        fields = ['average_rating', 'total_reviews', 'distribution', 'property']
+
+    def get_average_rating(self, obj):
+        return obj.get_average_rating()
+
+    def get_distribution(self, obj):
+        return obj.get_distribution()
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.property_id is None:
+            data.pop('property')
+        return data
@@ -0,0 +1,78 @@
+"""
+Signal handlers that keep Property rating aggregates and the ReviewStats
+rollup in sync with reviews.
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from properties.models import Property
+from .models import Review, ReviewStats
+
+
+def _contribution(property_id, rating, is_approved):
+    """Return (property_id, rating) if the review counts towards a rating."""
+    if property_id and is_approved:
+        return property_id, rating
+    return None
+
+
+def _update_stats(previous, current):
+    """
+    Move a review's contribution in ReviewStats. Each argument is
+    (property_id, rating, is_approved) or None.
+    """
+    if previous == current:
+        return
+    deltas = []
+    for state, delta in ((previous, -1), (current, 1)):
+        if state and state[2]:
+            deltas.append((None, state[1], delta))
+            if state[0]:
+                deltas.append((state[0], state[1], delta))
+    missing = {
+        property_id for property_id, rating, delta in deltas
+        if not ReviewStats.apply_delta(property_id, rating, delta)
+    }
+    # Rows that were never built are computed from scratch; this write is
+    # already visible in the current transaction, so the result is exact.
+    for property_id in missing:
+        ReviewStats.rebuild_row(property_id)
+
+
+@receiver(pre_save, sender=Review)
+def capture_previous_rating(sender, instance, raw=False, **kwargs):
+    instance._previous_state = None
+    if raw or instance.pk is None:
+        return
+    previous = Review.objects.filter(pk=instance.pk).values_list(
+        'property_id', 'rating', 'is_approved'
+    ).first()
+    instance._previous_state = previous
+
+
+@receiver(post_save, sender=Review)
+def apply_rating_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_state', None)
+    current = (instance.property_id, instance.rating, instance.is_approved)
+    _update_stats(previous, current)
+
+    old = _contribution(*previous) if previous else None
+    new = _contribution(*current)
+    if old == new:
+        return
+    if old and new and old[0] == new[0]:
+        Property.apply_rating_delta(new[0], new[1] - old[1], 0)
+        return
+    if old:
+        Property.apply_rating_delta(old[0], -old[1], -1)
+    if new:
+        Property.apply_rating_delta(new[0], new[1], 1)
+
+
+@receiver(post_delete, sender=Review)
+def apply_rating_on_delete(sender, instance, **kwargs):
+    _update_stats((instance.property_id, instance.rating, instance.is_approved), None)
+    old = _contribution(instance.property_id, instance.rating, instance.is_approved)
+    if old:
+        Property.apply_rating_delta(old[0], -old[1], -1)
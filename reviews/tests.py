@@ -1,3 +1,179 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, transaction
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .models import Review, ReviewStats
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(30):
+            Review.objects.create(guest_name=f'Guest {i}', rating=i % 5 + 1, review_text='x')
+
+    def walk(self, url, params=None):
+        ids, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            ids.extend(r['id'] for r in response.data['results'])
+            pages += 1
+            if not response.data['next']:
+                return ids, pages, response
+            response = self.client.get(response.data['next'])
+
+    def test_forward_walk_matches_default_ordering(self):
+        expected = list(Review.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        ids, pages, _ = self.walk(reverse('review-list'), {'pagination': 'cursor'})
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_ordering_by_rating_and_walking_back(self):
+        expected = list(Review.objects.order_by('rating', 'id').values_list('id', flat=True))
+        ids, _, last = self.walk(reverse('review-list'), {'pagination': 'cursor', 'ordering': 'rating'})
+        self.assertEqual(ids, expected)
+
+        previous = self.client.get(last.data['previous'])
+        self.assertEqual([r['id'] for r in previous.data['results']], expected[12:24])
+
+    def test_sparse_fieldset(self):
+        with self.assertNumQueries(2):  # validators + page; no join for property_name
+            response = self.client.get(reverse('review-list'), {'pagination': 'cursor', 'fields': 'id,guest_name'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'guest_name'})
+        self.assertEqual(len(self.walk(response.data['next'])[0]), 18)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('review-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_number_mode_unchanged(self):
+        response = self.client.get(reverse('review-list'), {'page': 2})
+        self.assertEqual(response.data['count'], 30)
+        self.assertEqual(len(response.data['results']), 12)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class ReviewStatsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        from properties.models import Property
+        self.prop = Property.objects.create(
+            name='Flat', location='London', description='x', price_per_night=100
+        )
+        self.other = Property.objects.create(
+            name='House', location='Leeds', description='x', price_per_night=100
+        )
+
+    def assertStatsMatchReviews(self):
+        expected = ReviewStats.compute()
+        actual = {row.property_id: row for row in ReviewStats.objects.all()}
+        fields = ['review_count', 'rating_sum'] + [f'rating_{i}' for i in range(1, 6)]
+        for key, row in expected.items():
+            self.assertEqual(
+                [getattr(actual[key], f) for f in fields], [getattr(row, f) for f in fields], key
+            )
+
+    def test_rollup_follows_review_changes(self):
+        review = Review.objects.create(property=self.prop, guest_name='A', rating=4, review_text='x')
+        Review.objects.create(guest_name='B', rating=2, review_text='x')
+        review.rating = 5
+        review.save()
+        review.property = self.other
+        review.save()
+        review.is_approved = False
+        review.save()
+        Review.objects.create(property=self.prop, guest_name='C', rating=3, review_text='x')
+        Review.objects.filter(guest_name='B').delete()
+        self.assertStatsMatchReviews()
+
+    def test_missing_rows_are_rebuilt_once(self):
+        review = Review.objects.create(property=self.prop, guest_name='A', rating=4, review_text='x')
+        ReviewStats.objects.all().delete()
+        review.rating = 1
+        review.save()
+        self.assertStatsMatchReviews()
+        self.assertEqual(ReviewStats.objects.get(property__isnull=True).review_count, 1)
+
+    def test_single_overall_row(self):
+        Review.objects.create(property=self.prop, guest_name='A', rating=4, review_text='x')
+        overall = ReviewStats.objects.get(property__isnull=True)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ReviewStats.objects.create()
+        ReviewStats.rebuild_row(None)
+        ReviewStats.rebuild_row(self.prop.pk)
+        self.assertEqual(ReviewStats.objects.get(property__isnull=True).pk, overall.pk)
+        self.assertEqual(ReviewStats.objects.count(), 2)
+        self.assertStatsMatchReviews()
+
+    def test_stats_endpoint(self):
+        Review.objects.create(property=self.prop, guest_name='A', rating=4, review_text='x')
+        Review.objects.create(property=self.prop, guest_name='B', rating=5, review_text='x')
+        Review.objects.create(guest_name='C', rating=1, review_text='x')
+
+        with self.assertNumQueries(2):  # validators, stats row
+            response = self.client.get(reverse('review-stats'))
+        self.assertEqual(response.data, {
+            'average_rating': 3.3,
+            'total_reviews': 3,
+            'distribution': {'1': 1, '2': 0, '3': 0, '4': 1, '5': 1},
+        })
+
+        response = self.client.get(reverse('review-stats'), {'property': self.prop.pk})
+        self.assertEqual(response.data['average_rating'], 4.5)
+        self.assertEqual(response.data['distribution']['1'], 0)
+
+        response = self.client.get(reverse('review-stats'), {'property': self.other.pk})
+        self.assertEqual(response.data['total_reviews'], 0)
+
+        self.assertEqual(self.client.get(reverse('review-stats'))['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(reverse('review-stats'), {'property': 'x'}).status_code, 400)
+
+
+class BulkImportTests(APITestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+        from properties.models import Property
+        cache.clear()
+        self.client.force_authenticate(User.objects.create_user('admin', is_staff=True))
+        self.prop = Property.objects.create(name='Flat', location='X', description='Y', price_per_night=50)
+        self.other = Property.objects.create(name='Villa', location='X', description='Y', price_per_night=90)
+
+    def upload(self, content, **data):
+        file = SimpleUploadedFile('reviews.csv', content.encode())
+        return self.client.post(reverse('admin-review-import'), {'file': file, **data}, format='multipart')
+
+    def test_import_refreshes_rating_rollups(self):
+        content = (
+            'property,guest_name,rating,review_text\n'
+            f'{self.prop.pk},Ada,4,Lovely\n'
+            f'{self.prop.pk},Bo,2,Fine\n'
+            '999999,Cy,5,Ghost property\n'
+            f'{self.prop.pk},Di,9,Out of range\n'
+        )
+        response = self.upload(content)
+        self.assertEqual((response.data['created'], response.data['skipped']), (2, 2))
+        self.assertEqual([error['line'] for error in response.data['errors']], [5, 4])
+        self.prop.refresh_from_db()
+        self.assertEqual((self.prop.rating_sum, self.prop.rating_count), (6, 2))
+        self.assertEqual(ReviewStats.objects.get(property__isnull=True).review_count, 2)
+
+        # Moving a review re-rates both its old and its new property.
+        review = Review.objects.get(guest_name='Ada')
+        response = self.upload(f'id,property\n{review.pk},{self.other.pk}\n', update='true')
+        self.assertEqual(response.data['updated'], 1)
+        self.prop.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.prop.rating_sum, self.other.rating_sum), (2, 4))
+
+    def test_export_follows_filters(self):
+        Review.objects.create(property=self.prop, guest_name='Ada', rating=5, review_text='x')
+        Review.objects.create(property=self.prop, guest_name='Bo', rating=1, review_text='x')
+        response = self.client.get(reverse('admin-review-export'), {'rating': 5})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,property,guest_name,rating,review_text,is_approved,created_at,updated_at')
+        self.assertEqual(len(lines), 2)
+        self.assertIn(',Ada,5,', lines[1])
@@ -2,14 +2,18 @@
 URL configuration for Reviews app.
 """
 from django.urls import path
+
+from nura_stays.asyncviews import read_view
 from . import views
 
 urlpatterns = [
     # Public
-    path('reviews/', views.ReviewListView.as_view(), name='review-list'),
+    path('reviews/', read_view(views.ReviewListView, views.AsyncReviewListView), name='review-list'),
     path('reviews/stats/', views.ReviewStatsView.as_view(), name='review-stats'),
-    path('reviews/property/<int:property_id>/', views.PropertyReviewsView.as_view(), name='property-reviews'),
+    path('reviews/property/<int:property_id>/', read_view(views.PropertyReviewsView, views.AsyncPropertyReviewsView), name='property-reviews'),
     # Admin
     path('admin/reviews/', views.AdminReviewListCreateView.as_view(), name='admin-review-list-create'),
+    path('admin/reviews/export/', views.AdminReviewExportView.as_view(), name='admin-review-export'),
+    path('admin/reviews/import/', views.AdminReviewImportView.as_view(), name='admin-review-import'),
     path('admin/reviews/<int:pk>/', views.AdminReviewDetailView.as_view(), name='admin-review-detail'),
 ]
@@ -1,21 +1,31 @@
 """
 Views for Reviews app.
 """
-from rest_framework import generics, status
+from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.response import Response
-from rest_framework.views import APIView
-from django.db.models import Avg, Count
-from .models import Review
-from .serializers import ReviewSerializer, ReviewAdminSerializer
+from rest_framework.exceptions import ValidationError
+from .bulk import ReviewDataset
+from .models import Review, ReviewStats
+from .serializers import ReviewSerializer, ReviewAdminSerializer, ReviewStatsSerializer
+from nura_stays.asyncviews import AsyncAPIViewMixin, AsyncListMixin
+from nura_stays.bulk import ExportMixin, ImportView
+from nura_stays.cache import CachedResponseMixin, ConditionalGetMixin
+from nura_stays.fastpath import FastListMixin
+from nura_stays.fieldsets import SparseFieldsetMixin
+from nura_stays.pagination import KeysetPagination
+from nura_stays.timing import SerializeTimingMixin
 
 
 # ─── Public Views ────────────────────────────────────────────────────────────
 
-class ReviewListView(generics.ListAPIView):
-    """List all approved reviews with optional filters."""
+class ReviewListView(
+    ConditionalGetMixin, CachedResponseMixin, SparseFieldsetMixin, FastListMixin, AsyncListMixin, generics.ListAPIView,
+):
+    """List all approved reviews with optional filters; ?fields= / ?exclude= trim the response."""
+    cache_models = ('reviews.review', 'properties.property')
     serializer_class = ReviewSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
     filterset_fields = ['rating', 'property']
     ordering_fields = ['created_at', 'rating']
     ordering = ['-created_at']
@@ -24,8 +34,11 @@ class ReviewListView(generics.ListAPIView):
         return Review.objects.filter(is_approved=True).select_related('property')
 
 
-class PropertyReviewsView(generics.ListAPIView):
+class PropertyReviewsView(
+    ConditionalGetMixin, CachedResponseMixin, SparseFieldsetMixin, AsyncListMixin, generics.ListAPIView,
+):
     """Get reviews for a specific property."""
+    cache_models = ('reviews.review', 'properties.property')
     serializer_class = ReviewSerializer
     permission_classes = [AllowAny]
     pagination_class = None
@@ -37,27 +50,34 @@ class PropertyReviewsView(generics.ListAPIView):
         ).select_related('property')
 
 
-class ReviewStatsView(APIView):
-    """Get overall review statistics."""
+class ReviewStatsView(ConditionalGetMixin, CachedResponseMixin, SerializeTimingMixin, generics.RetrieveAPIView):
+    """Get review statistics, overall or for one property (?property=<id>)."""
+    cache_models = ('reviews.review',)
+    serializer_class = ReviewStatsSerializer
     permission_classes = [AllowAny]
 
-    def get(self, request):
-        stats = Review.objects.filter(is_approved=True).aggregate(
-            average_rating=Avg('rating'),
-            total_reviews=Count('id'),
+    def get_object(self):
+        property_id = self.request.query_params.get('property')
+        if not property_id:
+            return ReviewStats.objects.filter(property__isnull=True).first() or ReviewStats()
+        try:
+            property_id = int(property_id)
+        except ValueError:
+            raise ValidationError({'property': 'A valid property id is required.'})
+        return (
+            ReviewStats.objects.filter(property_id=property_id).first()
+            or ReviewStats(property_id=property_id)
         )
-        # Rating distribution
-        distribution = {}
-        for i in range(1, 6):
-            distribution[str(i)] = Review.objects.filter(
-                is_approved=True, rating=i
-            ).count()
 
-        return Response({
-            'average_rating': round(stats['average_rating'], 1) if stats['average_rating'] else 0,
-            'total_reviews': stats['total_reviews'],
-            'distribution': distribution,
-        })
+
+# Served instead of the views above under ASGI (nura_stays.asyncviews).
+
+class AsyncReviewListView(AsyncAPIViewMixin, ReviewListView):
+    """ReviewListView with an async GET."""
+
+
+class AsyncPropertyReviewsView(AsyncAPIViewMixin, PropertyReviewsView):
+    """PropertyReviewsView with an async GET."""
 
 
 # ─── Admin Views ─────────────────────────────────────────────────────────────
@@ -67,10 +87,21 @@ class AdminReviewListCreateView(generics.ListCreateAPIView):
     queryset = Review.objects.all().select_related('property')
     serializer_class = ReviewAdminSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     filterset_fields = ['rating', 'is_approved', 'property']
     ordering_fields = ['created_at', 'rating']
 
 
+class AdminReviewExportView(ExportMixin, AdminReviewListCreateView):
+    """Admin: stream all (filtered) reviews as CSV or JSON Lines."""
+    dataset_class = ReviewDataset
+
+
+class AdminReviewImportView(ImportView):
+    """Admin: bulk create or update reviews from a CSV or JSON Lines file."""
+    dataset_class = ReviewDataset
+
+
 class AdminReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Admin: retrieve, update, or delete a review."""
     queryset = Review.objects.all()
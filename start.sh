@@ -0,0 +1,24 @@
+#!/bin/sh
+# Container entry point (see Dockerfile): migrate, start the outbox worker,
+# then run gunicorn on wsgi.py, or asgi.py with SERVER_INTERFACE=asgi.
+set -e
+
+# Metrics files of earlier runs would be summed into this one's.
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+    rm -rf "${PROMETHEUS_MULTIPROC_DIR}" && mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+fi
+python manage.py migrate --noinput
+python manage.py createcachetable
+
+if [ "${RUN_OUTBOX_WORKER:-True}" = True ]; then
+    # Restarted if it exits; the web process then leaves delivery to it.
+    (while true; do python manage.py run_outbox || true; sleep 5; done) &
+    export OUTBOX_DELIVER_ON_COMMIT="${OUTBOX_DELIVER_ON_COMMIT:-False}"
+fi
+
+if [ "${SERVER_INTERFACE:-wsgi}" = asgi ]; then
+    set -- nura_stays.asgi:application --worker-class uvicorn_worker.UvicornWorker
+else
+    set -- nura_stays.wsgi:application
+fi
+exec gunicorn "$@" --bind "0.0.0.0:${PORT}" --workers "${WEB_CONCURRENCY:-2}" --timeout 120
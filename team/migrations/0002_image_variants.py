@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teammember',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -11,6 +11,8 @@ class TeamMember(models.Model):
     role = models.CharField(max_length=255)
     bio = models.TextField(blank=True)
     photo = models.ImageField(upload_to='team/', blank=True, null=True)
+    # Resized WebP/AVIF renditions; see nura_stays.images.
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)
     social_links = models.JSONField(default=dict, blank=True)
     order_index = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -3,19 +3,24 @@ Serializers for Team app.
 """
 from rest_framework import serializers
 from .models import TeamMember
+from nura_stays.fastpath import file_url
+from nura_stays.fieldsets import SparseFieldsetSerializerMixin
+from nura_stays.images import variant_urls
 
 
-class TeamMemberSerializer(serializers.ModelSerializer):
+class TeamMemberSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Serializer for team member display."""
     photo_url = serializers.SerializerMethodField()
+    photo_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = TeamMember
         fields = [
-            'id', 'name', 'role', 'bio', 'photo', 'photo_url',
+            'id', 'name', 'role', 'bio', 'photo', 'photo_url', 'photo_srcset',
             'social_links', 'order_index', 'created_at',
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        field_columns = {'photo_url': ['photo'], 'photo_srcset': ['photo', 'photo_variants']}
 
     def get_photo_url(self, obj):
         request = self.context.get('request')
@@ -24,3 +29,18 @@ class TeamMemberSerializer(serializers.ModelSerializer):
         elif obj.photo:
             return obj.photo.url
         return None
+
+    def get_photo_srcset(self, obj):
+        if not obj.photo:
+            return None
+        return variant_urls(obj.photo_variants, obj.photo.storage, self.context.get('request'))
+
+    # Fast path (nura_stays.fastpath): the same fields from .values() rows.
+
+    def fast_photo_url(self, row):
+        return file_url(TeamMember.photo.field.storage, row['photo'], self.context.get('request'))
+
+    def fast_photo_srcset(self, row):
+        if not row['photo']:
+            return None
+        return variant_urls(row['photo_variants'], TeamMember.photo.field.storage, self.context.get('request'))
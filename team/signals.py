@@ -0,0 +1,42 @@
+"""
+Signal handlers that keep team photo variants in sync.
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from nura_stays.cache import bump_version
+from nura_stays.images import delete_variants, generate_variants, needs_variants
+from .models import TeamMember
+
+
+def _current_source(instance):
+    return instance.photo.name if instance.photo else None
+
+
+@receiver(pre_save, sender=TeamMember)
+def capture_stale_variants(sender, instance, raw=False, **kwargs):
+    variants = instance.photo_variants
+    stale = not raw and variants and variants.get('source') != _current_source(instance)
+    instance._stale_variants = variants if stale else None
+
+
+@receiver(post_save, sender=TeamMember)
+def build_photo_variants(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    stale = getattr(instance, '_stale_variants', None)
+    if stale:
+        instance.photo_variants = {}
+    if needs_variants(instance.photo, instance.photo_variants):
+        instance.photo_variants = generate_variants(instance.photo)
+    elif not stale:
+        return
+    TeamMember.objects.filter(pk=instance.pk).update(photo_variants=instance.photo_variants)
+    if stale:
+        # Only once the row points at the new ones, which may share names.
+        delete_variants(stale, instance.photo.storage, keep=instance.photo_variants)
+    bump_version(TeamMember)
+
+
+@receiver(post_delete, sender=TeamMember)
+def delete_photo_variants(sender, instance, **kwargs):
+    delete_variants(instance.photo_variants, instance.photo.storage)
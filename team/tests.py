@@ -1,3 +1,37 @@
-from django.test import TestCase
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from .models import TeamMember
+
+
+def make_photo(name='photo.jpg', size=(800, 600)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'teal').save(buffer, format='JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT='/tmp/nura-stays-test-media', IMAGE_VARIANT_WIDTHS=[320])
+class PhotoVariantTests(TestCase):
+    def test_replacing_the_photo_deletes_old_variants(self):
+        member = TeamMember.objects.create(name='Ada', role='Host', photo=make_photo())
+        old = member.photo_variants['formats']['webp']['320']
+        member.photo = make_photo('other.jpg', size=(640, 480))
+        member.save()
+        member.refresh_from_db()
+        storage = member.photo.storage
+        self.assertEqual(member.photo_variants['source'], member.photo.name)
+        self.assertTrue(storage.exists(member.photo_variants['formats']['webp']['320']))
+        self.assertFalse(storage.exists(old))
+
+    def test_old_variants_stay_until_the_row_is_updated(self):
+        member = TeamMember.objects.create(name='Ada', role='Host', photo=make_photo())
+        old = member.photo_variants['formats']['webp']['320']
+        member.photo = make_photo('other.jpg')
+        with mock.patch('team.signals.generate_variants', side_effect=OSError('disk full')), \
+                self.assertRaises(OSError):
+            member.save()
+        self.assertTrue(member.photo.storage.exists(old))
@@ -2,11 +2,13 @@
 URL configuration for Team app.
 """
 from django.urls import path
+
+from nura_stays.asyncviews import read_view
 from . import views
 
 urlpatterns = [
     # Public
-    path('team/', views.TeamMemberListView.as_view(), name='team-list'),
+    path('team/', read_view(views.TeamMemberListView, views.AsyncTeamMemberListView), name='team-list'),
     # Admin
     path('admin/team/', views.AdminTeamMemberListCreateView.as_view(), name='admin-team-list-create'),
     path('admin/team/<int:pk>/', views.AdminTeamMemberDetailView.as_view(), name='admin-team-detail'),
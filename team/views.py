@@ -6,18 +6,31 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from .models import TeamMember
 from .serializers import TeamMemberSerializer
+from nura_stays.asyncviews import AsyncAPIViewMixin, AsyncListMixin
+from nura_stays.cache import CachedResponseMixin, ConditionalGetMixin
+from nura_stays.fastpath import FastListMixin
+from nura_stays.fieldsets import SparseFieldsetMixin
 
 
 # ─── Public Views ────────────────────────────────────────────────────────────
 
-class TeamMemberListView(generics.ListAPIView):
-    """List all team members."""
+class TeamMemberListView(
+    ConditionalGetMixin, CachedResponseMixin, SparseFieldsetMixin, FastListMixin, AsyncListMixin, generics.ListAPIView,
+):
+    """List all team members; ?fields= / ?exclude= trim the response."""
+    cache_models = ('team.teammember',)
     queryset = TeamMember.objects.all()
     serializer_class = TeamMemberSerializer
     permission_classes = [AllowAny]
     pagination_class = None
 
 
+# Served instead of the view above under ASGI (nura_stays.asyncviews).
+
+class AsyncTeamMemberListView(AsyncAPIViewMixin, TeamMemberListView):
+    """TeamMemberListView with an async GET."""
+
+
 # ─── Admin Views ─────────────────────────────────────────────────────────────
 
 class AdminTeamMemberListCreateView(generics.ListCreateAPIView):